@@ -0,0 +1,116 @@
+"""
+Read-only response cache for /api/reports/*.
+
+Entries are keyed by (endpoint, params, data version). The data version is a high-water
+mark over the tables the report reads, so appending events, artifacts or return periods
+invalidates it without explicit busting. Responses carry an ETag; a matching If-None-Match
+returns 304 before anything is recomputed. The cache is never authoritative.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from core.repositories.data_version_repository import DataVersionRepository
+
+MAX_ENTRIES = 256
+
+
+class ReportCache:
+    """Bounded LRU of rendered report bodies. Thread-safe; process-local."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def set(self, key: tuple, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+report_cache = ReportCache()
+# Rendered weekly review fragments (HTML), keyed the same way.
+fragment_cache = ReportCache()
+
+
+def etag_for(key: tuple) -> str:
+    """Strong ETag derived from the full cache key (endpoint, params, data version)."""
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def report_key(db: Session, endpoint: str, models, params: dict | None = None) -> tuple:
+    """(endpoint, sorted params, data version of the given ORM tables)."""
+    version = DataVersionRepository(db).get_version(models)
+    return (endpoint, tuple(sorted((params or {}).items())), version)
+
+
+def not_modified(request: Request, key: tuple) -> Response | None:
+    """304 response when the client already holds this version; else None."""
+    etag = etag_for(key)
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def cached_json_report(
+    request: Request,
+    db: Session,
+    endpoint: str,
+    models,
+    compute: Callable[[], Any],
+    params: dict | None = None,
+) -> Response:
+    """
+    Serve a JSON report through the cache. compute() runs only when neither the client
+    (If-None-Match) nor the process cache holds the current data version.
+    """
+    key = report_key(db, endpoint, models, params)
+    cached = not_modified(request, key)
+    if cached is not None:
+        return cached
+    body = report_cache.get(key)
+    if body is None:
+        body = json.dumps(jsonable_encoder(compute()), separators=(",", ":")).encode("utf-8")
+        report_cache.set(key, body)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag_for(key), "Cache-Control": "no-cache"},
+    )
@@ -22,8 +22,10 @@ from core.repositories.artifact_repository import ArtifactRepository
 from core.repositories.cadence_repository import CadenceRepository
 from core.repositories.lifecycle_repository import BeliefLifecycleRepository
 from core.repositories.observed_returns_repository import ObservedReturnsRepository
+from core.services.analysis_precompute import stored_analysis
 from core.services.belief_analysis_service import BeliefAnalysisService
 from core.services.decision_projection_service import DecisionProjectionService
+from core.services.llm_cache import get_llm_cache
 from core.templates import templates
 
 
@@ -117,11 +119,17 @@ def belief_detail(belief_id: str, request: Request, db: Session = Depends(get_db
 
     analysis = BeliefAnalysisService(artifact_repo, lifecycle_repo)
     grouped = analysis.get_beliefs_needing_review()
-    has_newer_snapshots = any(
-        item["belief_id"] == belief_id
-        for items in grouped.values()
-        for item in items
+    stale_item = next(
+        (item for items in grouped.values() for item in items if item["belief_id"] == belief_id),
+        None,
     )
+    has_newer_snapshots = stale_item is not None
+    # Analysis precomputed in the background (or from an earlier click) for exactly these snapshot sets.
+    precomputed_analysis = None
+    if stale_item:
+        precomputed_analysis = stored_analysis(
+            get_llm_cache(), belief_id, belief.references.snapshot_ids, stale_item["newer_snapshot_ids"]
+        )
 
     projection = DecisionProjectionService(artifact_repo, lifecycle_repo)
     current_decision_state = projection.get_current_decision_state(belief_id)
@@ -156,6 +164,7 @@ def belief_detail(belief_id: str, request: Request, db: Session = Depends(get_db
             "lifecycle_events": lifecycle_events,
             "referenced_snapshots": referenced_snapshots,
             "has_newer_snapshots": has_newer_snapshots,
+            "precomputed_analysis": precomputed_analysis,
             "current_decision_state": current_decision_state,
             "decision_timeline": decision_timeline,
             "cadence": cadence,
@@ -0,0 +1,45 @@
+"""Columnar exports (Parquet / Arrow IPC) of the decision log and snapshot financials. Read-only."""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from api.deps import get_db
+from core.repositories.artifact_repository import ArtifactRepository
+from core.repositories.lifecycle_repository import BeliefLifecycleRepository
+from core.services.columnar_export_service import (
+    DECISION_LOG_SCHEMA,
+    FORMATS,
+    SNAPSHOT_SCHEMA,
+    ColumnarExportService,
+    stream_columnar,
+)
+
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+router = APIRouter()
+
+
+@router.get("/api/export/{filename}")
+def export_columnar(filename: str, db=Depends(get_db)):
+    """
+    Stream decisions.{parquet,arrow} (all lifecycle events, typed columns) or
+    snapshots.{parquet,arrow} (one row per snapshot, numeric fields as float64).
+    """
+    dataset, _, fmt = filename.partition(".")
+    if dataset not in ("decisions", "snapshots") or fmt not in FORMATS:
+        raise HTTPException(
+            status_code=404,
+            detail="Export must be decisions.parquet, snapshots.parquet, decisions.arrow or snapshots.arrow",
+        )
+    service = ColumnarExportService(ArtifactRepository(db), BeliefLifecycleRepository(db))
+    if dataset == "decisions":
+        records, schema = service.decision_log_records(), DECISION_LOG_SCHEMA
+    else:
+        records, schema = service.snapshot_records(), SNAPSHOT_SCHEMA
+    return StreamingResponse(
+        stream_columnar(records, schema, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
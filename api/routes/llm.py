@@ -1,7 +1,18 @@
-"""LLM assistive endpoints. Optional, attributable, no mutation."""
+"""
+LLM assistive endpoints. Optional, attributable, no mutation.
+
+Handlers are async: generation awaits the shared Ollama client instead of holding a
+threadpool worker, and database reads run in the threadpool before the call. A generation
+is cancelled (freeing its queue slot) if the client disconnects while it is pending.
+The */stream variants relay tokens as server-sent events while the model generates.
+"""
+import asyncio
+import json
 from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -10,26 +21,124 @@ from core.models.reasoning_artifact import ArtifactType
 from core.repositories.artifact_repository import ArtifactRepository
 from core.repositories.lifecycle_repository import BeliefLifecycleRepository
 from core.repositories.proposal_repository import ProposalRepository
-from core.services.belief_analysis_service import BeliefAnalysisService
+from core.services.analysis_jobs import get_analysis_jobs
+from core.services.analysis_precompute import get_analysis_precomputer, store_analysis
+from core.services.llm_context import (
+    analysis_inputs,
+    snapshot_labels,
+    snapshot_summary,
+    stale_analysis_inputs,
+)
 from core.services.llm_service import (
     OLLAMA_MODEL,
     TEMPERATURE,
+    Generation,
+    LLMBusy,
+    LLMNotConfigured,
     LLMService,
+    TokenStream,
+    get_llm_service,
 )
+from core.services.model_warmup import get_model_warmer
 
 router = APIRouter()
 
+DRAFT_ATTRIBUTION = "LLM Draft Suggestion (Not Saved) — Edit and apply manually."
+EXPLAIN_ATTRIBUTION = "LLM Structural Explanation — Why this proposal was triggered."
+
+DISCONNECT_POLL_SECONDS = 0.5
+NOT_CONFIGURED = "LLM not configured. Run ollama serve and ensure a model is installed (see ollama list)."
+
 
-def _metadata(model: str):
+def _metadata(model: str, generated_at: str | None = None):
     return {
         "model": model,
         "temperature": TEMPERATURE,
-        "generated_at": datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "generated_at": generated_at or datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
     }
 
 
+def _text_response(generation: Generation, attribution: str = DRAFT_ATTRIBUTION) -> "TextResponse":
+    return TextResponse(
+        text=generation.text,
+        attribution=attribution,
+        cached=generation.cached,
+        **_metadata(generation.model, generation.generated_at),
+    )
+
+
 def get_llm() -> LLMService:
-    return LLMService()
+    return get_llm_service()
+
+
+async def _require_llm(llm: LLMService) -> None:
+    if not llm or not await llm.is_available():
+        raise HTTPException(503, NOT_CONFIGURED)
+
+
+async def _until_disconnect(request: Request) -> None:
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+async def run_llm(request: Request, coro):
+    """Await an LLM coroutine; cancel it if the client disconnects first (499)."""
+    task = asyncio.ensure_future(coro)
+    watcher = asyncio.ensure_future(_until_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+    if not task.done():
+        task.cancel()
+        raise HTTPException(499, "Client closed request")
+    return task.result()
+
+
+def _sse(data: dict, event: str | None = None) -> str:
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data)}\n\n"
+
+
+async def sse_response(tokens: TokenStream, attribution: str, prefix: str = "") -> StreamingResponse:
+    """
+    Relay generated text as server-sent events: `meta`, then one unnamed event per token
+    ({"token": ...}), then `done` with the full text — or `error` if generation fails midway.
+    The first token is awaited before the response starts, so a full queue (429) or a
+    backend failure still surfaces as a status code, and meta carries the generation's own
+    generated_at (the original one for a cached answer). Disconnecting closes the upstream stream.
+    """
+    try:
+        first = await anext(tokens, None)
+    except (HTTPException, LLMBusy, LLMNotConfigured):
+        raise
+    except Exception as e:
+        raise HTTPException(502, f"LLM error: {e!s}") from e
+    meta = {
+        "attribution": attribution,
+        "cached": tokens.cached,
+        **_metadata(tokens.model, tokens.generated_at),
+    }
+
+    async def events():
+        text = prefix
+        try:
+            yield _sse(meta, "meta")
+            if prefix:
+                yield _sse({"token": prefix})
+            token = first
+            while token is not None:
+                text += token
+                yield _sse({"token": token})
+                token = await anext(tokens, None)
+        except Exception as e:
+            yield _sse({"detail": f"LLM error: {e!s}"}, "error")
+            return
+        finally:
+            await tokens.aclose()
+        yield _sse({"text": text}, "done")
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 # --- Option 1: Drafting ---
@@ -49,10 +158,11 @@ class DraftQuestionRequest(BaseModel):
 
 class TextResponse(BaseModel):
     text: str
-    attribution: str = "LLM Draft Suggestion (Not Saved) — Edit and apply manually."
+    attribution: str = DRAFT_ATTRIBUTION
     model: str | None = None
     temperature: float | None = None
     generated_at: str | None = None
+    cached: bool = False
 
 
 class AnalysisResponse(BaseModel):
@@ -63,72 +173,84 @@ class AnalysisResponse(BaseModel):
     model: str | None = None
     temperature: float | None = None
     generated_at: str | None = None
-
-
-def _snapshot_summary(artifact_repo, snapshot_ids: list) -> str:
-    """Build plain-text summary of snapshots for LLM context."""
-    parts = []
-    for sid in snapshot_ids[:5]:
-        try:
-            snap = artifact_repo.get(str(sid))
-            if snap and hasattr(snap, "company") and hasattr(snap, "financials"):
-                c = snap.company
-                f = snap.financials
-                m = getattr(snap, "metadata", None)
-                as_of = str(m.as_of)[:10] if m and hasattr(m, "as_of") else "N/A"
-                parts.append(
-                    f"{getattr(c, 'company_name', '') or 'Unknown'} ({getattr(c, 'ticker', '') or 'N/A'}): "
-                    f"revenue={f.revenue_fy}, margin={f.operating_margin_fy}, as_of={as_of}"
-                )
-        except Exception:
-            pass
-    return "\n".join(parts) if parts else ""
+    cached: bool = False
 
 
 @router.post("/api/llm/draft-belief", response_model=TextResponse)
-def draft_belief(req: DraftBeliefRequest, llm: LLMService = Depends(get_llm)):
-    """Draft refined belief. User applies manually."""
-    if not llm.available:
-        raise HTTPException(503, "LLM not configured. Run ollama serve and ensure a model is installed (see ollama list).")
-    text = llm.draft_refined_belief(
-        req.statement, req.artifact_type, req.snapshot_summary
-    )
-    return TextResponse(text=text)
+async def draft_belief(
+    req: DraftBeliefRequest,
+    request: Request,
+    refresh: bool = False,
+    llm: LLMService = Depends(get_llm),
+):
+    """Draft refined belief. User applies manually. ?refresh=true bypasses the LLM cache."""
+    await _require_llm(llm)
+    generation = await run_llm(request, llm.draft_refined_belief(
+        req.statement, req.artifact_type, req.snapshot_summary, refresh=refresh
+    ))
+    return _text_response(generation)
 
 
 class DraftBeliefFromIdRequest(BaseModel):
     belief_id: str
 
 
+def _read_and_close(db: Session, read, *args):
+    """
+    Do an LLM route's DB reads, then close the session so its pooled connection is returned
+    before the generation (up to OLLAMA_READ_TIMEOUT) starts. `read` must return plain values.
+    """
+    try:
+        return read(db, *args)
+    finally:
+        db.close()
+
+
+def _belief_draft_inputs(db: Session, belief_id: str) -> tuple[str, str, str]:
+    """(statement, artifact_type, snapshot_summary) for a belief, or 404/400."""
+    artifact_repo = ArtifactRepository(db)
+    belief = artifact_repo.get(belief_id)
+    if not belief or not hasattr(belief, "claim"):
+        raise HTTPException(404, "Belief not found")
+    if belief.artifact_type not in {ArtifactType.thesis, ArtifactType.risk}:
+        raise HTTPException(400, "Not a belief")
+    summary = snapshot_summary(artifact_repo, belief.references.snapshot_ids)
+    return belief.claim.statement, str(belief.artifact_type), summary
+
+
 @router.post("/api/llm/draft-belief-from-id", response_model=TextResponse)
-def draft_belief_from_id(
+async def draft_belief_from_id(
     req: DraftBeliefFromIdRequest,
+    request: Request,
+    refresh: bool = False,
     llm: LLMService = Depends(get_llm),
     db: Session = Depends(get_db),
 ):
     """Draft refined belief from artifact. Fetches snapshots for context."""
-    if not llm.available:
-        raise HTTPException(503, "LLM not configured. Run ollama serve and ensure a model is installed (see ollama list).")
-    artifact_repo = ArtifactRepository(db)
-    belief = artifact_repo.get(req.belief_id)
-    if not belief or not hasattr(belief, "claim"):
-        raise HTTPException(404, "Belief not found")
-    if belief.artifact_type not in {ArtifactType.thesis, ArtifactType.risk}:
-        raise HTTPException(400, "Not a belief")
-    snapshot_summary = _snapshot_summary(artifact_repo, belief.references.snapshot_ids)
-    text = llm.draft_refined_belief(
-        belief.claim.statement,
-        str(belief.artifact_type),
-        snapshot_summary,
+    await _require_llm(llm)
+    statement, artifact_type, snapshot_summary = await run_in_threadpool(
+        _read_and_close, db, _belief_draft_inputs, req.belief_id
     )
-    meta = _metadata(OLLAMA_MODEL)
-    return TextResponse(
-        text=text,
-        attribution="LLM Draft Suggestion (Not Saved) — Edit and apply manually.",
-        model=meta["model"],
-        temperature=meta["temperature"],
-        generated_at=meta["generated_at"],
+    generation = await run_llm(
+        request, llm.draft_refined_belief(statement, artifact_type, snapshot_summary, refresh=refresh)
+    )
+    return _text_response(generation)
+
+
+@router.post("/api/llm/draft-belief-from-id/stream")
+async def draft_belief_from_id_stream(
+    req: DraftBeliefFromIdRequest,
+    refresh: bool = False,
+    llm: LLMService = Depends(get_llm),
+    db: Session = Depends(get_db),
+):
+    """Streaming variant of draft-belief-from-id (text/event-stream)."""
+    await _require_llm(llm)
+    statement, artifact_type, snapshot_summary = await run_in_threadpool(
+        _read_and_close, db, _belief_draft_inputs, req.belief_id
     )
+    tokens = llm.stream_refined_belief(statement, artifact_type, snapshot_summary, refresh=refresh)
+    return await sse_response(tokens, DRAFT_ATTRIBUTION)
 
 
 class DraftQuestionFromIdRequest(BaseModel):
@@ -136,39 +258,72 @@ class DraftQuestionFromIdRequest(BaseModel):
     prompt_type: str = "refine"  # "refine" | "sub_questions"
 
 
+def _question_draft_inputs(db: Session, question_id: str) -> tuple[str, str]:
+    """(statement, snapshot_summary) for a question, or 404/400."""
+    artifact_repo = ArtifactRepository(db)
+    question = artifact_repo.get(question_id)
+    if not question or not hasattr(question, "claim"):
+        raise HTTPException(404, "Question not found")
+    if question.artifact_type != ArtifactType.question:
+        raise HTTPException(400, "Not a question")
+    return question.claim.statement, snapshot_summary(artifact_repo, question.references.snapshot_ids)
+
+
 @router.post("/api/llm/draft-question-from-id", response_model=TextResponse)
-def draft_question_from_id(
+async def draft_question_from_id(
     req: DraftQuestionFromIdRequest,
+    request: Request,
+    refresh: bool = False,
     llm: LLMService = Depends(get_llm),
     db: Session = Depends(get_db),
 ):
     """Draft refined question or sub-questions from artifact."""
-    if not llm.available:
-        raise HTTPException(503, "LLM not configured. Run ollama serve and ensure a model is installed (see ollama list).")
-    artifact_repo = ArtifactRepository(db)
-    question = artifact_repo.get(req.question_id)
-    if not question or not hasattr(question, "claim"):
-        raise HTTPException(404, "Question not found")
-    if question.artifact_type != ArtifactType.question:
-        raise HTTPException(400, "Not a question")
-    snapshot_summary = _snapshot_summary(artifact_repo, question.references.snapshot_ids)
+    await _require_llm(llm)
+    statement, snapshot_summary = await run_in_threadpool(
+        _read_and_close, db, _question_draft_inputs, req.question_id
+    )
     if req.prompt_type == "sub_questions":
-        text = llm.suggest_sub_questions(question.claim.statement)
+        generation = await run_llm(request, llm.suggest_sub_questions(statement, refresh=refresh))
     else:
-        text = llm.draft_refined_question(question.claim.statement, snapshot_summary)
-    return TextResponse(text=text)
+        generation = await run_llm(request, llm.draft_refined_question(statement, snapshot_summary, refresh=refresh))
+    return _text_response(generation)
+
+
+@router.post("/api/llm/draft-question-from-id/stream")
+async def draft_question_from_id_stream(
+    req: DraftQuestionFromIdRequest,
+    refresh: bool = False,
+    llm: LLMService = Depends(get_llm),
+    db: Session = Depends(get_db),
+):
+    """Streaming variant of draft-question-from-id (text/event-stream)."""
+    await _require_llm(llm)
+    statement, snapshot_summary = await run_in_threadpool(
+        _read_and_close, db, _question_draft_inputs, req.question_id
+    )
+    if req.prompt_type == "sub_questions":
+        tokens = llm.stream_sub_questions(statement, refresh=refresh)
+    else:
+        tokens = llm.stream_refined_question(statement, snapshot_summary, refresh=refresh)
+    return await sse_response(tokens, DRAFT_ATTRIBUTION)
 
 
 @router.post("/api/llm/draft-question", response_model=TextResponse)
-def draft_question(req: DraftQuestionRequest, llm: LLMService = Depends(get_llm)):
+async def draft_question(
+    req: DraftQuestionRequest,
+    request: Request,
+    refresh: bool = False,
+    llm: LLMService = Depends(get_llm),
+):
     """Draft refined question or suggest sub-questions."""
-    if not llm.available:
-        raise HTTPException(503, "LLM not configured. Run ollama serve and ensure a model is installed (see ollama list).")
+    await _require_llm(llm)
     if req.prompt_type == "sub_questions":
-        text = llm.suggest_sub_questions(req.question)
+        generation = await run_llm(request, llm.suggest_sub_questions(req.question, refresh=refresh))
     else:
-        text = llm.draft_refined_question(req.question, req.snapshot_summary)
-    return TextResponse(text=text)
+        generation = await run_llm(
+            request, llm.draft_refined_question(req.question, req.snapshot_summary, refresh=refresh)
+        )
+    return _text_response(generation)
 
 
 class SummarizeSnapshotsRequest(BaseModel):
@@ -176,15 +331,16 @@ class SummarizeSnapshotsRequest(BaseModel):
 
 
 @router.post("/api/llm/summarize-snapshots", response_model=TextResponse)
-def summarize_snapshots(
+async def summarize_snapshots(
     req: SummarizeSnapshotsRequest,
+    request: Request,
+    refresh: bool = False,
     llm: LLMService = Depends(get_llm),
 ):
     """Summarize snapshot metrics."""
-    if not llm or not llm.available:
-        raise HTTPException(503, "LLM not configured. Run ollama serve and ensure a model is installed (see ollama list).")
-    text = llm.summarize_snapshots(req.snapshot_texts)
-    return TextResponse(text=text)
+    await _require_llm(llm)
+    generation = await run_llm(request, llm.summarize_snapshots(req.snapshot_texts, refresh=refresh))
+    return _text_response(generation)
 
 
 # --- Option 2: Structural explainer ---
@@ -197,63 +353,36 @@ class ExplainProposalRequest(BaseModel):
     proposal_id: str | None = None
 
 
-def _get_stale_context_for_belief(db: Session, belief_id: str) -> dict | None:
-    """If belief has newer snapshots, return context for analysis. Else None."""
-    artifact_repo = ArtifactRepository(db)
-    lifecycle_repo = BeliefLifecycleRepository(db)
-    analysis = BeliefAnalysisService(artifact_repo, lifecycle_repo)
-    grouped = analysis.get_beliefs_needing_review()
-    for items in grouped.values():
-        for item in items:
-            if item["belief_id"] == belief_id:
-                return item
-    return None
+def _analysis_inputs(db: Session, belief_id: str) -> dict:
+    """analysis_inputs for a belief, or 400/404."""
+    try:
+        return analysis_inputs(ArtifactRepository(db), BeliefLifecycleRepository(db), belief_id)
+    except LookupError as e:
+        raise HTTPException(404, str(e)) from e
+    except ValueError as e:
+        raise HTTPException(400, str(e)) from e
 
 
 @router.post("/api/llm/analyze-belief/{belief_id}", response_model=AnalysisResponse)
-def analyze_belief(
+async def analyze_belief(
     belief_id: str,
+    request: Request,
+    refresh: bool = False,
     llm: LLMService = Depends(get_llm),
     db: Session = Depends(get_db),
 ):
     """Option 2 — Structural Change Analysis. Only when belief has newer snapshots. Structured output."""
-    if not llm.available:
-        raise HTTPException(503, "LLM not configured. Run ollama serve and ensure a model is installed (see ollama list).")
+    await _require_llm(llm)
     try:
-        stale = _get_stale_context_for_belief(db, belief_id)
-        if not stale:
-            raise HTTPException(
-                400,
-                "Belief has no newer snapshots. Analyze is only for beliefs needing review.",
-            )
-        artifact_repo = ArtifactRepository(db)
-        lifecycle_repo = BeliefLifecycleRepository(db)
-        belief = artifact_repo.get(belief_id)
-        if not belief or not hasattr(belief, "claim"):
-            raise HTTPException(404, "Belief not found")
-        if belief.artifact_type not in {ArtifactType.thesis, ArtifactType.risk}:
-            raise HTTPException(400, "Not a belief")
-
-        previous_summary = _snapshot_summary(
-            artifact_repo, list(belief.references.snapshot_ids)
-        )
-        newer_summary = _snapshot_summary(
-            artifact_repo, [sid for sid in stale.get("newer_snapshot_ids", [])]
-        )
-        orm_events = lifecycle_repo.list_for_belief(belief_id)
-        last_review = (
-            orm_events[-1].created_at if orm_events else belief.created_at
-        )
-        last_review_iso = (
-            last_review.isoformat() if hasattr(last_review, "isoformat") else str(last_review)
-        )
-        result = llm.analyze_belief_changes(
-            belief.claim.statement,
-            last_review_iso,
-            previous_summary,
-            newer_summary,
-        )
-    except HTTPException:
+        inputs = await run_in_threadpool(_read_and_close, db, _analysis_inputs, belief_id)
+        result = await run_llm(request, llm.analyze_belief_changes(
+            inputs["belief_text"],
+            inputs["last_review_iso"],
+            inputs["previous_snapshots_summary"],
+            inputs["newer_snapshots_summary"],
+            refresh=refresh,
+        ))
+    except (HTTPException, LLMBusy, LLMNotConfigured):
         raise
     except Exception as e:
         raise HTTPException(
@@ -261,7 +390,12 @@ def analyze_belief(
             detail=f"Analysis failed: {e!s}",
         ) from e
 
-    meta = _metadata(OLLAMA_MODEL)
+    if "[LLM error:" not in result.get("delta_summary", ""):
+        # Keep the latest answer for these snapshot sets; the belief page shows it next time.
+        await run_in_threadpool(
+            store_analysis, llm.cache, belief_id, inputs["snapshot_ids"], inputs["newer_snapshot_ids"], result
+        )
+    meta = _metadata(result.get("model") or OLLAMA_MODEL, result.get("generated_at"))
     tensions = result.get("potential_tensions") or []
     questions = result.get("questions_raised") or []
     return AnalysisResponse(
@@ -272,13 +406,68 @@ def analyze_belief(
         model=meta["model"],
         temperature=meta["temperature"],
         generated_at=meta["generated_at"],
+        cached=bool(result.get("cached")),
     )
 
 
-def _proposal_explain_prefix(proposal_type: str, proposal_id: str | None, db: Session) -> str:
+def _stale_inputs(db: Session) -> list[dict]:
+    return stale_analysis_inputs(ArtifactRepository(db), BeliefLifecycleRepository(db))
+
+
+@router.post("/api/llm/analyze-stale", status_code=202)
+async def analyze_stale(
+    refresh: bool = False,
+    llm: LLMService = Depends(get_llm),
+    db: Session = Depends(get_db),
+):
+    """
+    Queue Structural Change Analysis for every belief needing review; returns a job id at once.
+    Beliefs run concurrently (bounded) and each result is stored for its snapshot sets, as if
+    precomputed. Beliefs that already have one are skipped unless ?refresh=true.
+    """
+    await _require_llm(llm)
+    inputs = await run_in_threadpool(_read_and_close, db, _stale_inputs)
+    job = get_analysis_jobs().start(llm, inputs, refresh=refresh)
+    return {
+        "job_id": job.job_id,
+        "total": len(inputs),
+        "status_url": f"/api/llm/analyze-stale/{job.job_id}",
+        "events_url": f"/api/llm/analyze-stale/{job.job_id}/events",
+    }
+
+
+def _analysis_job(job_id: str):
+    job = get_analysis_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(404, "Unknown or expired analysis job")
+    return job
+
+
+@router.get("/api/llm/analyze-stale/{job_id}")
+def analyze_stale_status(job_id: str):
+    """Job progress: counts per status and one entry per belief."""
+    return _analysis_job(job_id).to_dict()
+
+
+@router.get("/api/llm/analyze-stale/{job_id}/events")
+async def analyze_stale_events(job_id: str):
+    """Job progress as Server-Sent Events: `progress` on every change, then `done`."""
+    job = _analysis_job(job_id)
+
+    async def events():
+        while True:
+            changed = job.changed
+            if job.finished:
+                yield _sse(job.to_dict(), "done")
+                return
+            yield _sse(job.to_dict(), "progress")
+            await changed.wait()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+def _proposal_explain_prefix(db: Session, proposal_id: str) -> str:
     """Prepend a concrete line for review_prompt: newer snapshot(s) dated X."""
-    if proposal_type != "review_prompt" or not proposal_id:
-        return ""
     proposal_repo = ProposalRepository(db)
     row = proposal_repo.get_by_id(proposal_id)
     if not row or not row.payload:
@@ -286,35 +475,96 @@ def _proposal_explain_prefix(proposal_type: str, proposal_id: str | None, db: Se
     newer_ids = row.payload.get("newer_snapshot_ids") or []
     if not newer_ids:
         return ""
-    artifact_repo = ArtifactRepository(db)
-    dates = []
-    for sid in newer_ids[:10]:  # cap for display
-        s = artifact_repo.get(str(sid))
-        if s and getattr(s, "metadata", None) and getattr(s, "company", None):
-            ticker = (getattr(s.company, "ticker") or "").strip() or "?"
-            as_of = getattr(s.metadata, "as_of", None)
-            dates.append(f"{ticker} {as_of}" if as_of else ticker)
+    dates = snapshot_labels(ArtifactRepository(db), newer_ids[:10])  # cap for display
     if not dates:
         return ""
     return "This proposal exists because newer snapshot(s) dated " + ", ".join(dates) + " were detected.\n\n"
 
 
+async def _explain_prefix(db: Session, req: ExplainProposalRequest) -> str:
+    """The snapshot line for a review_prompt proposal (session released after the read); "" otherwise."""
+    if req.proposal_type != "review_prompt" or not req.proposal_id:
+        return ""
+    return await run_in_threadpool(_read_and_close, db, _proposal_explain_prefix, req.proposal_id)
+
+
 @router.post("/api/llm/explain-proposal", response_model=TextResponse)
-def explain_proposal(
+async def explain_proposal(
     req: ExplainProposalRequest,
+    request: Request,
+    refresh: bool = False,
     llm: LLMService = Depends(get_llm),
     db: Session = Depends(get_db),
 ):
     """Explain why a structural proposal was triggered. Plain language. Separate from Draft/Analyze."""
-    if not llm.available:
-        raise HTTPException(503, "LLM not configured. Run ollama serve and ensure a model is installed (see ollama list).")
-    prefix = _proposal_explain_prefix(req.proposal_type, req.proposal_id, db)
-    text = llm.explain_proposal_trigger(
+    await _require_llm(llm)
+    prefix = await _explain_prefix(db, req)
+    generation = await run_llm(request, llm.explain_proposal_trigger(
         req.proposal_type,
         req.belief_text,
         req.condition_state,
-    )
-    return TextResponse(
-        text=prefix + text,
-        attribution="LLM Structural Explanation — Why this proposal was triggered.",
-    )
+        refresh=refresh,
+    ))
+    response = _text_response(generation, EXPLAIN_ATTRIBUTION)
+    response.text = prefix + response.text
+    return response
+
+
+@router.post("/api/llm/explain-proposal/stream")
+async def explain_proposal_stream(
+    req: ExplainProposalRequest,
+    refresh: bool = False,
+    llm: LLMService = Depends(get_llm),
+    db: Session = Depends(get_db),
+):
+    """Streaming variant of explain-proposal. The snapshot prefix arrives as the first token."""
+    await _require_llm(llm)
+    prefix = await _explain_prefix(db, req)
+    tokens = llm.stream_proposal_explanation(req.proposal_type, req.belief_text, req.condition_state, refresh=refresh)
+    return await sse_response(tokens, EXPLAIN_ATTRIBUTION, prefix=prefix)
+
+
+@router.get("/api/llm/cache")
+def llm_cache_stats(llm: LLMService = Depends(get_llm)):
+    """Hit/miss/bypass/eviction counters and size of the on-disk LLM cache."""
+    return llm.cache.stats()
+
+
+@router.get("/api/llm/coalescing")
+def llm_coalescing_stats(llm: LLMService = Depends(get_llm)):
+    """Upstream generations started, identical requests that joined one in flight, and current in-flight count."""
+    return llm.flights.stats()
+
+
+@router.get("/api/llm/metrics")
+def llm_metrics(llm: LLMService = Depends(get_llm)):
+    """
+    Per-method timings of upstream calls: wall, queue wait, model load, prompt eval and
+    generation (ms), token counts and prompt length; plus cache hits and errors.
+    """
+    return llm.metrics.snapshot()
+
+
+@router.get("/api/llm/backends")
+def llm_backends(llm: LLMService = Depends(get_llm)):
+    """Per Ollama backend: health, breaker state, requests in flight and queued, call latencies; plus failovers."""
+    return llm.backend_stats()
+
+
+@router.get("/api/llm/warmup")
+def llm_warmup_stats():
+    """Model preload / keep-warm pinger: schedule, pings sent, cold loads they absorbed, failures."""
+    return get_model_warmer().stats()
+
+
+@router.get("/api/llm/precompute")
+def llm_precompute_stats():
+    """Background analysis jobs: submitted, completed, skipped (not stale / already stored), failed."""
+    return get_analysis_precomputer().stats()
+
+
+@router.delete("/api/llm/cache")
+def clear_llm_cache(llm: LLMService = Depends(get_llm)):
+    """Drop every cached generation. Nothing canonical lives there."""
+    llm.cache.clear()
+    return {"cleared": True}
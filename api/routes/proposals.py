@@ -1,9 +1,9 @@
 """Proposal lifecycle: accept / reject + audit."""
 from datetime import UTC, datetime
-from urllib.parse import quote
+from urllib.parse import quote, urlencode
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from sqlalchemy.orm import Session
 
@@ -18,6 +18,8 @@ from core.templates import templates
 
 router = APIRouter()
 
+HISTORY_PAGE_SIZE = 50
+
 
 def _is_fetch(request: Request) -> bool:
     """True if request is from fetch/XHR (no page refresh desired)."""
@@ -110,18 +112,10 @@ def reject_proposal(proposal_id: str, request: Request, db=Depends(get_db)):
 
 @router.get("/proposals/history", response_class=HTMLResponse)
 def proposal_history(request: Request, db: Session = Depends(get_db)):
-    """Audit view: all proposals grouped by type and status. Includes condition_state."""
-    artifact_repo = ArtifactRepository(db)
-    lifecycle_repo = BeliefLifecycleRepository(db)
-    proposal_repo = ProposalRepository(db)
-    engine = ProposalEngine(artifact_repo, lifecycle_repo, proposal_repo)
-    history = engine.get_history_for_display()
-
-    total = sum(
-        len(item)
-        for by_type in history.values()
-        for item in by_type.values()
-    )
+    """Audit view: proposal counts by type and status (SQL GROUP BY). Rows load per bucket on demand."""
+    engine = ProposalEngine(ArtifactRepository(db), BeliefLifecycleRepository(db), ProposalRepository(db))
+    history = engine.get_history_counts()
+    total = sum(n for by_status in history.values() for n in by_status.values())
 
     return templates.TemplateResponse(
         "proposal_history.html",
@@ -131,3 +125,28 @@ def proposal_history(request: Request, db: Session = Depends(get_db)):
             "history_total": total,
         },
     )
+
+
+@router.get("/proposals/history/rows", response_class=HTMLResponse)
+def proposal_history_rows(
+    request: Request,
+    proposal_type: str,
+    status: str,
+    cursor: str | None = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """One newest-first page of a (type, status) bucket as table rows. Includes condition_state."""
+    engine = ProposalEngine(ArtifactRepository(db), BeliefLifecycleRepository(db), ProposalRepository(db))
+    try:
+        items, next_cursor = engine.get_history_page(proposal_type, status, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_url = None
+    if next_cursor:
+        query = urlencode({"proposal_type": proposal_type, "status": status, "cursor": next_cursor, "limit": limit})
+        next_url = f"/proposals/history/rows?{query}"
+    return templates.TemplateResponse(
+        "proposal_history/rows.html",
+        {"request": request, "items": items, "proposal_type": proposal_type, "next_url": next_url},
+    )
@@ -1,15 +1,24 @@
 """Read-only report endpoints (derived decision state). Decision analytics."""
-from datetime import datetime
+from datetime import date, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 
 from api.deps import get_db
+from api.report_cache import cached_json_report, etag_for, not_modified, report_key
 from core.repositories.artifact_repository import ArtifactRepository
 from core.repositories.lifecycle_repository import BeliefLifecycleRepository
 from core.repositories.observed_returns_repository import ObservedReturnsRepository
 from core.services.decision_analytics_service import DecisionAnalyticsService
 from core.services.decision_projection_service import DecisionProjectionService
+from db.models.artifact import ArtifactORM
+from db.models.lifecycle import BeliefLifecycleEventORM
+from db.models.observed_returns import BeliefReturnObservationORM, ObservedReturnPeriodORM
+
+# Tables each report family reads; their high-water marks form the cache data version.
+DECISION_TABLES = (ArtifactORM, BeliefLifecycleEventORM)
+RETURNS_TABLES = (ObservedReturnPeriodORM,)
+OUTCOME_TABLES = DECISION_TABLES + (ObservedReturnPeriodORM, BeliefReturnObservationORM)
 
 
 class PortfolioReturnPeriodBody(BaseModel):
@@ -23,8 +32,28 @@ class PortfolioReturnPeriodBody(BaseModel):
 router = APIRouter()
 
 
+OBSERVED_OUTCOME_FIELDS = [
+    "belief_id", "belief_text_snippet", "current_decision_type", "latest_decision_at", "returns_placeholder",
+]
+
+
+def _portfolio_returns(returns_repo) -> list[dict]:
+    return [
+        {
+            "id": p.id,
+            "period_start": p.period_start.isoformat() if p.period_start else None,
+            "period_end": p.period_end.isoformat() if p.period_end else None,
+            "return_pct": p.return_pct,
+            "risk_metric": p.risk_metric,
+            "notes": p.notes,
+        }
+        for p in returns_repo.list_periods()
+    ]
+
+
 @router.get("/api/reports/beliefs")
 def report_beliefs_by_decision(
+    request: Request,
     decision: str = Query(..., description="Filter by current decision type, e.g. strong_tension"),
     db=Depends(get_db),
 ):
@@ -32,91 +61,128 @@ def report_beliefs_by_decision(
     Beliefs whose current (latest) decision has the given type.
     Read-only; current state is computed, not stored.
     """
-    artifact_repo = ArtifactRepository(db)
-    lifecycle_repo = BeliefLifecycleRepository(db)
-    projection = DecisionProjectionService(artifact_repo, lifecycle_repo)
-    beliefs = projection.get_beliefs_by_current_decision(decision_type=decision)
-    return {"decision_filter": decision, "beliefs": beliefs}
+    def compute():
+        artifact_repo = ArtifactRepository(db)
+        lifecycle_repo = BeliefLifecycleRepository(db)
+        projection = DecisionProjectionService(artifact_repo, lifecycle_repo)
+        beliefs = projection.get_beliefs_by_current_decision(decision_type=decision)
+        return {"decision_filter": decision, "beliefs": beliefs}
+
+    return cached_json_report(
+        request, db, "beliefs", DECISION_TABLES, compute, params={"decision": decision}
+    )
 
 
 @router.get("/api/reports/decision-summary")
 def report_decision_summary(
+    request: Request,
     since: str | None = Query(None, description="ISO date, e.g. 2026-01-01"),
     db=Depends(get_db),
 ):
     """
     Counts of decision events by type (since= optional). Derived from lifecycle; not stored.
     """
-    artifact_repo = ArtifactRepository(db)
-    lifecycle_repo = BeliefLifecycleRepository(db)
-    projection = DecisionProjectionService(artifact_repo, lifecycle_repo)
-    since_dt = None
-    if since:
-        try:
-            since_dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
-        except (ValueError, TypeError):
-            since_dt = None
-    summary = projection.get_decision_summary(since=since_dt)
-    return {"since": since, "summary": summary}
+    def compute():
+        artifact_repo = ArtifactRepository(db)
+        lifecycle_repo = BeliefLifecycleRepository(db)
+        projection = DecisionProjectionService(artifact_repo, lifecycle_repo)
+        since_dt = None
+        if since:
+            try:
+                since_dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
+            except (ValueError, TypeError):
+                since_dt = None
+        summary = projection.get_decision_summary(since=since_dt)
+        return {"since": since, "summary": summary}
+
+    return cached_json_report(
+        request, db, "decision-summary", (BeliefLifecycleEventORM,), compute, params={"since": since}
+    )
 
 
 @router.get("/api/reports/durability")
-def report_durability(db=Depends(get_db)):
+def report_durability(request: Request, db=Depends(get_db)):
     """
     Belief durability: time from creation to first non-reinforced decision.
     Median, mean, distribution buckets, per-belief list. Derived only — not stored.
     """
-    artifact_repo = ArtifactRepository(db)
-    lifecycle_repo = BeliefLifecycleRepository(db)
-    analytics = DecisionAnalyticsService(artifact_repo, lifecycle_repo)
-    return analytics.get_belief_durability()
+    def compute():
+        artifact_repo = ArtifactRepository(db)
+        lifecycle_repo = BeliefLifecycleRepository(db)
+        analytics = DecisionAnalyticsService(artifact_repo, lifecycle_repo)
+        return analytics.get_belief_durability()
+
+    return cached_json_report(request, db, "durability", DECISION_TABLES, compute)
+
+
+@router.get("/api/reports/durability/survival")
+def report_durability_survival(
+    request: Request,
+    as_of: str | None = Query(None, description="ISO date used as the censoring time; default now"),
+    db=Depends(get_db),
+):
+    """
+    Kaplan–Meier survival of beliefs until their first non-reinforced decision.
+    Only-reinforced beliefs are right-censored at as_of. Overall curve, median, per creation-month cohorts.
+    """
+    as_of_dt = None
+    if as_of:
+        try:
+            as_of_dt = datetime.fromisoformat(as_of.replace("Z", "+00:00"))
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="as_of must be an ISO date")
+
+    def compute():
+        artifact_repo = ArtifactRepository(db)
+        lifecycle_repo = BeliefLifecycleRepository(db)
+        analytics = DecisionAnalyticsService(artifact_repo, lifecycle_repo)
+        return analytics.get_belief_survival(as_of=as_of_dt)
+
+    # Censoring defaults to now, so the default report is keyed by today's date as well.
+    params = {"as_of": as_of or date.today().isoformat()}
+    return cached_json_report(request, db, "durability-survival", DECISION_TABLES, compute, params=params)
 
 
 @router.get("/api/reports/tension-density")
-def report_tension_density(db=Depends(get_db)):
+def report_tension_density(request: Request, db=Depends(get_db)):
     """
     % of beliefs currently under slight or strong tension. Systemic stress.
     Descriptive only; derived from current decision projection.
     """
-    artifact_repo = ArtifactRepository(db)
-    lifecycle_repo = BeliefLifecycleRepository(db)
-    analytics = DecisionAnalyticsService(artifact_repo, lifecycle_repo)
-    return analytics.get_tension_density()
+    def compute():
+        artifact_repo = ArtifactRepository(db)
+        lifecycle_repo = BeliefLifecycleRepository(db)
+        analytics = DecisionAnalyticsService(artifact_repo, lifecycle_repo)
+        return analytics.get_tension_density()
+
+    return cached_json_report(request, db, "tension-density", DECISION_TABLES, compute)
 
 
 @router.get("/api/reports/trajectories")
-def report_trajectories(db=Depends(get_db)):
+def report_trajectories(request: Request, db=Depends(get_db)):
     """
     Per-belief decision sequence classified: stable, gradual_degradation, sudden_collapse, oscillatory.
     Labels are derived only — never persisted. Descriptive, not evaluative.
     """
-    artifact_repo = ArtifactRepository(db)
-    lifecycle_repo = BeliefLifecycleRepository(db)
-    analytics = DecisionAnalyticsService(artifact_repo, lifecycle_repo)
-    return analytics.get_trajectory_patterns()
+    def compute():
+        artifact_repo = ArtifactRepository(db)
+        lifecycle_repo = BeliefLifecycleRepository(db)
+        analytics = DecisionAnalyticsService(artifact_repo, lifecycle_repo)
+        return analytics.get_trajectory_patterns()
+
+    return cached_json_report(request, db, "trajectories", DECISION_TABLES, compute)
 
 
 @router.get("/api/reports/portfolio-returns")
-def get_portfolio_returns(db=Depends(get_db)):
+def get_portfolio_returns(request: Request, db=Depends(get_db)):
     """
     List all observed return periods (portfolio-level). Read-only view.
     Does not mutate reasoning layer.
     """
-    repo = ObservedReturnsRepository(db)
-    periods = repo.list_periods()
-    return {
-        "portfolio_returns": [
-            {
-                "id": p.id,
-                "period_start": p.period_start.isoformat() if p.period_start else None,
-                "period_end": p.period_end.isoformat() if p.period_end else None,
-                "return_pct": p.return_pct,
-                "risk_metric": p.risk_metric,
-                "notes": p.notes,
-            }
-            for p in periods
-        ]
-    }
+    def compute():
+        return {"portfolio_returns": _portfolio_returns(ObservedReturnsRepository(db))}
+
+    return cached_json_report(request, db, "portfolio-returns", RETURNS_TABLES, compute)
 
 
 @router.post("/api/reports/portfolio-returns", status_code=201)
@@ -142,73 +208,82 @@ def add_portfolio_return(body: PortfolioReturnPeriodBody, db=Depends(get_db)):
     return {"id": period_id}
 
 
-@router.get("/api/reports/observed-outcomes")
-def report_observed_outcomes(
-    format: str | None = Query("json", description="json or csv"),
-    db=Depends(get_db),
-):
+def _iter_observed_outcomes(db):
     """
-    Beliefs with current decision and linked returns (when available).
-    Includes portfolio return periods. Read-only; never drives mutation.
+    Yield one observed-outcome row per belief. Query count is constant in the number of beliefs:
+    one decision-event scan, one belief→period JOIN, and a batched artifact scan.
     """
-    import csv
-    import io
-
-    from fastapi.responses import PlainTextResponse
-
     from core.models.reasoning_artifact import ArtifactType
 
     artifact_repo = ArtifactRepository(db)
     lifecycle_repo = BeliefLifecycleRepository(db)
     projection = DecisionProjectionService(artifact_repo, lifecycle_repo)
-    returns_repo = ObservedReturnsRepository(db)
-    portfolio_periods = returns_repo.list_periods()
-    portfolio_returns = [
-        {
-            "id": p.id,
-            "period_start": p.period_start.isoformat() if p.period_start else None,
-            "period_end": p.period_end.isoformat() if p.period_end else None,
-            "return_pct": p.return_pct,
-            "risk_metric": p.risk_metric,
-            "notes": p.notes,
-        }
-        for p in portfolio_periods
-    ]
+    states = projection.get_current_decision_states()
+    latest_returns = ObservedReturnsRepository(db).latest_return_by_belief()
 
-    all_artifacts = artifact_repo.list_by_type("ReasoningArtifact")
-    rows = []
-    for b in all_artifacts:
+    for b in artifact_repo.iter_by_type("ReasoningArtifact"):
         if getattr(b, "artifact_type", None) not in (ArtifactType.thesis, ArtifactType.risk):
             continue
         bid = str(getattr(b, "reasoning_id", ""))
         if not bid or not getattr(b, "claim", None):
             continue
-        state = projection.get_current_decision_state(bid)
+        state = states.get(bid)
         occ = state.get("occurred_at") if state else None
         if hasattr(occ, "isoformat"):
             occ = occ.isoformat()
         elif occ is not None:
             occ = str(occ)
-        # Link to observed return: use latest linked period's return_pct
-        linked_periods = returns_repo.get_periods_for_belief(bid)
-        returns_placeholder = None
-        if linked_periods:
-            latest = max(linked_periods, key=lambda p: p.period_end or "")
-            returns_placeholder = latest.return_pct
-        rows.append({
+        yield {
             "belief_id": bid,
             "belief_text_snippet": (b.claim.statement or "")[:200],
             "current_decision_type": state.get("type") if state else None,
             "latest_decision_at": occ,
-            "returns_placeholder": returns_placeholder,
-        })
+            # Link to observed return: latest linked period's return_pct
+            "returns_placeholder": latest_returns.get(bid),
+        }
+
+
+@router.get("/api/reports/observed-outcomes")
+def report_observed_outcomes(
+    request: Request,
+    format: str | None = Query("json", description="json or csv"),
+    db=Depends(get_db),
+):
+    """
+    Beliefs with current decision and linked returns (when available).
+    Includes portfolio return periods. Read-only; never drives mutation.
+    CSV is streamed row by row.
+    """
+    import csv
+    import io
+
+    from fastapi.responses import StreamingResponse
+
     if format == "csv":
-        out = io.StringIO()
-        writer = csv.DictWriter(
-            out,
-            fieldnames=["belief_id", "belief_text_snippet", "current_decision_type", "latest_decision_at", "returns_placeholder"],
-        )
-        writer.writeheader()
-        writer.writerows(rows)
-        return PlainTextResponse(out.getvalue(), media_type="text/csv")
-    return {"portfolio_returns": portfolio_returns, "observed_outcomes": rows}
+        key = report_key(db, "observed-outcomes.csv", OUTCOME_TABLES)
+        cached = not_modified(request, key)
+        if cached is not None:
+            return cached
+
+        def stream_csv():
+            buf = io.StringIO()
+            writer = csv.DictWriter(buf, fieldnames=OBSERVED_OUTCOME_FIELDS)
+            writer.writeheader()
+            for row in _iter_observed_outcomes(db):
+                writer.writerow(row)
+                if buf.tell() >= 64 * 1024:
+                    yield buf.getvalue()
+                    buf.seek(0)
+                    buf.truncate()
+            yield buf.getvalue()
+
+        return StreamingResponse(stream_csv(), media_type="text/csv", headers={"ETag": etag_for(key)})
+
+    def compute():
+        returns_repo = ObservedReturnsRepository(db)
+        return {
+            "portfolio_returns": _portfolio_returns(returns_repo),
+            "observed_outcomes": list(_iter_observed_outcomes(db)),
+        }
+
+    return cached_json_report(request, db, "observed-outcomes", OUTCOME_TABLES, compute)
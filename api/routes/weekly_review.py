@@ -1,91 +1,116 @@
+import time
 from datetime import date
+from urllib.parse import urlencode
 
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from markupsafe import Markup
 from sqlalchemy.orm import Session
 
 from api.deps import get_db
-from core.models.reasoning_artifact import ArtifactType, ReasoningArtifact
+from api.report_cache import etag_for, fragment_cache, not_modified, report_key
 from core.repositories.artifact_repository import ArtifactRepository
-from core.repositories.cadence_repository import CadenceRepository
 from core.repositories.lifecycle_repository import BeliefLifecycleRepository
-from core.repositories.proposal_repository import ProposalRepository
-from core.repositories.question_answer_repository import QuestionAnswerRepository
-from core.services.artifact_integrity_service import ArtifactIntegrityService
 from core.services.belief_analysis_service import BeliefAnalysisService
-from core.services.introspection_service import IntrospectionService
-from core.services.proposal_engine import ProposalEngine
+from core.services.weekly_review_assembler import SECTIONS, WeeklyReviewAssembler
 from core.templates import templates
+from db.models.artifact import ArtifactORM
+from db.models.lifecycle import BeliefLifecycleEventORM
+from db.models.proposal import ProposalORM
+from db.models.question_answer import QuestionAnswerORM
+from db.models.review_cadence import BeliefReviewCadenceORM
 
 router = APIRouter()
 
+PAGE_SIZE = 50
 
-@router.get("/weekly-review", response_class=HTMLResponse)
-def weekly_review(request: Request, db: Session = Depends(get_db)):
+# Tables each section reads. Grounding updates rewrite a belief's refs in place but always
+# append a GroundingUpdatedEvent, so the lifecycle table versions artifact-derived sections.
+_ARTIFACTS = (ArtifactORM, BeliefLifecycleEventORM)
+FRAGMENT_TABLES = {
+    "all_beliefs": _ARTIFACTS,
+    "questions": (ArtifactORM, QuestionAnswerORM),
+    "stale_beliefs": _ARTIFACTS,
+    "cadence_due": (*_ARTIFACTS, BeliefReviewCadenceORM),
+    "orphans": _ARTIFACTS,
+    "proposals": (*_ARTIFACTS, ProposalORM),
+}
 
-    artifact_repo = ArtifactRepository(db)
-    lifecycle_repo = BeliefLifecycleRepository(db)
-    proposal_repo = ProposalRepository(db)
 
-    proposal_engine = ProposalEngine(artifact_repo, lifecycle_repo, proposal_repo)
-    proposal_engine.evaluate()
-    proposals = proposal_engine.list_for_display()
+def render_section(assembler: WeeklyReviewAssembler, name: str, timings: dict[str, float]) -> Markup:
+    """Compute and render one section partial; records wall time (ms) in timings[name]."""
+    started = time.perf_counter()
+    html = templates.get_template(f"weekly_review/{name}.html").render(assembler.section_context(name))
+    timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    return Markup(html)
 
-    answer_repo = QuestionAnswerRepository(db)
-    introspection = IntrospectionService(artifact_repo, answer_repo.answered_question_ids())
-    belief_analysis = BeliefAnalysisService(artifact_repo, lifecycle_repo)
-    integrity = ArtifactIntegrityService(artifact_repo)
 
-    questions = introspection.get_open_questions()
-    stale_beliefs = belief_analysis.get_beliefs_needing_review()
-    all_beliefs = belief_analysis.get_all_beliefs_grouped()
+@router.get("/weekly-review", response_class=HTMLResponse)
+def weekly_review(request: Request, db: Session = Depends(get_db)):
+    # Shell flushes first; each section is computed and streamed as the template reaches it.
+    # All sections still derive from one working set (see WeeklyReviewAssembler).
+    assembler = WeeklyReviewAssembler(db)
+    timings: dict[str, float] = {}
+    page = templates.get_template("weekly_review.html").generate({
+        "request": request,
+        "sections": SECTIONS,
+        "render_section": lambda name: render_section(assembler, name, timings),
+        "timings": timings,
+        "grounding_updated": request.query_params.get("grounding_updated") == "1",
+        "grounding_detail": request.query_params.get("detail", ""),
+    })
+    return StreamingResponse(page, media_type="text/html; charset=utf-8")
 
-    cadence_repo = CadenceRepository(db)
-    today = date.today()
-    cadence_rows = cadence_repo.list_due(today)
-    cadence_due = []
-    for row in cadence_rows:
-        belief = artifact_repo.get(row.belief_id)
-        if not belief or not isinstance(belief, ReasoningArtifact) or belief.artifact_type not in {ArtifactType.thesis, ArtifactType.risk}:
-            continue
-        tickers = set()
-        for sid in belief.references.snapshot_ids:
-            snap = artifact_repo.get(str(sid))
-            if snap and getattr(snap, "company", None) and getattr(snap.company, "ticker", None):
-                tickers.add(snap.company.ticker)
-        company = ", ".join(sorted(tickers)) if tickers else "uncoupled"
-        cadence_due.append({
-            "belief_id": row.belief_id,
-            "belief_text": belief.claim.statement or "",
-            "next_review_by": row.next_review_by.isoformat() if row.next_review_by else "",
-            "cadence_days": row.cadence_days,
-            "company": company,
-        })
 
-    proposals_total = sum(
-        sum(len(instances) for instances in clusters.values())
-        for clusters in proposals.values()
+@router.get("/weekly-review/fragments/all-beliefs/rows", response_class=HTMLResponse)
+def all_beliefs_rows(
+    request: Request,
+    group: str,
+    cursor: str | None = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """Table rows for one "All Beliefs" group, one page at a time (keyset cursor)."""
+    try:
+        service = BeliefAnalysisService(ArtifactRepository(db), BeliefLifecycleRepository(db))
+        items, next_cursor = service.get_all_beliefs_page(group, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    next_url = None
+    if next_cursor:
+        query = urlencode({"group": group, "cursor": next_cursor, "limit": limit})
+        next_url = f"/weekly-review/fragments/all-beliefs/rows?{query}"
+    return templates.TemplateResponse(
+        "weekly_review/all_beliefs_rows.html",
+        {"request": request, "items": items, "next_url": next_url},
     )
 
-    grounding_updated = request.query_params.get("grounding_updated") == "1"
-    grounding_detail = request.query_params.get("detail", "")
 
-    return templates.TemplateResponse(
-        "weekly_review.html",
-        {
-            "request": request,
-            "proposals": proposals,
-            "proposals_total": proposals_total,
-            "questions": questions,
-            "questions_total": sum(len(v) for v in questions.values()),
-            "stale_beliefs": stale_beliefs,
-            "stale_beliefs_total": sum(len(v) for v in stale_beliefs.values()),
-            "cadence_due": cadence_due,
-            "cadence_due_total": len(cadence_due),
-            "all_beliefs": all_beliefs,
-            "all_beliefs_total": sum(len(v) for v in all_beliefs.values()),
-            "orphans": integrity.get_orphans(),
-            "grounding_updated": grounding_updated,
-            "grounding_detail": grounding_detail,
-        }
-    )
+@router.get("/weekly-review/fragments/{section}", response_class=HTMLResponse)
+def weekly_review_fragment(section: str, request: Request, db: Session = Depends(get_db)):
+    """
+    One weekly review section as an HTML fragment (e.g. /weekly-review/fragments/stale-beliefs).
+    Cached against the data version of the tables the section reads, plus today's date (ages, due dates).
+    """
+    name = section.replace("-", "_")
+    if name not in SECTIONS:
+        raise HTTPException(status_code=404, detail="Unknown weekly review section")
+    today = date.today()
+    models = FRAGMENT_TABLES[name]
+    params = {"today": today.isoformat()}
+    key = report_key(db, f"weekly-review/{name}", models, params)
+    cached = not_modified(request, key)
+    if cached is not None:
+        return cached
+    headers = {"Cache-Control": "no-cache"}
+    body = fragment_cache.get(key)
+    if body is None:
+        timings: dict[str, float] = {}
+        body = render_section(WeeklyReviewAssembler(db, today=today), name, timings).encode("utf-8")
+        headers["Server-Timing"] = f"render;dur={timings[name]}"
+        if name == "proposals":
+            # Rendering proposals runs the engine (expire / generate); key on the post-render version.
+            key = report_key(db, f"weekly-review/{name}", models, params)
+        fragment_cache.set(key, body)
+    headers["ETag"] = etag_for(key)
+    return Response(content=body, media_type="text/html; charset=utf-8", headers=headers)
@@ -1,9 +1,13 @@
+from collections import defaultdict
+
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, distinct, func, insert, or_, select
+from sqlalchemy.orm import Session, aliased
 
 from core.exceptions import ArtifactConflictError
 from core.models.reasoning_artifact import ReasoningArtifact
 from core.models.stock_snapshot import StockSnapshot
+from core.repositories.cursor import decode_cursor, encode_cursor
 from db.models.artifact import ArtifactORM
 
 
@@ -31,6 +35,32 @@ def _get_schema_version(artifact: BaseModel) -> str:
     raise ValueError(f"Unknown artifact type: {type(artifact).__name__}")
 
 
+BELIEF_TYPES = ("thesis", "risk")
+UNCOUPLED = "uncoupled"
+
+
+def _belief_group_key(belief):
+    """
+    SQL expression for a belief's display group: distinct tickers of its referenced snapshots,
+    sorted and joined with ", " (or "uncoupled"). Same grouping as get_all_beliefs_grouped.
+    """
+    snapshot = aliased(ArtifactORM)
+    refs = func.json_each(belief.payload, "$.references.snapshot_ids").table_valued("value").alias("ref")
+    ticker = func.json_extract(snapshot.payload, "$.company.ticker")
+    tickers = (
+        select(distinct(ticker).label("ticker"))
+        .select_from(refs)
+        .join(snapshot, and_(snapshot.artifact_id == refs.c.value, snapshot.artifact_type == "StockSnapshot"))
+        .where(ticker.is_not(None), ticker != "")
+        .order_by(ticker)
+        .correlate(belief)
+        .subquery()
+    )
+    # group_concat follows the subquery's ORDER BY on SQLite.
+    joined = select(func.group_concat(tickers.c.ticker, ", ")).scalar_subquery()
+    return func.coalesce(joined, UNCOUPLED)
+
+
 class ArtifactRepository:
 
     def __init__(self, db: Session):
@@ -52,6 +82,37 @@ class ArtifactRepository:
         self.db.add(orm_obj)
         self.db.commit()
 
+    def save_many(self, artifacts) -> int:
+        """
+        Insert new artifacts with one existence query and one bulk INSERT, in one commit.
+        Same immutability rule as save(): raises if any of them is already stored.
+        """
+        rows = [
+            {
+                "artifact_id": _get_artifact_pk(a),
+                "artifact_type": a.__class__.__name__,
+                "schema_version": _get_schema_version(a),
+                "created_at": _get_created_at(a),
+                "payload": a.model_dump(mode="json"),
+            }
+            for a in artifacts
+        ]
+        if not rows:
+            return 0
+        if self.existing_ids(r["artifact_id"] for r in rows):
+            raise ArtifactConflictError("Artifacts are immutable. Update not allowed.")
+        self.db.execute(insert(ArtifactORM.__table__), rows)
+        self.db.commit()
+        return len(rows)
+
+    def existing_ids(self, artifact_ids) -> set[str]:
+        """Which of these ids are stored, from one query (no payloads loaded)."""
+        ids = list(dict.fromkeys(str(i) for i in artifact_ids))
+        if not ids:
+            return set()
+        query = self.db.query(ArtifactORM.artifact_id).filter(ArtifactORM.artifact_id.in_(ids))
+        return {artifact_id for (artifact_id,) in query}
+
     def get(self, artifact_id: str):
         obj = self.db.query(ArtifactORM).filter_by(artifact_id=artifact_id).first()
         if not obj:
@@ -63,6 +124,97 @@ class ArtifactRepository:
         objs = self.db.query(ArtifactORM).filter_by(artifact_type=artifact_type).all()
         return [_rehydrate(o.artifact_type, o.payload) for o in objs]
 
+    def load_working_set(self) -> "ArtifactWorkingSet":
+        """Every artifact, rehydrated once, from a single query. Read-only in-memory view."""
+        rows = self.db.query(ArtifactORM.artifact_type, ArtifactORM.payload).all()
+        return ArtifactWorkingSet(_rehydrate(t, p) for t, p in rows)
+
+    def iter_by_type(self, artifact_type: str, batch_size: int = 500):
+        """Like list_by_type, but streams rows in batches instead of materializing all of them."""
+        query = self.db.query(ArtifactORM).filter_by(artifact_type=artifact_type).yield_per(batch_size)
+        for o in query:
+            yield _rehydrate(o.artifact_type, o.payload)
+
+    def get_payloads(self, artifact_ids, artifact_type: str | None = None) -> dict[str, dict]:
+        """Raw stored payloads (no Pydantic rehydration) for these ids, from one query. Missing ids are absent."""
+        ids = list(dict.fromkeys(str(i) for i in artifact_ids))
+        if not ids:
+            return {}
+        query = self.db.query(ArtifactORM.artifact_id, ArtifactORM.payload).filter(ArtifactORM.artifact_id.in_(ids))
+        if artifact_type is not None:
+            query = query.filter(ArtifactORM.artifact_type == artifact_type)
+        return dict(query.all())
+
+    def iter_payloads_by_type(self, artifact_type: str, batch_size: int = 1000):
+        """Raw stored JSON payloads (no Pydantic rehydration), streamed in batches. For bulk export."""
+        query = (
+            self.db.query(ArtifactORM.payload)
+            .filter_by(artifact_type=artifact_type)
+            .order_by(ArtifactORM.created_at.asc())
+            .yield_per(batch_size)
+        )
+        for (payload,) in query:
+            yield payload
+
+    def count_beliefs_by_group(self) -> dict[str, int]:
+        """Theses and risks per display group (see _belief_group_key), via one GROUP BY."""
+        belief = aliased(ArtifactORM)
+        group = _belief_group_key(belief).label("grp")
+        stmt = (
+            select(group, func.count())
+            .select_from(belief)
+            .where(
+                belief.artifact_type == "ReasoningArtifact",
+                func.json_extract(belief.payload, "$.artifact_type").in_(BELIEF_TYPES),
+            )
+            .group_by(group)
+            .order_by(group)
+        )
+        return {g: int(n) for g, n in self.db.execute(stmt)}
+
+    def list_beliefs_in_group(self, group: str, cursor: str | None = None, limit: int = 50):
+        """
+        One page of a display group's theses and risks, oldest first, keyed on (created_at, id).
+        Returns (rows, next_cursor); next_cursor is None on the last page. Raw fields, no rehydration.
+        """
+        belief = aliased(ArtifactORM)
+        stmt = (
+            select(
+                belief.artifact_id,
+                belief.created_at,
+                func.json_extract(belief.payload, "$.claim.statement"),
+                func.json_extract(belief.payload, "$.artifact_type"),
+            )
+            .where(
+                belief.artifact_type == "ReasoningArtifact",
+                func.json_extract(belief.payload, "$.artifact_type").in_(BELIEF_TYPES),
+                _belief_group_key(belief) == group,
+            )
+            .order_by(belief.created_at.asc(), belief.artifact_id.asc())
+            .limit(limit + 1)
+        )
+        if cursor:
+            after_ts, after_id = decode_cursor(cursor)
+            stmt = stmt.where(or_(
+                belief.created_at > after_ts,
+                and_(belief.created_at == after_ts, belief.artifact_id > after_id),
+            ))
+        rows = self.db.execute(stmt).all()
+        page = [
+            {
+                "belief_id": artifact_id,
+                "belief_text": statement or "",
+                "artifact_type": artifact_type,
+                "created_at": created_at,
+            }
+            for artifact_id, created_at, statement, artifact_type in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(last["created_at"], last["belief_id"])
+        return page, next_cursor
+
     def update_belief_snapshot_refs(self, belief_id: str, new_snapshot_ids: list) -> None:
         """
         Update a belief's snapshot references (structural grounding only).
@@ -80,6 +232,26 @@ class ArtifactRepository:
         self.db.commit()
 
 
+class ArtifactWorkingSet:
+    """
+    Preloaded artifacts with the read side of ArtifactRepository (get, list_by_type).
+    Lets read-only services run against one bulk load instead of per-item queries. No writes.
+    """
+
+    def __init__(self, artifacts):
+        self._by_id: dict[str, BaseModel] = {}
+        self._by_type: dict[str, list] = defaultdict(list)
+        for artifact in artifacts:
+            self._by_id[_get_artifact_pk(artifact)] = artifact
+            self._by_type[artifact.__class__.__name__].append(artifact)
+
+    def get(self, artifact_id: str):
+        return self._by_id.get(str(artifact_id))
+
+    def list_by_type(self, artifact_type: str):
+        return list(self._by_type.get(artifact_type, []))
+
+
 def _rehydrate(artifact_type: str, payload: dict):
     if artifact_type == "StockSnapshot":
         return StockSnapshot(**payload)
@@ -1,7 +1,9 @@
 from datetime import UTC, date, datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, true
+from sqlalchemy.orm import Session, aliased
 
+from db.models.artifact import ArtifactORM
 from db.models.review_cadence import BeliefReviewCadenceORM
 
 
@@ -44,3 +46,53 @@ class CadenceRepository:
             .order_by(BeliefReviewCadenceORM.next_review_by.asc())
             .all()
         )
+
+    def list_due_with_beliefs(self, on_or_before: date) -> list[dict]:
+        """
+        Due rows joined to belief statement, artifact_type and referenced snapshot tickers.
+        One query (SQLite JSON1: json_each over references.snapshot_ids). Rows whose belief
+        artifact is missing are dropped. Ordered by next_review_by asc; tickers sorted, deduplicated.
+        """
+        belief = aliased(ArtifactORM)
+        snapshot = aliased(ArtifactORM)
+        refs = func.json_each(belief.payload, "$.references.snapshot_ids").table_valued("value").alias("ref")
+        stmt = (
+            select(
+                BeliefReviewCadenceORM.belief_id,
+                BeliefReviewCadenceORM.next_review_by,
+                BeliefReviewCadenceORM.cadence_days,
+                func.json_extract(belief.payload, "$.claim.statement"),
+                func.json_extract(belief.payload, "$.artifact_type"),
+                func.json_extract(snapshot.payload, "$.company.ticker"),
+            )
+            .select_from(BeliefReviewCadenceORM)
+            .join(
+                belief,
+                (belief.artifact_id == BeliefReviewCadenceORM.belief_id)
+                & (belief.artifact_type == "ReasoningArtifact"),
+            )
+            .outerjoin(refs, true())
+            .outerjoin(
+                snapshot,
+                (snapshot.artifact_id == refs.c.value) & (snapshot.artifact_type == "StockSnapshot"),
+            )
+            .where(BeliefReviewCadenceORM.next_review_by <= on_or_before)
+            .order_by(BeliefReviewCadenceORM.next_review_by.asc(), BeliefReviewCadenceORM.belief_id.asc())
+        )
+        out: dict[str, dict] = {}
+        for belief_id, next_review_by, cadence_days, statement, artifact_type, ticker in self.db.execute(stmt):
+            item = out.get(belief_id)
+            if item is None:
+                item = out[belief_id] = {
+                    "belief_id": belief_id,
+                    "next_review_by": next_review_by,
+                    "cadence_days": cadence_days,
+                    "statement": statement or "",
+                    "artifact_type": artifact_type,
+                    "tickers": set(),
+                }
+            if ticker:
+                item["tickers"].add(ticker)
+        for item in out.values():
+            item["tickers"] = sorted(item["tickers"])
+        return list(out.values())
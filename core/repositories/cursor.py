@@ -0,0 +1,24 @@
+"""
+Opaque keyset cursors for paginated reads.
+
+A cursor encodes the sort key of the last row served (e.g. created_at + id), so the next
+page is a range scan from that key rather than an OFFSET over an ever-growing table.
+"""
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime | None, row_id: str) -> str:
+    raw = json.dumps([created_at.isoformat() if created_at else "", row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, str]:
+    """Inverse of encode_cursor. Raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, row_id = json.loads(raw)
+        return (datetime.fromisoformat(created_at) if created_at else None), str(row_id)
+    except (ValueError, TypeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
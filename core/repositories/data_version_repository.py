@@ -0,0 +1,51 @@
+"""
+Cheap data high-water marks for read-only caches.
+
+A table's version is (row count, max rowid, max timestamp). Appends move max rowid and
+timestamp; deletes move the count. Tables with a status column (proposals) also carry
+counts per status: status updates happen in place and move none of the other marks,
+but statuses only move forward (pending → accepted/rejected → expired), so the
+per-status counts never repeat.
+No writes. The log remains canonical.
+"""
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Session
+
+
+def _version_column(model):
+    for name in ("created_at", "updated_at", "answered_at"):
+        column = getattr(model, name, None)
+        if column is not None:
+            return column
+    raise ValueError(f"No timestamp column on {model.__name__}")
+
+
+class DataVersionRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_table_version(self, model) -> tuple:
+        """(count, max rowid, max timestamp ISO[, per-status counts]) for one ORM table."""
+        stmt = select(
+            func.count(),
+            func.max(literal_column("rowid")),
+            func.max(_version_column(model)),
+        ).select_from(model)
+        count, max_rowid, max_ts = self.db.execute(stmt).one()
+        version = (
+            int(count or 0),
+            int(max_rowid or 0),
+            max_ts.isoformat() if hasattr(max_ts, "isoformat") else (str(max_ts) if max_ts else ""),
+        )
+        status = getattr(model, "status", None)
+        if status is not None:
+            rows = self.db.execute(select(status, func.count()).group_by(status).order_by(status)).all()
+            version += (tuple((s, int(n)) for s, n in rows),)
+        return version
+
+    def get_version(self, models) -> tuple:
+        """Combined version for the tables a derived view reads. Stable order by table name."""
+        return tuple(
+            (m.__tablename__, *self.get_table_version(m))
+            for m in sorted(models, key=lambda m: m.__tablename__)
+        )
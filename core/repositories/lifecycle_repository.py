@@ -28,6 +28,12 @@ class BeliefLifecycleRepository:
             .order_by(BeliefLifecycleEventORM.created_at.asc())\
             .all()
 
+    def iter_all(self, batch_size: int = 1000):
+        """All lifecycle events, oldest first, streamed in batches. For bulk export."""
+        return self.db.query(BeliefLifecycleEventORM)\
+            .order_by(BeliefLifecycleEventORM.created_at.asc())\
+            .yield_per(batch_size)
+
     def list_decision_events(self, since=None, decision_type=None):
         """List all lifecycle events with event_kind=decision; filter in Python for SQLite compatibility."""
         rows = self.db.query(BeliefLifecycleEventORM).order_by(
@@ -67,6 +67,25 @@ class ObservedReturnsRepository:
             ObservedReturnPeriodORM.id.in_(period_ids)
         ).all()
 
+    def latest_return_by_belief(self) -> dict[str, float | None]:
+        """belief_id → return_pct of its latest linked period (by period_end). One JOIN."""
+        rows = (
+            self.db.query(
+                BeliefReturnObservationORM.belief_id,
+                ObservedReturnPeriodORM.return_pct,
+            )
+            .join(
+                ObservedReturnPeriodORM,
+                ObservedReturnPeriodORM.id == BeliefReturnObservationORM.return_period_id,
+            )
+            .order_by(ObservedReturnPeriodORM.period_end.desc(), ObservedReturnPeriodORM.id.asc())
+            .all()
+        )
+        out: dict[str, float | None] = {}
+        for belief_id, return_pct in rows:
+            out.setdefault(belief_id, return_pct)
+        return out
+
     def link_belief_to_period(self, belief_id: str, return_period_id: int) -> bool:
         """Link a belief to an observed return period. Idempotent (re-link same pair no-op)."""
         period = self.get_period(return_period_id)
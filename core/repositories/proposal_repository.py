@@ -1,7 +1,9 @@
 from datetime import UTC
 
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 
+from core.repositories.cursor import decode_cursor, encode_cursor
 from db.models.proposal import ProposalORM
 
 # Status states: pending | accepted | rejected | expired
@@ -82,6 +84,45 @@ class ProposalRepository:
             .all()
         )
 
+    def count_by_type_and_status(self) -> dict[str, dict[str, int]]:
+        """{proposal_type: {status: count}} via one GROUP BY. For the paginated audit view."""
+        rows = (
+            self.db.query(ProposalORM.proposal_type, ProposalORM.status, func.count())
+            .group_by(ProposalORM.proposal_type, ProposalORM.status)
+            .order_by(ProposalORM.proposal_type, ProposalORM.status)
+            .all()
+        )
+        counts: dict[str, dict[str, int]] = {}
+        for proposal_type, status, n in rows:
+            counts.setdefault(proposal_type, {})[status] = int(n)
+        return counts
+
+    def list_page(self, proposal_type: str, status: str, cursor: str | None = None, limit: int = 50):
+        """
+        One page of (proposal_type, status), newest first, keyed on (created_at, proposal_id).
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        """
+        query = self.db.query(ProposalORM).filter(
+            ProposalORM.proposal_type == proposal_type,
+            ProposalORM.status == status,
+        )
+        if cursor:
+            before_ts, before_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                ProposalORM.created_at < before_ts,
+                and_(ProposalORM.created_at == before_ts, ProposalORM.proposal_id < before_id),
+            ))
+        rows = (
+            query.order_by(ProposalORM.created_at.desc(), ProposalORM.proposal_id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].proposal_id)
+        return rows, next_cursor
+
     def list_non_expired_by_type(self, proposal_type: str):
         """Return all non-expired proposals of given type (pending, accepted, rejected).
         Used to expire when condition resolves — including user-acknowledged proposals."""
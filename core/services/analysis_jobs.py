@@ -0,0 +1,138 @@
+"""
+Bulk structural change analysis for every belief needing review (POST /api/llm/analyze-stale).
+
+The caller gathers all inputs up front (one DB pass, session released); a job then analyzes
+the beliefs concurrently, at most LLM_ANALYZE_STALE_CONCURRENCY at a time, instead of one
+click per belief. Calls run at background priority, so interactive requests are still served
+first and a large batch is never refused as busy. Each result is stored against the belief's
+snapshot sets (store_analysis), so the belief page shows it like a precomputed analysis.
+Beliefs that already have one are skipped unless refresh is asked for. Nothing is mutated.
+Job progress lives in memory, per job id, for the last MAX_JOBS jobs.
+"""
+import asyncio
+import os
+from collections import OrderedDict
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from core.services.analysis_precompute import analysis_failed, store_analysis, stored_analysis
+from core.services.llm_service import LLMService
+
+ANALYZE_STALE_CONCURRENCY = int(os.environ.get("LLM_ANALYZE_STALE_CONCURRENCY", "4"))
+MAX_JOBS = 20
+
+ITEM_STATUSES = ("queued", "running", "done", "stored", "failed")
+
+
+def _now_iso() -> str:
+    return datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class AnalysisJob:
+    """Progress of one bulk run. `changed` is replaced and set on every update (SSE waits on it)."""
+
+    def __init__(self, inputs: list[dict], refresh: bool = False):
+        self.job_id = uuid4().hex
+        self.refresh = refresh
+        self.created_at = _now_iso()
+        self.finished_at: str | None = None
+        self.items: dict[str, dict] = {
+            i["belief_id"]: {"belief_id": i["belief_id"], "belief_text": i["belief_text"][:120], "status": "queued"}
+            for i in inputs
+        }
+        self.changed = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def update(self, belief_id: str, **fields) -> None:
+        self.items[belief_id].update(fields)
+        self._wake()
+
+    def finish(self) -> None:
+        self.finished_at = _now_iso()
+        self._wake()
+
+    def _wake(self) -> None:
+        event, self.changed = self.changed, asyncio.Event()
+        event.set()
+
+    def to_dict(self) -> dict:
+        counts = dict.fromkeys(ITEM_STATUSES, 0)
+        for item in self.items.values():
+            counts[item["status"]] += 1
+        return {
+            "job_id": self.job_id,
+            "status": "done" if self.finished else "running",
+            "refresh": self.refresh,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "total": len(self.items),
+            "counts": counts,
+            "items": list(self.items.values()),
+        }
+
+
+class AnalysisJobs:
+    """Starts bulk jobs on the running loop and keeps the most recent ones for polling."""
+
+    def __init__(self, concurrency: int = ANALYZE_STALE_CONCURRENCY, max_jobs: int = MAX_JOBS):
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[str, AnalysisJob] = OrderedDict()
+
+    def start(self, llm: LLMService, inputs: list[dict], refresh: bool = False) -> AnalysisJob:
+        """inputs: analysis_inputs(...) dicts plus belief_id (see stale_analysis_inputs)."""
+        job = AnalysisJob(inputs, refresh)
+        self._jobs[job.job_id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+        job.task = asyncio.get_running_loop().create_task(self._run(job, llm, inputs))
+        return job
+
+    def get(self, job_id: str) -> AnalysisJob | None:
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: AnalysisJob, llm: LLMService, inputs: list[dict]) -> None:
+        gate = asyncio.Semaphore(self.concurrency)
+        try:
+            await asyncio.gather(*(self._analyze(job, llm, i, gate) for i in inputs))
+        finally:
+            job.finish()
+
+    async def _analyze(self, job: AnalysisJob, llm: LLMService, inputs: dict, gate: asyncio.Semaphore) -> None:
+        belief_id = inputs["belief_id"]
+        snapshot_sets = (inputs["snapshot_ids"], inputs["newer_snapshot_ids"])
+        async with gate:
+            if not job.refresh:
+                stored = await asyncio.to_thread(stored_analysis, llm.cache, belief_id, *snapshot_sets)
+                if stored is not None:
+                    job.update(belief_id, status="stored", generated_at=stored["generated_at"])
+                    return
+            job.update(belief_id, status="running")
+            try:
+                result = await llm.analyze_belief_changes(
+                    inputs["belief_text"],
+                    inputs["last_review_iso"],
+                    inputs["previous_snapshots_summary"],
+                    inputs["newer_snapshots_summary"],
+                    refresh=job.refresh,
+                    background=True,
+                )
+            except Exception as e:
+                job.update(belief_id, status="failed", error=str(e) or type(e).__name__)
+                return
+            if analysis_failed(result):
+                job.update(belief_id, status="failed", error=result["delta_summary"])
+                return
+            await asyncio.to_thread(store_analysis, llm.cache, belief_id, *snapshot_sets, result)
+            job.update(belief_id, status="done", generated_at=result["generated_at"], cached=result["cached"])
+
+
+_jobs = AnalysisJobs()
+
+
+def get_analysis_jobs() -> AnalysisJobs:
+    return _jobs
@@ -0,0 +1,158 @@
+"""
+Background precomputation of structural change analyses.
+
+When the proposal engine raises a review_prompt, the belief's analysis (Option 2) is
+generated at background priority — every user-initiated LLM call is served first — and
+stored in the LLM cache keyed by the belief and its snapshot sets. The belief page then
+shows it instantly. Nothing is mutated: the only write is the cache entry.
+
+Jobs run on the application's event loop (bound at startup), so they share the client's
+queue with user calls. Without a bound loop (scripts, tests) submit() is a no-op.
+"""
+import asyncio
+import json
+import os
+import threading
+from collections.abc import Callable
+
+from core.repositories.artifact_repository import ArtifactRepository
+from core.repositories.lifecycle_repository import BeliefLifecycleRepository
+from core.services.llm_context import analysis_inputs, analysis_key
+from core.services.llm_service import ANALYSIS_FIELDS, OLLAMA_MODEL, LLMService, get_llm_service
+from db.session import SessionLocal
+
+PRECOMPUTE_ENABLED = os.environ.get("LLM_PRECOMPUTE", "1") != "0"
+
+
+def store_analysis(cache, belief_id: str, snapshot_ids, newer_snapshot_ids, result: dict) -> None:
+    """Keep an analysis result under its snapshot-set key (with the generation's generated_at)."""
+    body = json.dumps({k: result.get(k) for k in ANALYSIS_FIELDS})
+    key = analysis_key(result["model"], belief_id, snapshot_ids, newer_snapshot_ids)
+    cache.set(key, result["model"], body, result["generated_at"])
+
+
+def stored_analysis(cache, belief_id: str, snapshot_ids, newer_snapshot_ids, model: str = OLLAMA_MODEL) -> dict | None:
+    """The stored analysis for exactly these snapshot sets, or None."""
+    hit = cache.get(analysis_key(model, belief_id, snapshot_ids, newer_snapshot_ids))
+    if hit is None:
+        return None
+    return {**json.loads(hit["text"]), "model": hit["model"], "generated_at": hit["generated_at"]}
+
+
+def analysis_failed(result: dict) -> bool:
+    """True for the error text LLMService returns in place of an analysis."""
+    return "[LLM error:" in str(result.get("delta_summary", ""))
+
+
+class AnalysisPrecomputer:
+    """Low-priority analysis jobs, one per belief at a time. Thread-safe submit()."""
+
+    def __init__(self, llm: LLMService | None = None, session_factory: Callable = SessionLocal):
+        self._llm = llm
+        self.session_factory = session_factory
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+
+    @property
+    def llm(self) -> LLMService:
+        return self._llm or get_llm_service()
+
+    def bind(self, loop: asyncio.AbstractEventLoop | None) -> None:
+        """Run jobs on this loop (the app's). None stops accepting jobs."""
+        self._loop = loop
+
+    def submit(self, belief_id: str) -> bool:
+        """Queue a job for this belief unless one is pending. Safe to call from worker threads."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return False
+        with self._lock:
+            if belief_id in self._pending:
+                return False
+            self._pending.add(belief_id)
+            self.submitted += 1
+        loop.call_soon_threadsafe(self._start, belief_id)
+        return True
+
+    def _start(self, belief_id: str) -> None:
+        task = asyncio.ensure_future(self._run(belief_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, belief_id: str) -> None:
+        try:
+            if not await self.llm.is_available():
+                self.skipped += 1
+                return
+            inputs = await asyncio.to_thread(self._inputs, belief_id)
+            if inputs is None:
+                self.skipped += 1
+                return
+            result = await self.llm.analyze_belief_changes(
+                inputs["belief_text"],
+                inputs["last_review_iso"],
+                inputs["previous_snapshots_summary"],
+                inputs["newer_snapshots_summary"],
+                background=True,
+            )
+            if analysis_failed(result):
+                self.failed += 1
+                return
+            await asyncio.to_thread(
+                store_analysis, self.llm.cache, belief_id, inputs["snapshot_ids"], inputs["newer_snapshot_ids"], result
+            )
+            self.completed += 1
+        except Exception:
+            # Background and optional: a failed job leaves the on-demand Analyze button as before.
+            self.failed += 1
+        finally:
+            with self._lock:
+                self._pending.discard(belief_id)
+
+    def _inputs(self, belief_id: str) -> dict | None:
+        """Analysis inputs, or None when the belief is no longer stale or already has a stored analysis."""
+        db = self.session_factory()
+        try:
+            inputs = analysis_inputs(ArtifactRepository(db), BeliefLifecycleRepository(db), belief_id)
+        except (ValueError, LookupError):
+            return None
+        finally:
+            db.close()
+        if stored_analysis(self.llm.cache, belief_id, inputs["snapshot_ids"], inputs["newer_snapshot_ids"]):
+            return None
+        return inputs
+
+    async def drain(self) -> None:
+        """Wait for queued jobs (tests, shutdown)."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._loop is not None,
+            "pending": len(self._pending),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
+
+
+_precomputer = AnalysisPrecomputer()
+
+
+def get_analysis_precomputer() -> AnalysisPrecomputer:
+    return _precomputer
+
+
+def precompute_analysis(proposal_payload: dict) -> None:
+    """ProposalEngine hook: queue the analysis for a freshly raised review_prompt."""
+    belief_id = proposal_payload.get("belief_id")
+    if belief_id:
+        _precomputer.submit(belief_id)
@@ -115,6 +115,14 @@ class BeliefAnalysisService:
             grouped[key].append(item)
         return dict(grouped)
 
+    def get_all_belief_group_counts(self) -> dict[str, int]:
+        """Belief count per company group (same keys as get_all_beliefs_grouped), computed in SQL."""
+        return self.artifact_repo.count_beliefs_by_group()
+
+    def get_all_beliefs_page(self, group: str, cursor: str | None = None, limit: int = 50):
+        """One page of a company group's beliefs, plus the cursor for the next page."""
+        return self.artifact_repo.list_beliefs_in_group(group, cursor=cursor, limit=limit)
+
     # ---------------------------
     # Q1 — Snapshot Coverage
     # ---------------------------
@@ -0,0 +1,265 @@
+"""
+Columnar export of the decision log and snapshot financials (Parquet / Arrow IPC).
+
+Read-only. Streams rows in batches into typed columns: timestamps as UTC timestamps,
+money and ratios as float64, ids as strings. Output is a copy for offline analysis;
+the log remains canonical.
+"""
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+BATCH_ROWS = 2000
+FORMATS = ("parquet", "arrow")
+
+_TS = pa.timestamp("us", tz="UTC")
+
+DECISION_LOG_SCHEMA = pa.schema([
+    ("event_id", pa.string()),
+    ("belief_id", pa.string()),
+    ("event_kind", pa.string()),
+    ("created_at", _TS),
+    ("occurred_at", _TS),
+    ("recorded_by", pa.string()),
+    ("trigger", pa.string()),
+    ("decision_type", pa.string()),
+    ("decision_sub_type", pa.string()),
+    ("follow_up_action", pa.string()),
+    ("review_outcome", pa.string()),
+    ("confidence_level", pa.string()),
+    ("rationale", pa.string()),
+    ("linked_snapshot_ids", pa.list_(pa.string())),
+    ("attached_snapshot_ids", pa.list_(pa.string())),
+])
+
+SNAPSHOT_SCHEMA = pa.schema([
+    ("snapshot_id", pa.string()),
+    ("as_of", _TS),
+    ("ticker", pa.string()),
+    ("exchange", pa.string()),
+    ("company_name", pa.string()),
+    ("sector", pa.string()),
+    ("industry", pa.string()),
+    ("country", pa.string()),
+    ("currency", pa.string()),
+    ("current_price", pa.float64()),
+    ("market_cap", pa.float64()),
+    ("shares_outstanding", pa.float64()),
+    ("fifty_two_week_high", pa.float64()),
+    ("fifty_two_week_low", pa.float64()),
+    ("revenue_fy", pa.float64()),
+    ("net_profit_fy", pa.float64()),
+    ("operating_margin_fy", pa.float64()),
+    ("quarterly_revenue", pa.list_(pa.float64())),
+    ("quarterly_net_profit", pa.list_(pa.float64())),
+    ("total_assets", pa.float64()),
+    ("total_liabilities", pa.float64()),
+    ("total_debt", pa.float64()),
+    ("cash_and_equivalents", pa.float64()),
+    ("data_sources", pa.list_(pa.string())),
+])
+
+
+def _to_utc(value: Any) -> datetime | None:
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except (ValueError, TypeError):
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def _to_float(value: Any) -> float | None:
+    """Stored payloads keep Decimals as JSON strings; export them as float64."""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _str_list(values: Any) -> list[str]:
+    return [str(v) for v in (values or [])]
+
+
+def decision_log_row(event) -> dict[str, Any]:
+    """One lifecycle ORM row → one decision-log record (non-decision kinds leave decision_* null)."""
+    p = event.payload or {}
+    decision = p.get("decision") or {}
+    follow_up = decision.get("follow_up") or {}
+    return {
+        "event_id": str(event.event_id),
+        "belief_id": str(event.belief_id),
+        "event_kind": p.get("event_kind"),
+        "created_at": _to_utc(event.created_at),
+        "occurred_at": _to_utc(p.get("occurred_at")),
+        "recorded_by": p.get("recorded_by"),
+        "trigger": p.get("trigger") if isinstance(p.get("trigger"), str) else None,
+        "decision_type": decision.get("type"),
+        "decision_sub_type": decision.get("sub_type"),
+        "follow_up_action": follow_up.get("action"),
+        "review_outcome": p.get("outcome"),
+        "confidence_level": p.get("confidence_level"),
+        "rationale": decision.get("rationale") or p.get("rationale") or p.get("note"),
+        "linked_snapshot_ids": _str_list(decision.get("linked_snapshot_ids")),
+        "attached_snapshot_ids": _str_list(p.get("attached_snapshot_ids")),
+    }
+
+
+def snapshot_row(payload: dict) -> dict[str, Any]:
+    """One stored StockSnapshot payload → one flat, typed record."""
+    meta = payload.get("metadata") or {}
+    company = payload.get("company") or {}
+    market = payload.get("market_state") or {}
+    fin = payload.get("financials") or {}
+    bs = payload.get("balance_sheet") or {}
+    return {
+        "snapshot_id": str(meta.get("snapshot_id") or ""),
+        "as_of": _to_utc(meta.get("as_of")),
+        "ticker": company.get("ticker"),
+        "exchange": company.get("exchange"),
+        "company_name": company.get("company_name"),
+        "sector": company.get("sector"),
+        "industry": company.get("industry"),
+        "country": company.get("country"),
+        "currency": market.get("currency"),
+        "current_price": _to_float(market.get("current_price")),
+        "market_cap": _to_float(market.get("market_cap")),
+        "shares_outstanding": _to_float(market.get("shares_outstanding")),
+        "fifty_two_week_high": _to_float(market.get("fifty_two_week_high")),
+        "fifty_two_week_low": _to_float(market.get("fifty_two_week_low")),
+        "revenue_fy": _to_float(fin.get("revenue_fy")),
+        "net_profit_fy": _to_float(fin.get("net_profit_fy")),
+        "operating_margin_fy": _to_float(fin.get("operating_margin_fy")),
+        "quarterly_revenue": [_to_float(v) for v in (fin.get("quarterly_revenue") or [])],
+        "quarterly_net_profit": [_to_float(v) for v in (fin.get("quarterly_net_profit") or [])],
+        "total_assets": _to_float(bs.get("total_assets")),
+        "total_liabilities": _to_float(bs.get("total_liabilities")),
+        "total_debt": _to_float(bs.get("total_debt")),
+        "cash_and_equivalents": _to_float(bs.get("cash_and_equivalents")),
+        "data_sources": _str_list(meta.get("data_sources")),
+    }
+
+
+def record_batches(
+    records: Iterable[dict[str, Any]],
+    schema: pa.Schema,
+    batch_rows: int = BATCH_ROWS,
+) -> Iterator[pa.RecordBatch]:
+    """Group records into typed RecordBatches of at most batch_rows rows."""
+    chunk: list[dict[str, Any]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= batch_rows:
+            yield pa.RecordBatch.from_pylist(chunk, schema=schema)
+            chunk = []
+    if chunk:
+        yield pa.RecordBatch.from_pylist(chunk, schema=schema)
+
+
+class _DrainableSink:
+    """Write-only file object whose buffered bytes can be drained between batches."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        b = bytes(data)
+        self._chunks.append(b)
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks = []
+        return out
+
+
+def _open_writer(sink, schema: pa.Schema, fmt: str):
+    if fmt == "parquet":
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    if fmt == "arrow":
+        return pa.ipc.new_stream(sink, schema)
+    raise ValueError(f"format must be one of {FORMATS}")
+
+
+def stream_columnar(
+    records: Iterable[dict[str, Any]],
+    schema: pa.Schema,
+    fmt: str = "parquet",
+    batch_rows: int = BATCH_ROWS,
+) -> Iterator[bytes]:
+    """
+    Encode records as Parquet (one row group per batch) or an Arrow IPC stream, yielding bytes
+    as each batch is written. Memory is bounded by one batch, not by the table size.
+    """
+    sink = _DrainableSink()
+    writer = _open_writer(pa.PythonFile(sink, mode="w"), schema, fmt)
+    try:
+        for batch in record_batches(records, schema, batch_rows):
+            writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+def write_columnar(
+    path: str,
+    records: Iterable[dict[str, Any]],
+    schema: pa.Schema,
+    fmt: str = "parquet",
+    batch_rows: int = BATCH_ROWS,
+) -> int:
+    """Write records to a local file. Returns the number of rows written."""
+    rows = 0
+    with open(path, "wb") as f:
+        writer = _open_writer(f, schema, fmt)
+        try:
+            for batch in record_batches(records, schema, batch_rows):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        finally:
+            writer.close()
+    return rows
+
+
+class ColumnarExportService:
+    """Builds typed record streams from the repositories. No writes to the database."""
+
+    def __init__(self, artifact_repo, lifecycle_repo):
+        self.artifact_repo = artifact_repo
+        self.lifecycle_repo = lifecycle_repo
+
+    def decision_log_records(self) -> Iterator[dict[str, Any]]:
+        for event in self.lifecycle_repo.iter_all():
+            yield decision_log_row(event)
+
+    def snapshot_records(self) -> Iterator[dict[str, Any]]:
+        for payload in self.artifact_repo.iter_payloads_by_type("StockSnapshot"):
+            yield snapshot_row(payload)
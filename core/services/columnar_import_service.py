@@ -0,0 +1,193 @@
+"""
+Offline bulk import of StockSnapshots from columnar files (Parquet, Arrow IPC or CSV).
+
+The inverse of columnar_export_service: one row per ticker and quarter, using the columns of
+SNAPSHOT_SCHEMA (a snapshots.parquet export loads back as-is). Only `ticker` and `as_of`
+(or `period_end`) are required; missing columns are null. Every row goes through
+build_stock_snapshot, so the model validates it exactly as for any other snapshot.
+Ids are the deterministic uuid5 of ticker + period end used by the Yahoo import, so a quarter
+loaded from a file and fetched from Yahoo is the same artifact. Rows are validated in chunks
+and each chunk is written with one existence query and one bulk INSERT. Invalid rows are
+reported, never written; existing snapshots are skipped (immutable). No network.
+"""
+from collections.abc import Iterator
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+from uuid import UUID, uuid5
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from pydantic import ValidationError
+
+from core.builders.stock_snapshot_builder import build_stock_snapshot
+from core.models.stock_snapshot import StockSnapshot
+from core.services.columnar_export_service import BATCH_ROWS, SNAPSHOT_SCHEMA, _to_utc
+
+# Deterministic snapshot_id so re-imports skip existing (immutable). Shared with scripts/import_snapshots.py.
+NAMESPACE_SNAPSHOT = uuid5(UUID("6ba7b810-9dad-11d1-80b4-00c04fd430c8"), "equity-copilot.io/snapshot")
+
+IMPORT_FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".csv": "csv"}
+MAX_REPORTED_ERRORS = 20
+
+_MARKET = ("current_price", "market_cap", "shares_outstanding", "fifty_two_week_high", "fifty_two_week_low")
+_BALANCE = ("total_assets", "total_liabilities", "total_debt", "cash_and_equivalents")
+_COMPANY = ("exchange", "company_name", "sector", "industry", "country")
+
+
+def snapshot_id_for(ticker: str, period_end: date) -> UUID:
+    return uuid5(NAMESPACE_SNAPSHOT, f"{ticker}_{period_end}")
+
+
+def _decimal(value: Any) -> Decimal | None:
+    """Like the Yahoo mapping: numbers via str() (no float artefacts), NaN → None."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, Decimal):
+        return value
+    try:
+        f = float(value)
+    except (TypeError, ValueError):
+        return value  # let the model reject it
+    return None if f != f else Decimal(str(f))
+
+
+def _period_end(value: Any) -> datetime | None:
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day, tzinfo=UTC)
+    return _to_utc(value)
+
+
+def _row_key(row: dict[str, Any]) -> tuple[str, datetime]:
+    ticker = row.get("ticker")
+    period_end = _period_end(row.get("period_end") or row.get("as_of"))
+    if not ticker or period_end is None:
+        raise ValueError("ticker and as_of/period_end are required")
+    return ticker, period_end
+
+
+def row_snapshot_id(row: dict[str, Any]) -> UUID:
+    ticker, period_end = _row_key(row)
+    return snapshot_id_for(ticker, period_end.date())
+
+
+def snapshot_from_row(row: dict[str, Any], data_sources: list[str], snapshot_id: UUID | None = None) -> StockSnapshot:
+    """
+    One flat record → StockSnapshot via build_stock_snapshot. Mirrors the Yahoo mapping: a row
+    without quarterly_* lists gets [revenue_fy] / [net_profit_fy], and operating_margin_fy is
+    derived from an `operating_income` column when absent. Raises ValueError or ValidationError.
+    """
+    ticker, period_end = _row_key(row)
+    revenue = _decimal(row.get("revenue_fy"))
+    net_profit = _decimal(row.get("net_profit_fy"))
+    margin = _decimal(row.get("operating_margin_fy"))
+    op_income = _decimal(row.get("operating_income"))
+    if margin is None and op_income is not None and revenue:
+        margin = (op_income / revenue) * 100
+    quarterly_revenue = row.get("quarterly_revenue")
+    quarterly_net_profit = row.get("quarterly_net_profit")
+    return build_stock_snapshot(
+        metadata={
+            "snapshot_id": snapshot_id or snapshot_id_for(ticker, period_end.date()),
+            "as_of": period_end,
+            "schema_version": "v1",
+            "data_sources": row.get("data_sources") or data_sources,
+        },
+        company={"ticker": ticker, **{k: row.get(k) for k in _COMPANY}},
+        market_state={"currency": row.get("currency"), **{k: _decimal(row.get(k)) for k in _MARKET}},
+        financials={
+            "revenue_fy": revenue,
+            "net_profit_fy": net_profit,
+            "operating_margin_fy": margin,
+            "quarterly_revenue": [_decimal(v) for v in quarterly_revenue] if quarterly_revenue is not None else [revenue],
+            "quarterly_net_profit": [_decimal(v) for v in quarterly_net_profit] if quarterly_net_profit is not None else [net_profit],
+        },
+        balance_sheet={k: _decimal(row.get(k)) for k in _BALANCE},
+    )
+
+
+def iter_record_batches(path: str, batch_rows: int = BATCH_ROWS) -> Iterator[pa.RecordBatch]:
+    """Stream a file as RecordBatches; memory is bounded by one batch. Format from the suffix."""
+    fmt = IMPORT_FORMATS.get(Path(path).suffix.lower())
+    if fmt == "parquet":
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_rows)
+    elif fmt == "arrow":
+        with pa.OSFile(path, "rb") as f:
+            yield from pa.ipc.open_stream(f)
+    elif fmt == "csv":
+        # Known columns stay text so one bad cell fails its row (in validation), not the whole file.
+        # List columns are not CSV-representable.
+        names = [f.name for f in SNAPSHOT_SCHEMA if not pa.types.is_list(f.type)] + ["period_end", "operating_income"]
+        types = dict.fromkeys(names, pa.string())
+        read_options = pacsv.ReadOptions(block_size=1 << 22)
+        convert_options = pacsv.ConvertOptions(column_types=types)
+        yield from pacsv.open_csv(path, read_options=read_options, convert_options=convert_options)
+    else:
+        raise ValueError(f"unsupported file type {Path(path).suffix!r}; use one of {', '.join(IMPORT_FORMATS)}")
+
+
+def _rechunk(batches: Iterator[pa.RecordBatch], rows: int) -> Iterator[list[dict[str, Any]]]:
+    chunk: list[dict[str, Any]] = []
+    for batch in batches:
+        names = set(batch.schema.names)
+        if "ticker" not in names or not names & {"as_of", "period_end"}:
+            raise ValueError("file must have a ticker column and an as_of or period_end column")
+        chunk.extend(batch.to_pylist())
+        while len(chunk) >= rows:
+            yield chunk[:rows]
+            chunk = chunk[rows:]
+    if chunk:
+        yield chunk
+
+
+def _invalid(stats: dict, row_number: int, error: Exception) -> None:
+    stats["invalid"] += 1
+    if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+        stats["errors"].append({"row": row_number, "error": str(error)})
+
+
+class ColumnarImportService:
+    """Validates file rows in chunks and bulk-inserts the new snapshots. Never overwrites."""
+
+    def __init__(self, artifact_repo):
+        self.artifact_repo = artifact_repo
+
+    def load_snapshots(self, path: str, chunk_rows: int = BATCH_ROWS, data_sources: list[str] | None = None) -> dict:
+        """
+        Returns counts: rows read, snapshots saved, skipped (already stored or repeated in the
+        file), invalid; plus the first MAX_REPORTED_ERRORS errors as {row, error} (1-based rows).
+        Ids are checked before validation, so re-importing a file only validates the new rows.
+        """
+        sources = data_sources or [f"File import: {Path(path).name}"]
+        stats = {"rows": 0, "saved": 0, "skipped": 0, "invalid": 0, "errors": []}
+        seen: set[str] = set()
+        for chunk in _rechunk(iter_record_batches(path, chunk_rows), chunk_rows):
+            keyed: dict[str, tuple[int, dict, UUID]] = {}
+            for number, row in enumerate(chunk, start=stats["rows"] + 1):
+                try:
+                    snapshot_id = row_snapshot_id(row)
+                except ValueError as e:
+                    _invalid(stats, number, e)
+                    continue
+                sid = str(snapshot_id)
+                if sid in seen:
+                    stats["skipped"] += 1
+                    continue
+                seen.add(sid)
+                keyed[sid] = (number, row, snapshot_id)
+            stats["rows"] += len(chunk)
+            existing = self.artifact_repo.existing_ids(keyed)
+            stats["skipped"] += len(existing)
+            new = []
+            for sid, (number, row, snapshot_id) in keyed.items():
+                if sid in existing:
+                    continue
+                try:
+                    new.append(snapshot_from_row(row, sources, snapshot_id))
+                except (ValueError, ValidationError) as e:
+                    _invalid(stats, number, e)
+            stats["saved"] += self.artifact_repo.save_many(new)
+        return stats
+
@@ -60,6 +60,58 @@ def _classify_trajectory(sequence: list[str]) -> str:
     return "other"
 
 
+def _kaplan_meier(durations: list[int], observed: list[bool]) -> dict[str, Any]:
+    """
+    Kaplan–Meier product-limit estimate over (duration_days, observed) pairs.
+    observed=False means right-censored. One sort (O(n log n)) then one linear pass.
+    At tied times, events are counted before censorings (standard convention).
+    Returns curve steps (one per distinct event time) and median_days (None if S never reaches 0.5).
+    """
+    n = len(durations)
+    if n == 0:
+        return {"n": 0, "events": 0, "censored": 0, "median_days": None, "curve": []}
+
+    order = sorted(range(n), key=lambda i: (durations[i], not observed[i]))
+    at_risk = n
+    survival = 1.0
+    median_days: int | None = None
+    curve: list[dict[str, Any]] = []
+    total_events = 0
+
+    i = 0
+    while i < n:
+        t = durations[order[i]]
+        events = 0
+        censored = 0
+        while i < n and durations[order[i]] == t:
+            if observed[order[i]]:
+                events += 1
+            else:
+                censored += 1
+            i += 1
+        if events:
+            survival *= 1.0 - events / at_risk
+            total_events += events
+            curve.append({
+                "day": t,
+                "at_risk": at_risk,
+                "events": events,
+                "censored": censored,
+                "survival": round(survival, 6),
+            })
+            if median_days is None and survival <= 0.5:
+                median_days = t
+        at_risk -= events + censored
+
+    return {
+        "n": n,
+        "events": total_events,
+        "censored": n - total_events,
+        "median_days": median_days,
+        "curve": curve,
+    }
+
+
 class DecisionAnalyticsService:
     """
     Read-only analytics over the decision lifecycle stream.
@@ -75,11 +127,10 @@ class DecisionAnalyticsService:
         """Counts of decision events by type (since= optional). Delegates to projection."""
         return self._projection.get_decision_summary(since=since)
 
-    def get_belief_durability(self) -> dict[str, Any]:
+    def _durability_records(self) -> list[dict[str, Any]]:
         """
-        Durability = time from belief creation to first non-reinforced decision.
-        Returns median_days, mean_days, distribution buckets, and per-belief list.
-        Beliefs with only reinforced decisions have no 'first failure' and are listed with durability_days=None.
+        Shared durability definition: per belief, created_at and the first non-reinforced decision time.
+        Each record has belief_id, created_at, first_non_reinforced_at (None when not observed) and reason.
         """
         artifacts = self.artifact_repo.list_by_type("ReasoningArtifact")
         beliefs = [
@@ -87,14 +138,17 @@ class DecisionAnalyticsService:
             if a.artifact_type in {ArtifactType.thesis, ArtifactType.risk}
         ]
 
-        durabilities: list[int | None] = []
-        per_belief: list[dict[str, Any]] = []
-
+        records: list[dict[str, Any]] = []
         for artifact in beliefs:
             belief_id = str(artifact.reasoning_id)
             created_at = _ensure_utc(artifact.created_at) if artifact.created_at else None
             if not created_at:
-                per_belief.append({"belief_id": belief_id, "durability_days": None, "reason": "no_created_at"})
+                records.append({
+                    "belief_id": belief_id,
+                    "created_at": None,
+                    "first_non_reinforced_at": None,
+                    "reason": "no_created_at",
+                })
                 continue
 
             timeline = self._projection.get_decision_timeline(belief_id)
@@ -111,12 +165,32 @@ class DecisionAnalyticsService:
                         first_non_reinforced_at = occ
                     break
 
-            if first_non_reinforced_at is None:
-                per_belief.append({"belief_id": belief_id, "durability_days": None, "reason": "only_reinforced"})
+            records.append({
+                "belief_id": belief_id,
+                "created_at": created_at,
+                "first_non_reinforced_at": (
+                    _ensure_utc(first_non_reinforced_at) if first_non_reinforced_at else None
+                ),
+                "reason": None if first_non_reinforced_at else "only_reinforced",
+            })
+        return records
+
+    def get_belief_durability(self) -> dict[str, Any]:
+        """
+        Durability = time from belief creation to first non-reinforced decision.
+        Returns median_days, mean_days, distribution buckets, and per-belief list.
+        Beliefs with only reinforced decisions have no 'first failure' and are listed with durability_days=None.
+        """
+        durabilities: list[int | None] = []
+        per_belief: list[dict[str, Any]] = []
+
+        for record in self._durability_records():
+            belief_id = record["belief_id"]
+            if record["first_non_reinforced_at"] is None:
+                per_belief.append({"belief_id": belief_id, "durability_days": None, "reason": record["reason"]})
                 continue
 
-            first_non_reinforced_at = _ensure_utc(first_non_reinforced_at)
-            delta = first_non_reinforced_at - created_at
+            delta = record["first_non_reinforced_at"] - record["created_at"]
             days = max(0, delta.days)
             durabilities.append(days)
             per_belief.append({"belief_id": belief_id, "durability_days": days})
@@ -152,6 +226,44 @@ class DecisionAnalyticsService:
             "per_belief": per_belief,
         }
 
+    def get_belief_survival(self, as_of: datetime | None = None) -> dict[str, Any]:
+        """
+        Survival view of durability (Kaplan–Meier). Same definition as get_belief_durability,
+        but beliefs without a non-reinforced decision are right-censored at as_of (default: now)
+        instead of dropped, so the median is not biased toward short-lived beliefs.
+        Also returns one curve per creation-month cohort (YYYY-MM). Derived only — not stored.
+        """
+        now = _ensure_utc(as_of) if as_of else datetime.now(UTC)
+        durations: list[int] = []
+        observed: list[bool] = []
+        cohorts: dict[str, tuple[list[int], list[bool]]] = {}
+        excluded = 0
+
+        for record in self._durability_records():
+            created_at = record["created_at"]
+            if created_at is None:
+                excluded += 1
+                continue
+            end = record["first_non_reinforced_at"]
+            is_event = end is not None
+            days = max(0, ((end if is_event else now) - created_at).days)
+            durations.append(days)
+            observed.append(is_event)
+            cohort_d, cohort_o = cohorts.setdefault(created_at.strftime("%Y-%m"), ([], []))
+            cohort_d.append(days)
+            cohort_o.append(is_event)
+
+        overall = _kaplan_meier(durations, observed)
+        return {
+            "as_of": now.isoformat(),
+            "beliefs_excluded_no_created_at": excluded,
+            **overall,
+            "cohorts": {
+                month: _kaplan_meier(d, o)
+                for month, (d, o) in sorted(cohorts.items())
+            },
+        }
+
     def get_tension_density(self) -> dict[str, Any]:
         """
         % of beliefs whose current decision is slight_tension or strong_tension.
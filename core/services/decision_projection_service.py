@@ -24,6 +24,17 @@ def _occurred_at_key(e: Any) -> tuple:
     return (occ, e.created_at)
 
 
+def _decision_state(latest: Any) -> dict:
+    payload = latest.payload or {}
+    return {
+        "occurred_at": payload.get("occurred_at"),
+        "created_at": latest.created_at.isoformat() if latest.created_at else None,
+        "type": (payload.get("decision") or {}).get("type"),
+        "rationale": (payload.get("decision") or {}).get("rationale"),
+        "event_id": latest.event_id,
+    }
+
+
 class DecisionProjectionService:
     """Computes derived views over decision lifecycle events. No writes."""
 
@@ -40,15 +51,19 @@ class DecisionProjectionService:
         decisions = [e for e in events if (e.payload or {}).get("event_kind") == "decision"]
         if not decisions:
             return None
-        latest = max(decisions, key=_occurred_at_key)
-        payload = latest.payload or {}
-        return {
-            "occurred_at": payload.get("occurred_at"),
-            "created_at": latest.created_at.isoformat() if latest.created_at else None,
-            "type": (payload.get("decision") or {}).get("type"),
-            "rationale": (payload.get("decision") or {}).get("rationale"),
-            "event_id": latest.event_id,
-        }
+        return _decision_state(max(decisions, key=_occurred_at_key))
+
+    def get_current_decision_states(self) -> dict[str, dict]:
+        """
+        Current decision state for every belief that has one, keyed by belief_id.
+        Same rule as get_current_decision_state, from a single lifecycle query.
+        """
+        latest: dict[str, Any] = {}
+        for e in self.lifecycle_repo.list_decision_events():
+            prev = latest.get(e.belief_id)
+            if prev is None or _occurred_at_key(e) > _occurred_at_key(prev):
+                latest[e.belief_id] = e
+        return {belief_id: _decision_state(e) for belief_id, e in latest.items()}
 
     def get_decision_timeline(self, belief_id: str) -> list[dict]:
         """
@@ -0,0 +1,66 @@
+"""
+Incremental detection of a complete JSON object in a token stream.
+
+Lets a JSON-mode generation stop as soon as the object it asked for has closed, instead of
+paying for whatever the model writes after the final brace. Fragments are scanned once;
+braces inside strings (and escaped quotes) are ignored.
+"""
+import json
+
+
+class JSONObjectScanner:
+    """
+    feed() fragments as they arrive; it returns the text of the first complete top-level
+    object that parses and has every key in `required`, else None. Objects that do not
+    qualify are skipped and scanning continues.
+    """
+
+    def __init__(self, required: tuple[str, ...] = ()):
+        self.required = required
+        self._text = ""
+        self._pos = 0
+        self._start: int | None = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.result: str | None = None
+
+    def feed(self, fragment: str) -> str | None:
+        if self.result is not None or not fragment:
+            return self.result
+        self._text += fragment
+        text = self._text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                if self._start is not None:
+                    self._in_string = True
+            elif ch == "{":
+                if self._start is None:
+                    self._start = i
+                self._depth += 1
+            elif ch == "}" and self._start is not None:
+                self._depth -= 1
+                if self._depth == 0:
+                    candidate = text[self._start:i + 1]
+                    self._start = None
+                    if self._qualifies(candidate):
+                        self.result = candidate
+                        self._pos = i + 1
+                        return candidate
+        self._pos = len(text)
+        return None
+
+    def _qualifies(self, candidate: str) -> bool:
+        try:
+            obj = json.loads(candidate)
+        except json.JSONDecodeError:
+            return False
+        return isinstance(obj, dict) and all(key in obj for key in self.required)
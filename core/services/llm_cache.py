@@ -0,0 +1,162 @@
+"""
+On-disk cache of LLM generations.
+
+Prompts are fully determined by artifact text and snapshot summaries, and TEMPERATURE is low,
+so an identical request — same model, prompt, system message and options — is answered from
+disk instead of regenerating. Entries expire after LLM_CACHE_TTL seconds; beyond
+LLM_CACHE_MAX_ENTRIES the least recently used are evicted. A hit returns the original
+generated_at, so attribution still says when the text was produced. Suggestions only: the
+cache holds nothing canonical and can be deleted at any time.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+CACHE_PATH = os.environ.get(
+    "LLM_CACHE_PATH", str(Path(__file__).resolve().parents[2] / "llm_cache.db")
+)
+CACHE_TTL = float(os.environ.get("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "2000"))
+CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") != "0"
+
+
+def cache_key(payload: dict) -> str:
+    """Hash of everything that determines the output: model, prompt, system, options, format."""
+    material = {k: payload.get(k) for k in ("model", "prompt", "system", "options", "format")}
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed TTL + LRU store. Thread-safe; one connection per cache."""
+
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        ttl: float = CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        enabled: bool = CACHE_ENABLED,
+        clock=time.time,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, model TEXT NOT NULL, text TEXT NOT NULL,"
+                " generated_at TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used ON llm_cache (last_used)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> dict | None:
+        """{"text", "model", "generated_at"} for a fresh entry, else None. Expired entries are dropped."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT model, text, generated_at, created FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            now = self._clock()
+            if row is None or now - row[3] > self.ttl:
+                if row is not None:
+                    db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    db.commit()
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            db.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            db.commit()
+            self.hits += 1
+            return {"model": row[0], "text": row[1], "generated_at": row[2]}
+
+    def set(self, key: str, model: str, text: str, generated_at: str) -> None:
+        """Store one generation, then drop expired entries and trim to max_entries (LRU)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            db = self._db()
+            now = self._clock()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, text, generated_at, created, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, text, generated_at, now, now),
+            )
+            self.stores += 1
+            expired = db.execute("DELETE FROM llm_cache WHERE created < ?", (now - self.ttl,)).rowcount
+            (count,) = db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            overflow = max(0, count - self.max_entries)
+            if overflow:
+                db.execute(
+                    "DELETE FROM llm_cache WHERE key IN"
+                    " (SELECT key FROM llm_cache ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                )
+            self.evictions += expired + overflow
+            db.commit()
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypassed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] if self.enabled else 0
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "bypassed": self.bypassed,
+                "stores": self.stores,
+                "evictions": self.evictions,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            if self.enabled:
+                self._db().execute("DELETE FROM llm_cache")
+                self._db().commit()
+            self.hits = self.misses = self.bypassed = self.stores = self.evictions = 0
+
+
+_cache: LLMCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """The process-wide cache, opened on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
+
+
+def reset_llm_cache(cache: LLMCache | None = None) -> None:
+    """Replace the process-wide cache (tests, config reload). None reopens from settings on next use."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
@@ -0,0 +1,180 @@
+"""
+Plain-text context for LLM prompts, built from the repositories. Read-only.
+
+Shared by the /api/llm routes and background precomputation so both build identical
+prompts (and therefore hit the same cache entries).
+
+Snapshots are immutable, so each one's context line is formatted once from its stored
+payload (no Pydantic rehydration) and kept in a bounded LRU; a prompt needs one bulk
+lookup for whichever snapshots are not cached yet.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from core.models.reasoning_artifact import ArtifactType
+from core.services.belief_analysis_service import BeliefAnalysisService
+
+NOT_STALE = "Belief has no newer snapshots. Analyze is only for beliefs needing review."
+
+SNAPSHOT_LINE_CACHE_SIZE = 4096
+
+
+class SnapshotContextCache:
+    """Bounded LRU of snapshot_id → context line. Thread-safe; process-local; never authoritative."""
+
+    def __init__(self, max_entries: int = SNAPSHOT_LINE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, snapshot_ids: list[str]) -> dict[str, dict]:
+        found = {}
+        with self._lock:
+            for sid in snapshot_ids:
+                line = self._entries.get(sid)
+                if line is None:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(sid)
+                self.hits += 1
+                found[sid] = line
+        return found
+
+    def set_many(self, lines: dict[str, dict]) -> None:
+        with self._lock:
+            for sid, line in lines.items():
+                self._entries[sid] = line
+                self._entries.move_to_end(sid)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+snapshot_context_cache = SnapshotContextCache()
+
+
+def _context_line(payload: dict) -> dict | None:
+    """
+    summary: "Name (TICKER): revenue=…, margin=…, as_of=YYYY-MM-DD" (snapshot_summary);
+    label: "TICKER <as_of>" (explain-proposal prefix). Same text the rehydrated snapshot gave.
+    """
+    company = payload.get("company")
+    financials = payload.get("financials")
+    if not isinstance(company, dict) or not isinstance(financials, dict):
+        return None
+    as_of = (payload.get("metadata") or {}).get("as_of")
+    ticker = (company.get("ticker") or "").strip()
+    return {
+        "summary": (
+            f"{company.get('company_name') or 'Unknown'} ({company.get('ticker') or 'N/A'}): "
+            f"revenue={financials.get('revenue_fy')}, margin={financials.get('operating_margin_fy')}, "
+            f"as_of={str(as_of)[:10] if as_of else 'N/A'}"
+        ),
+        "label": f"{ticker or '?'} {datetime.fromisoformat(as_of)}" if as_of else (ticker or "?"),
+    }
+
+
+def snapshot_context_lines(artifact_repo, snapshot_ids) -> dict[str, dict]:
+    """Context lines for these snapshots: cached ones from the LRU, the rest from one bulk query."""
+    ids = [str(sid) for sid in snapshot_ids]
+    lines = snapshot_context_cache.get_many(ids)
+    missing = [sid for sid in ids if sid not in lines]
+    if missing:
+        fetched = {}
+        for sid, payload in artifact_repo.get_payloads(missing, artifact_type="StockSnapshot").items():
+            line = _context_line(payload)
+            if line is not None:
+                fetched[sid] = line
+        snapshot_context_cache.set_many(fetched)  # unknown ids are not cached: they may be ingested later
+        lines.update(fetched)
+    return lines
+
+
+def snapshot_context_line(artifact_repo, snapshot_id) -> dict | None:
+    """Cached context line ({"summary", "label"}) for one snapshot, or None if there is no such snapshot."""
+    return snapshot_context_lines(artifact_repo, [snapshot_id]).get(str(snapshot_id))
+
+
+def snapshot_summary(artifact_repo, snapshot_ids: list) -> str:
+    """Build plain-text summary of snapshots for LLM context."""
+    ids = [str(sid) for sid in snapshot_ids[:5]]
+    lines = snapshot_context_lines(artifact_repo, ids)
+    return "\n".join(lines[sid]["summary"] for sid in ids if sid in lines)
+
+
+def snapshot_labels(artifact_repo, snapshot_ids: list) -> list[str]:
+    """"TICKER <as_of>" per existing snapshot, in order."""
+    ids = [str(sid) for sid in snapshot_ids]
+    lines = snapshot_context_lines(artifact_repo, ids)
+    return [lines[sid]["label"] for sid in ids if sid in lines]
+
+
+def stale_context_for_belief(artifact_repo, lifecycle_repo, belief_id: str) -> dict | None:
+    """If belief has newer snapshots, return its needing-review item. Else None."""
+    grouped = BeliefAnalysisService(artifact_repo, lifecycle_repo).get_beliefs_needing_review()
+    for items in grouped.values():
+        for item in items:
+            if item["belief_id"] == belief_id:
+                return item
+    return None
+
+
+def analysis_inputs(artifact_repo, lifecycle_repo, belief_id: str, stale: dict | None = None) -> dict:
+    """
+    Inputs for LLMService.analyze_belief_changes plus the snapshot sets they came from.
+    Raises ValueError (not stale / not a belief) or LookupError (no such belief).
+    """
+    if stale is None:
+        stale = stale_context_for_belief(artifact_repo, lifecycle_repo, belief_id)
+    if not stale:
+        raise ValueError(NOT_STALE)
+    belief = artifact_repo.get(belief_id)
+    if not belief or not hasattr(belief, "claim"):
+        raise LookupError("Belief not found")
+    if belief.artifact_type not in {ArtifactType.thesis, ArtifactType.risk}:
+        raise ValueError("Not a belief")
+
+    snapshot_ids = [str(sid) for sid in belief.references.snapshot_ids]
+    newer_snapshot_ids = [str(sid) for sid in stale.get("newer_snapshot_ids", [])]
+    orm_events = lifecycle_repo.list_for_belief(belief_id)
+    last_review = orm_events[-1].created_at if orm_events else belief.created_at
+    return {
+        "belief_text": belief.claim.statement,
+        "last_review_iso": last_review.isoformat() if hasattr(last_review, "isoformat") else str(last_review),
+        "previous_snapshots_summary": snapshot_summary(artifact_repo, snapshot_ids),
+        "newer_snapshots_summary": snapshot_summary(artifact_repo, newer_snapshot_ids),
+        "snapshot_ids": snapshot_ids,
+        "newer_snapshot_ids": newer_snapshot_ids,
+    }
+
+
+def stale_analysis_inputs(artifact_repo, lifecycle_repo) -> list[dict]:
+    """analysis_inputs (plus belief_id) for every belief needing review, from one staleness pass."""
+    grouped = BeliefAnalysisService(artifact_repo, lifecycle_repo).get_beliefs_needing_review()
+    inputs = []
+    for items in grouped.values():
+        for item in items:
+            try:
+                inputs.append({
+                    "belief_id": item["belief_id"],
+                    **analysis_inputs(artifact_repo, lifecycle_repo, item["belief_id"], stale=item),
+                })
+            except (ValueError, LookupError):
+                continue
+    return inputs
+
+
+def analysis_key(model: str, belief_id: str, snapshot_ids, newer_snapshot_ids) -> str:
+    """Cache key for a stored analysis: the belief and the exact snapshot sets it compared."""
+    material = ["analysis", model, belief_id, sorted(map(str, snapshot_ids)), sorted(map(str, newer_snapshot_ids))]
+    return hashlib.sha256(json.dumps(material).encode("utf-8")).hexdigest()
@@ -0,0 +1,144 @@
+"""
+Per-call LLM timing metrics, labelled by LLMService method.
+
+Ollama reports where a generation's time went (load_duration, prompt_eval_duration,
+eval_duration, in nanoseconds) and how many tokens were read and produced. Each upstream
+call records those next to wall time, time spent queued for a concurrency slot and prompt
+length, so a slow endpoint can be attributed to model load, prompt evaluation or generation.
+Early-stopped JSON generations have no Ollama timings; their eval_count is the chunks read.
+Calls whose load_duration reaches OLLAMA_COLD_LOAD_MS are counted as cold (the model had to
+be loaded first), the rest as warm. Cache hits and errors are counted, not timed.
+In-process only; reset on restart.
+"""
+import math
+import os
+import threading
+from collections import deque
+
+WINDOW = 500  # recent calls per method kept for percentiles
+COLD_LOAD_MS = float(os.environ.get("OLLAMA_COLD_LOAD_MS", "500"))
+
+FIELDS = (
+    "wall_ms",
+    "queue_wait_ms",
+    "load_ms",
+    "prompt_eval_ms",
+    "eval_ms",
+    "prompt_eval_count",
+    "eval_count",
+    "prompt_chars",
+)
+
+
+def _ms(ns) -> float | None:
+    return ns / 1e6 if isinstance(ns, int | float) else None
+
+
+def call_fields(data: dict, wall_seconds: float, prompt: str) -> dict:
+    """Metric fields from an Ollama /api/generate response (or final stream chunk)."""
+    queue_wait = data.get("queue_wait")
+    return {
+        "wall_ms": wall_seconds * 1000,
+        "queue_wait_ms": queue_wait * 1000 if queue_wait is not None else None,
+        "load_ms": _ms(data.get("load_duration")),
+        "prompt_eval_ms": _ms(data.get("prompt_eval_duration")),
+        "eval_ms": _ms(data.get("eval_duration")),
+        "prompt_eval_count": data.get("prompt_eval_count"),
+        "eval_count": data.get("eval_count"),
+        "prompt_chars": len(prompt),
+    }
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+class _MethodMetrics:
+    def __init__(self, window: int):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.early_stops = 0
+        self.cold = 0
+        self.warm = 0
+        self.totals = dict.fromkeys(FIELDS, 0.0)
+        self.counts = dict.fromkeys(FIELDS, 0)
+        self.recent = {field: deque(maxlen=window) for field in FIELDS}
+
+    def summary(self) -> dict:
+        fields = {}
+        for field in FIELDS:
+            if not self.counts[field]:
+                continue
+            ordered = sorted(self.recent[field])
+            fields[field] = {
+                "mean": round(self.totals[field] / self.counts[field], 1),
+                "p50": round(_percentile(ordered, 50), 1),
+                "p95": round(_percentile(ordered, 95), 1),
+                "max": round(ordered[-1], 1),
+            }
+        eval_s = self.totals["eval_ms"] / 1000
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "early_stops": self.early_stops,
+            "cold": self.cold,
+            "warm": self.warm,
+            "tokens_per_sec": round(self.totals["eval_count"] / eval_s, 1) if eval_s else None,
+            "fields": fields,
+        }
+
+
+class LLMMetrics:
+    """Thread-safe registry. Means cover every call; p50/p95/max the most recent `window`."""
+
+    def __init__(self, window: int = WINDOW, cold_load_ms: float = COLD_LOAD_MS):
+        self.window = window
+        self.cold_load_ms = cold_load_ms
+        self._lock = threading.Lock()
+        self._methods: dict[str, _MethodMetrics] = {}
+
+    def _method(self, method: str) -> _MethodMetrics:
+        if method not in self._methods:
+            self._methods[method] = _MethodMetrics(self.window)
+        return self._methods[method]
+
+    def record(self, method: str, fields: dict) -> None:
+        """One completed upstream call. Missing (None) fields are skipped."""
+        with self._lock:
+            m = self._method(method)
+            m.calls += 1
+            load_ms = fields.get("load_ms")
+            if load_ms is not None:
+                if load_ms >= self.cold_load_ms:
+                    m.cold += 1
+                else:
+                    m.warm += 1
+            for field, value in fields.items():
+                if value is None or field not in m.totals:
+                    continue
+                m.totals[field] += value
+                m.counts[field] += 1
+                m.recent[field].append(value)
+
+    def record_error(self, method: str) -> None:
+        with self._lock:
+            self._method(method).errors += 1
+
+    def record_early_stop(self, method: str) -> None:
+        """A JSON-mode generation cut off once its object was complete (see json_stream)."""
+        with self._lock:
+            self._method(method).early_stops += 1
+
+    def record_cache_hit(self, method: str) -> None:
+        with self._lock:
+            self._method(method).cache_hits += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {method: m.summary() for method, m in sorted(self._methods.items())}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._methods = {}
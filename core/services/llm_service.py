@@ -6,55 +6,144 @@ Never structural glue. Never auto-mutation.
 
 Backend: Ollama (free, local). Run `ollama serve` and use a model from `ollama list`.
 Fits 8GB VRAM. Strong instruction following. Good JSON compliance.
+Transport, pooling and availability live in ollama_client (one client per process).
+Identical requests are answered from the on-disk llm_cache unless the caller asks to refresh;
+identical requests arriving together share one generation (single_flight).
+Every upstream call records its timings per method (llm_metrics).
 """
+import asyncio
 import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from datetime import UTC, datetime
+from functools import cache
+
+from pydantic import BaseModel
+
+from core.services.json_stream import JSONObjectScanner
+from core.services.llm_cache import LLMCache, cache_key, get_llm_cache
+from core.services.llm_metrics import LLMMetrics, call_fields
+from core.services.ollama_client import (  # noqa: F401  (OLLAMA_BASE_URL, LLMBusy re-exported)
+    OLLAMA_BASE_URL,
+    LLMBusy,
+    OllamaClient,
+    OllamaPool,
+    get_ollama_client,
+)
+from core.services.single_flight import SingleFlight
 
-import requests
-
-OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3.1:latest")  # Use model you have (ollama list)
+KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")  # How long Ollama keeps the model loaded after a call
 TEMPERATURE = 0.2  # Deterministic
 MAX_TOKENS = 1024
 CONTEXT_LIMIT_CHARS = 2000
 
 SYSTEM_MESSAGE = "You are a precise, literal assistant. Follow instructions strictly."
 
+ANALYSIS_FIELDS = ("delta_summary", "potential_tensions", "questions_raised")
+
 
 class LLMNotConfigured(Exception):
     """Raised when no LLM backend is available."""
     pass
 
 
+class Generation(BaseModel):
+    """Generated text plus its attribution. `cached` marks an answer served from llm_cache."""
+    text: str
+    model: str
+    generated_at: str
+    cached: bool = False
+
+
+class TokenStream:
+    """
+    Async iterator of text fragments. model / generated_at / cached describe the generation
+    and are set by the time the first fragment arrives.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self.generated_at: str | None = None
+        self.cached = False
+        self._fragments: AsyncIterator[str] | None = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        return await self._fragments.__anext__()
+
+    async def aclose(self) -> None:
+        await self._fragments.aclose()
+
+
+def _now_iso() -> str:
+    return datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
 class LLMService:
-    """Sandboxed LLM calls via Ollama. User-initiated only. No side effects."""
+    """Sandboxed LLM calls via Ollama. User-initiated only. No side effects. Async; awaits the shared client."""
 
-    def __init__(self):
-        self._base_url = OLLAMA_BASE_URL.rstrip("/")
+    def __init__(
+        self,
+        client: OllamaClient | OllamaPool | None = None,
+        cache: LLMCache | None = None,
+        backends: list[str] | None = None,
+    ):
+        """backends: Ollama base URLs to spread calls over (overrides the process-wide client)."""
+        if client is None and backends:
+            client = OllamaPool.from_urls(backends)
+        self._client = client or get_ollama_client()
+        self._cache = cache
         self._model = OLLAMA_MODEL
-        self._backend = "ollama" if self._check_ollama_available() else None
-
-    def _check_ollama_available(self) -> bool:
-        try:
-            r = requests.get(f"{self._base_url}/api/tags", timeout=5)
-            return bool(r.status_code == 200)
-        except Exception:
-            return False
+        self.flights = SingleFlight()
+        self.metrics = LLMMetrics()
 
     @property
-    def available(self) -> bool:
-        return self._backend is not None
+    def cache(self) -> LLMCache:
+        return self._cache or get_llm_cache()
 
-    @property
-    def backend_name(self) -> str:
-        return self._backend or "none"
+    async def is_available(self) -> bool:
+        """Cached probe (see OllamaClient.available); no round trip per request."""
+        return await self._client.available()
 
-    def draft_refined_belief(
+    def backend_stats(self) -> dict:
+        """Health, in-flight/queued requests and call latencies per Ollama backend."""
+        return {
+            "failovers": getattr(self._client, "failovers", 0),
+            "backends": [backend.stats() for backend in self._client.backends],
+        }
+
+    async def draft_refined_belief(
         self,
         statement: str,
         artifact_type: str,
         snapshot_summary: str = "",
-    ) -> str:
+        refresh: bool = False,
+    ) -> Generation:
         """Option 1 — Drafting Assistant. Only rephrase/clarify. No new factual claims."""
+        prompt = self._draft_refined_belief_prompt(statement, artifact_type, snapshot_summary)
+        return await self._call(prompt, max_tokens=512, refresh=refresh, method="draft_refined_belief")
+
+    def stream_refined_belief(
+        self,
+        statement: str,
+        artifact_type: str,
+        snapshot_summary: str = "",
+        refresh: bool = False,
+    ) -> TokenStream:
+        """Streaming variant of draft_refined_belief: yields text fragments as generated."""
+        prompt = self._draft_refined_belief_prompt(statement, artifact_type, snapshot_summary)
+        return self._stream(prompt, max_tokens=512, refresh=refresh, method="stream_refined_belief")
+
+    def _draft_refined_belief_prompt(
+        self,
+        statement: str,
+        artifact_type: str,
+        snapshot_summary: str = "",
+    ) -> str:
         prompt = f"""You are a drafting assistant for an equity research system. Refine this belief into clearer, more precise language.
 
 STRICT RULES:
@@ -71,10 +160,29 @@ Belief: {statement}
         if snapshot_summary:
             prompt += f"\nReferenced snapshots (ticker + as_of) for context only:\n{snapshot_summary}\n"
         prompt += "\nOutput only the refined belief text, no preamble."
-        return self._call(prompt, max_tokens=512)
+        return prompt
 
-    def draft_refined_question(self, question: str, snapshot_summary: str = "") -> str:
+    async def draft_refined_question(
+        self,
+        question: str,
+        snapshot_summary: str = "",
+        refresh: bool = False,
+    ) -> Generation:
         """Option 1 — Drafting Assistant. Only rephrase/clarify."""
+        prompt = self._draft_refined_question_prompt(question, snapshot_summary)
+        return await self._call(prompt, max_tokens=512, refresh=refresh, method="draft_refined_question")
+
+    def stream_refined_question(
+        self,
+        question: str,
+        snapshot_summary: str = "",
+        refresh: bool = False,
+    ) -> TokenStream:
+        """Streaming variant of draft_refined_question: yields text fragments as generated."""
+        prompt = self._draft_refined_question_prompt(question, snapshot_summary)
+        return self._stream(prompt, max_tokens=512, refresh=refresh, method="stream_refined_question")
+
+    def _draft_refined_question_prompt(self, question: str, snapshot_summary: str = "") -> str:
         prompt = f"""You are a drafting assistant. Refine this research question into clearer, more focused language.
 
 STRICT RULES:
@@ -87,22 +195,31 @@ Question: {question}
         if snapshot_summary:
             prompt += f"\nSnapshot context (reference only):\n{snapshot_summary}\n"
         prompt += "\nOutput only the refined question text, no preamble."
-        return self._call(prompt, max_tokens=512)
+        return prompt
 
-    def suggest_sub_questions(self, question: str) -> str:
+    async def suggest_sub_questions(self, question: str, refresh: bool = False) -> Generation:
         """Suggest clarifying sub-questions for a research question."""
+        prompt = self._suggest_sub_questions_prompt(question)
+        return await self._call(prompt, refresh=refresh, method="suggest_sub_questions")
+
+    def stream_sub_questions(self, question: str, refresh: bool = False) -> TokenStream:
+        """Streaming variant of suggest_sub_questions: yields text fragments as generated."""
+        prompt = self._suggest_sub_questions_prompt(question)
+        return self._stream(prompt, refresh=refresh, method="stream_sub_questions")
+
+    def _suggest_sub_questions_prompt(self, question: str) -> str:
         prompt = f"""You are a research assistant. Given this research question, suggest 2-4 focused sub-questions that would help answer it. Output as a bullet list.
 Optional brainstorming only—do not imply these are required.
 
 Question: {question}
 
 Output only the sub-questions, one per line with a leading dash."""
-        return self._call(prompt)
+        return prompt
 
-    def summarize_snapshots(self, snapshot_texts: list[str]) -> str:
+    async def summarize_snapshots(self, snapshot_texts: list[str], refresh: bool = False) -> Generation:
         """Summarize snapshot metrics in plain language."""
         if not snapshot_texts:
-            return "No snapshots available."
+            return Generation(text="No snapshots available.", model=self._model, generated_at=_now_iso())
         combined = "\n---\n".join(snapshot_texts[:5])
         prompt = f"""You are a research assistant. Summarize the key metrics and context from these equity snapshots in 2-4 sentences. Focus on: revenue, margins, market state, notable changes. Be factual.
 
@@ -110,15 +227,36 @@ Snapshots:
 {combined}
 
 Output only the summary."""
-        return self._call(prompt)
+        return await self._call(prompt, refresh=refresh, method="summarize_snapshots")
 
-    def explain_proposal_trigger(
+    async def explain_proposal_trigger(
         self,
         proposal_type: str,
         belief_text: str,
         condition_state: dict | None = None,
-    ) -> str:
+        refresh: bool = False,
+    ) -> Generation:
         """Explain why a structural proposal was triggered."""
+        prompt = self._explain_proposal_trigger_prompt(proposal_type, belief_text, condition_state)
+        return await self._call(prompt, max_tokens=256, refresh=refresh, method="explain_proposal_trigger")
+
+    def stream_proposal_explanation(
+        self,
+        proposal_type: str,
+        belief_text: str,
+        condition_state: dict | None = None,
+        refresh: bool = False,
+    ) -> TokenStream:
+        """Streaming variant of explain_proposal_trigger: yields text fragments as generated."""
+        prompt = self._explain_proposal_trigger_prompt(proposal_type, belief_text, condition_state)
+        return self._stream(prompt, max_tokens=256, refresh=refresh, method="stream_proposal_explanation")
+
+    def _explain_proposal_trigger_prompt(
+        self,
+        proposal_type: str,
+        belief_text: str,
+        condition_state: dict | None = None,
+    ) -> str:
         cond = condition_state or {}
         cond_type = cond.get("type", proposal_type)
         triggered_at = cond.get("triggered_at", "unknown")
@@ -132,16 +270,21 @@ Triggered at: {triggered_at}
 Belief: {belief_snippet}
 
 Output only the explanation."""
-        return self._call(prompt, max_tokens=256)
+        return prompt
 
-    def analyze_belief_changes(
+    async def analyze_belief_changes(
         self,
         belief_text: str,
         last_review_iso: str,
         previous_snapshots_summary: str,
         newer_snapshots_summary: str,
+        refresh: bool = False,
+        background: bool = False,
     ) -> dict:
-        """Option 2 — Structural Change Analysis. Structured JSON."""
+        """
+        Option 2 — Structural Change Analysis. Structured JSON, plus model / generated_at / cached.
+        background=True (precomputation) queues behind every user-initiated call.
+        """
         prev = (previous_snapshots_summary or "None")[:CONTEXT_LIMIT_CHARS]
         newer = (newer_snapshots_summary or "")[:CONTEXT_LIMIT_CHARS]
 
@@ -163,8 +306,21 @@ Previous snapshot metrics (at last review, this belief's referenced snapshots on
 New snapshot metrics (same companies, since last review):
 {newer}
 """
-        raw = self._call(prompt, max_tokens=MAX_TOKENS, json_mode=True)
-        return self._parse_analysis_json(raw)
+        generation = await self._call(
+            prompt,
+            max_tokens=MAX_TOKENS,
+            json_mode=True,
+            json_keys=ANALYSIS_FIELDS,
+            refresh=refresh,
+            background=background,
+            method="analyze_belief_changes",
+        )
+        return {
+            **self._parse_analysis_json(generation.text),
+            "model": generation.model,
+            "generated_at": generation.generated_at,
+            "cached": generation.cached,
+        }
 
     def _parse_analysis_json(self, raw: str) -> dict:
         import json
@@ -188,53 +344,189 @@ New snapshot metrics (same companies, since last review):
                 "questions_raised": [],
             }
 
-    def _call(
+    async def _call(
         self,
         prompt: str,
         max_tokens: int = MAX_TOKENS,
         json_mode: bool = False,
-    ) -> str:
-        if not self._backend:
-            raise LLMNotConfigured(
-                "Ollama not available. Run `ollama serve` and ensure a model is installed (see `ollama list`)."
-            )
-        return self._call_ollama(prompt, max_tokens, json_mode)
-
-    def _call_ollama(
+        refresh: bool = False,
+        background: bool = False,
+        method: str = "generate",
+        json_keys: tuple[str, ...] | None = None,
+    ) -> Generation:
+        """
+        One generation, served from the cache when an identical request is fresh there, and
+        shared with any identical request already generating. refresh=True skips the lookup
+        (the new answer replaces the old). Errors are returned as text, as before, and never cached.
+        Background calls coalesce only with each other, so a user never waits at background priority.
+        `method` labels the call's metrics. With json_keys, generation stops at the first
+        complete object that has them (see _generate_json).
+        """
+        payload = self._payload(prompt, max_tokens, json_mode)
+        key = cache_key(payload)
+        hit = await self._cache_lookup(key, refresh)
+        if hit is not None:
+            self.metrics.record_cache_hit(method)
+            return Generation(**hit, cached=True)
+        flight_key = f"background:{key}" if background else key
+        return await self.flights.call(
+            flight_key, lambda: self._generate(payload, key, json_mode, background, method, json_keys)
+        )
+
+    async def _generate(
         self,
-        prompt: str,
-        max_tokens: int,
+        payload: dict,
+        key: str,
         json_mode: bool,
-    ) -> str:
+        background: bool = False,
+        method: str = "generate",
+        json_keys: tuple[str, ...] | None = None,
+    ) -> Generation:
+        await self._require_backend()
         try:
-            payload = {
-                "model": self._model,
-                "prompt": prompt,
-                "system": SYSTEM_MESSAGE,
-                "stream": False,
-                "options": {
-                    "temperature": TEMPERATURE,
-                    "num_predict": max_tokens,
-                },
-            }
-            if json_mode:
-                payload["format"] = "json"
-
-            r = requests.post(
-                f"{self._base_url}/api/generate",
-                json=payload,
-                timeout=120,
+            if json_keys:
+                text = await self._generate_json(payload, json_keys, background, method)
+            else:
+                text = await self._call_ollama(payload, json_mode, background, method)
+        except LLMBusy:
+            raise
+        except Exception as e:
+            self.metrics.record_error(method)
+            error = '{"delta_summary": "[LLM error: ' + str(e).replace('"', "'") + ']", "potential_tensions": [], "questions_raised": []}}'
+            return Generation(text=error, model=self._model, generated_at=_now_iso())
+        generation = Generation(text=text, model=self._model, generated_at=_now_iso())
+        await asyncio.to_thread(self.cache.set, key, generation.model, generation.text, generation.generated_at)
+        return generation
+
+    def _stream(
+        self, prompt: str, max_tokens: int = MAX_TOKENS, refresh: bool = False, method: str = "stream"
+    ) -> TokenStream:
+        """Fragments from Ollama's streamed output (or one fragment from the cache). Errors propagate."""
+        stream = TokenStream(self._model)
+        stream._fragments = self._stream_fragments(self._payload(prompt, max_tokens), stream, refresh, method)
+        return stream
+
+    async def _stream_fragments(
+        self, payload: dict, stream: TokenStream, refresh: bool, method: str
+    ) -> AsyncIterator[str]:
+        key = cache_key(payload)
+        hit = await self._cache_lookup(key, refresh)
+        if hit is not None:
+            self.metrics.record_cache_hit(method)
+            stream.model, stream.generated_at, stream.cached = hit["model"], hit["generated_at"], True
+            yield hit["text"]
+            return
+        # Streamed and blocking variants build the same payload; keep their flights apart.
+        fragments = self.flights.stream(f"stream:{key}", lambda: self._generate_stream(payload, key, method))
+        async for generated_at, text in fragments:
+            stream.generated_at = generated_at
+            yield text
+
+    async def _generate_stream(self, payload: dict, key: str, method: str) -> AsyncIterator[tuple[str, str]]:
+        await self._require_backend()
+        generated_at = _now_iso()
+        started = time.perf_counter()
+        parts = []
+        try:
+            async for chunk in self._client.stream_generate(payload):
+                text = chunk.get("response") or ""
+                if text:
+                    parts.append(text)
+                    yield generated_at, text
+                if chunk.get("done"):
+                    self.metrics.record(method, call_fields(chunk, time.perf_counter() - started, payload["prompt"]))
+        except LLMBusy:
+            raise
+        except Exception:
+            self.metrics.record_error(method)
+            raise
+        # Only a completed stream is cached; the stored text matches what _call would return.
+        await asyncio.to_thread(self.cache.set, key, self._model, "".join(parts).strip(), generated_at)
+
+    async def _cache_lookup(self, key: str, refresh: bool) -> dict | None:
+        if refresh:
+            self.cache.record_bypass()
+            return None
+        return await asyncio.to_thread(self.cache.get, key)
+
+    async def _require_backend(self) -> None:
+        if not await self.is_available():
+            raise LLMNotConfigured(
+                "Ollama not available. Run `ollama serve` and ensure a model is installed (see `ollama list`)."
             )
-            r.raise_for_status()
-            data = r.json()
-            response = (data.get("response") or "").strip()
 
-            if json_mode and "{" in response:
-                start = response.find("{")
-                end = response.rfind("}") + 1
-                if end > start:
-                    response = response[start:end]
-
-            return response
-        except Exception as e:
-            return '{"delta_summary": "[LLM error: ' + str(e).replace('"', "'") + ']", "potential_tensions": [], "questions_raised": []}}'
+    def _payload(self, prompt: str, max_tokens: int, json_mode: bool = False) -> dict:
+        payload = {
+            "model": self._model,
+            "prompt": prompt,
+            "system": SYSTEM_MESSAGE,
+            "stream": False,
+            "keep_alive": KEEP_ALIVE,
+            "options": {
+                "temperature": TEMPERATURE,
+                "num_predict": max_tokens,
+            },
+        }
+        if json_mode:
+            payload["format"] = "json"
+        return payload
+
+    async def _call_ollama(
+        self, payload: dict, json_mode: bool, background: bool = False, method: str = "generate"
+    ) -> str:
+        started = time.perf_counter()
+        data = await self._client.generate(payload, background=background)
+        self.metrics.record(method, call_fields(data, time.perf_counter() - started, payload["prompt"]))
+        response = (data.get("response") or "").strip()
+        return _json_span(response) if json_mode else response
+
+    async def _generate_json(
+        self, payload: dict, keys: tuple[str, ...], background: bool = False, method: str = "generate"
+    ) -> str:
+        """
+        JSON-mode generation over the token stream, stopped as soon as a complete object with
+        `keys` has arrived: closing the stream disconnects from Ollama, so whatever the model
+        would write after the closing brace is never generated. Without such an object the
+        full text is used, as from _call_ollama.
+        """
+        scanner = JSONObjectScanner(keys)
+        started = time.perf_counter()
+        parts: list[str] = []
+        queue_wait = None
+        found = None
+        final = None
+        async with aclosing(self._client.stream_generate(payload, background=background)) as chunks:
+            async for chunk in chunks:
+                queue_wait = chunk.get("queue_wait", queue_wait)
+                text = chunk.get("response") or ""
+                parts.append(text)
+                found = scanner.feed(text)
+                if chunk.get("done"):
+                    final = chunk
+                if found is not None or final is not None:
+                    break
+        wall = time.perf_counter() - started
+        if final is not None:
+            self.metrics.record(method, call_fields(final, wall, payload["prompt"]))
+        else:
+            if found is not None:
+                self.metrics.record_early_stop(method)
+            fields = {"queue_wait": queue_wait, "eval_count": len([p for p in parts if p])}
+            self.metrics.record(method, call_fields(fields, wall, payload["prompt"]))
+        return found if found is not None else _json_span("".join(parts).strip())
+
+
+def _json_span(response: str) -> str:
+    """From the first "{" to the last "}", dropping any preamble or code fence around the object."""
+    if "{" in response:
+        start = response.find("{")
+        end = response.rfind("}") + 1
+        if end > start:
+            response = response[start:end]
+    return response
+
+
+@cache
+def get_llm_service() -> LLMService:
+    """Process-wide LLMService on the shared client. Stateless beyond the client."""
+    return LLMService()
@@ -0,0 +1,145 @@
+"""
+Keeps the Ollama model resident so user requests do not pay its load time.
+
+Ollama unloads a model once it has been idle for the request's keep_alive, and the next request
+waits for it to load again — on our machines longer than the generation itself. Every
+request sends OLLAMA_KEEP_ALIVE (llm_service). With OLLAMA_PRELOAD=1 the app loads the model
+at startup, and during OLLAMA_WARM_HOURS ("08:00-19:00", local time; empty = off) a
+background pinger re-sends an empty request every OLLAMA_WARM_INTERVAL seconds so the model
+never idles out while someone may be working. With several backends, each one is warmed.
+Pings queue at background priority, carry no prompt, and are neither cached nor counted in
+the per-method or per-backend metrics. A malformed OLLAMA_WARM_HOURS disables the pinger
+with a warning (reported by GET /api/llm/warmup) instead of failing app startup.
+"""
+import asyncio
+import os
+import warnings
+from datetime import datetime
+from datetime import time as dtime
+
+from core.services.llm_metrics import COLD_LOAD_MS
+from core.services.llm_service import KEEP_ALIVE, OLLAMA_MODEL
+from core.services.ollama_client import OllamaClient, OllamaPool, get_ollama_client
+
+PRELOAD = os.environ.get("OLLAMA_PRELOAD", "0") == "1"
+WARM_HOURS = os.environ.get("OLLAMA_WARM_HOURS", "")
+WARM_INTERVAL = float(os.environ.get("OLLAMA_WARM_INTERVAL", "300"))
+
+
+def parse_hours(spec: str) -> tuple[dtime, dtime] | None:
+    """"HH:MM-HH:MM" → (start, end); empty → None. A window may wrap midnight."""
+    spec = (spec or "").strip()
+    if not spec:
+        return None
+    start, end = (dtime.fromisoformat(part.strip()) for part in spec.split("-", 1))
+    return start, end
+
+
+def in_hours(hours: tuple[dtime, dtime] | None, now: datetime) -> bool:
+    if hours is None:
+        return False
+    start, end = hours
+    t = now.time()
+    if start <= end:
+        return start <= t < end
+    return t >= start or t < end
+
+
+class ModelWarmer:
+    """Startup preload + working-hours pinger for one model. Counts pings and the cold loads they absorbed."""
+
+    def __init__(
+        self,
+        client: OllamaClient | OllamaPool | None = None,
+        model: str = OLLAMA_MODEL,
+        keep_alive: str = KEEP_ALIVE,
+        hours: str = WARM_HOURS,
+        interval: float = WARM_INTERVAL,
+        cold_load_ms: float = COLD_LOAD_MS,
+        now=datetime.now,
+    ):
+        self._client = client
+        self.model = model
+        self.keep_alive = keep_alive
+        self.hours_error: str | None = None
+        try:
+            self.hours = parse_hours(hours)
+        except ValueError as e:
+            self.hours = None
+            self.hours_error = f"invalid OLLAMA_WARM_HOURS {hours!r} (expected HH:MM-HH:MM): {e}"
+            warnings.warn(f"{self.hours_error}; warming disabled", RuntimeWarning, stacklevel=2)
+        self.interval = interval
+        self.cold_load_ms = cold_load_ms
+        self._now = now
+        self._task: asyncio.Task | None = None
+        self.pings = 0
+        self.loads = 0
+        self.failures = 0
+        self.last_warmed_at: str | None = None
+
+    @property
+    def client(self) -> OllamaClient | OllamaPool:
+        return self._client or get_ollama_client()
+
+    async def warm(self) -> bool:
+        """Load the model (or refresh its keep_alive) on every backend. False when none answered."""
+        results = await asyncio.gather(*(self._warm(backend) for backend in self.client.backends))
+        if any(results):
+            self.last_warmed_at = self._now().isoformat(timespec="seconds")
+        return any(results)
+
+    async def _warm(self, backend: OllamaClient) -> bool:
+        payload = {"model": self.model, "keep_alive": self.keep_alive, "stream": False}
+        try:
+            data = await backend.generate(payload, background=True, record_metrics=False)
+        except Exception:
+            # Optional: a missed ping only means the next request may be cold.
+            self.failures += 1
+            return False
+        self.pings += 1
+        if (data.get("load_duration") or 0) / 1e6 >= self.cold_load_ms:
+            self.loads += 1
+        return True
+
+    async def _run(self, preload: bool) -> None:
+        if preload:
+            await self.warm()
+        if self.hours is None:
+            return
+        while True:
+            await asyncio.sleep(self.interval)
+            if in_hours(self.hours, self._now()):
+                await self.warm()
+
+    def start(self, preload: bool = PRELOAD) -> None:
+        """Start preload and/or pinger on the running loop (app lifespan). No-op when neither is configured."""
+        if preload or self.hours is not None:
+            self._task = asyncio.get_running_loop().create_task(self._run(preload))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model,
+            "keep_alive": self.keep_alive,
+            "running": self._task is not None and not self._task.done(),
+            "hours": "-".join(t.strftime("%H:%M") for t in self.hours) if self.hours else None,
+            "hours_error": self.hours_error,
+            "interval_seconds": self.interval,
+            "in_hours": in_hours(self.hours, self._now()),
+            "pings": self.pings,
+            "loads": self.loads,
+            "failures": self.failures,
+            "last_warmed_at": self.last_warmed_at,
+        }
+
+
+_warmer = ModelWarmer()
+
+
+def get_model_warmer() -> ModelWarmer:
+    return _warmer
@@ -0,0 +1,454 @@
+"""
+Process-wide async Ollama client.
+
+One pooled keep-alive httpx client serves every LLM call, so generations wait on the event
+loop instead of holding threadpool workers. Availability is probed at most once per
+OLLAMA_PROBE_TTL seconds; consecutive failures open a circuit breaker so callers fail fast
+(503) instead of waiting on timeouts while the backend is down. At most
+OLLAMA_MAX_CONCURRENCY generations run at once; up to OLLAMA_MAX_QUEUE more wait, and
+anything beyond that is refused with LLMBusy (429). Background work queues behind users.
+
+OLLAMA_BASE_URLS (comma-separated) spreads calls over several Ollama boxes: each backend
+gets its own client (pool, probe, breaker, limiter) and OllamaPool routes every call to the
+least-loaded healthy one, failing over to the next on connection errors and 5xx.
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import aclosing, asynccontextmanager
+
+import httpx
+
+from core.services.llm_metrics import LLMMetrics, call_fields
+
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_BASE_URLS = [
+    url.strip() for url in os.environ.get("OLLAMA_BASE_URLS", OLLAMA_BASE_URL).split(",") if url.strip()
+]
+POOL_SIZE = int(os.environ.get("OLLAMA_POOL_SIZE", "4"))
+CONNECT_TIMEOUT = float(os.environ.get("OLLAMA_CONNECT_TIMEOUT", "3"))
+READ_TIMEOUT = float(os.environ.get("OLLAMA_READ_TIMEOUT", "120"))
+PROBE_TIMEOUT = 5.0
+PROBE_TTL = float(os.environ.get("OLLAMA_PROBE_TTL", "30"))
+BREAKER_THRESHOLD = int(os.environ.get("OLLAMA_BREAKER_THRESHOLD", "3"))
+BREAKER_COOLDOWN = float(os.environ.get("OLLAMA_BREAKER_COOLDOWN", "30"))
+MAX_CONCURRENCY = int(os.environ.get("OLLAMA_MAX_CONCURRENCY", "2"))
+MAX_QUEUE = int(os.environ.get("OLLAMA_MAX_QUEUE", "8"))
+
+
+class LLMBusy(Exception):
+    """Raised when the generation queue is full. Maps to 429."""
+    pass
+
+
+class CircuitBreaker:
+    """
+    closed → open after `threshold` consecutive failures; open → half-open after `cooldown`
+    seconds, letting one trial call through; a success closes it, a failure re-opens it.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = self._clock()
+
+
+class ConcurrencyLimiter:
+    """
+    Concurrency cap with a bounded, prioritised wait queue. slot() raises LLMBusy when
+    max_queue user callers are already waiting. Background slots (precomputation) are not
+    bounded or rejected, but every waiting user caller is served before any of them.
+    A caller cancelled while queued (client disconnect) leaves the queue.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, max_queue: int = MAX_QUEUE):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiting = 0
+        self.background_waiting = 0
+        self.rejected = 0
+        self._queue: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._loop = None
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = []
+            self.active = 0
+            self.waiting = 0
+            self.background_waiting = 0
+        return loop
+
+    @asynccontextmanager
+    async def slot(self, background: bool = False):
+        """Hold one generation slot; yields the seconds spent queued for it."""
+        loop = self._bind_loop()
+        queued_at = loop.time()
+        full = self.active >= self.max_concurrency or self._queue
+        if full and not background and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise LLMBusy(f"LLM queue full ({self.max_concurrency} running, {self.waiting} waiting)")
+        if full:
+            await self._wait_turn(loop, background)
+        else:
+            self.active += 1
+        try:
+            yield loop.time() - queued_at
+        finally:
+            self._release()
+
+    async def _wait_turn(self, loop, background: bool) -> None:
+        granted = loop.create_future()
+        heapq.heappush(self._queue, (1 if background else 0, next(self._seq), granted))
+        if background:
+            self.background_waiting += 1
+        else:
+            self.waiting += 1
+        try:
+            await granted
+        except asyncio.CancelledError:
+            if granted.done() and not granted.cancelled():
+                self._release()  # the slot was handed over just as we were cancelled
+            raise
+        finally:
+            if background:
+                self.background_waiting -= 1
+            else:
+                self.waiting -= 1
+
+    def _release(self) -> None:
+        # Hand the slot straight to the best waiter (users first, then FIFO); skip cancelled ones.
+        while self._queue:
+            _, _, granted = heapq.heappop(self._queue)
+            if not granted.done():
+                granted.set_result(None)
+                return
+        self.active -= 1
+
+
+class OllamaClient:
+    """
+    Pooled async client + cached availability probe + circuit breaker + concurrency limiter
+    for one backend. `metrics` holds this backend's call latencies.
+    """
+
+    def __init__(
+        self,
+        base_url: str = OLLAMA_BASE_URL,
+        pool_size: int = POOL_SIZE,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        probe_ttl: float = PROBE_TTL,
+        breaker: CircuitBreaker | None = None,
+        limiter: ConcurrencyLimiter | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        clock=time.monotonic,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.probe_ttl = probe_ttl
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.limiter = limiter or ConcurrencyLimiter()
+        self._transport = transport
+        self._clock = clock
+        self._http: httpx.AsyncClient | None = None
+        self._http_loop = None
+        self._probe_lock: asyncio.Lock | None = None
+        self._probed_at: float | None = None
+        self._probe_ok = False
+        self.metrics = LLMMetrics()
+
+    @property
+    def backends(self) -> list["OllamaClient"]:
+        return [self]
+
+    @property
+    def healthy(self) -> bool:
+        """Breaker not open and the last fresh probe (if any) succeeded."""
+        return self.breaker.state != "open" and (self._probe_ok or not self._probe_fresh())
+
+    @property
+    def load(self) -> float:
+        """Requests running or queued here, relative to this backend's concurrency."""
+        queued = self.limiter.active + self.limiter.waiting + self.limiter.background_waiting
+        return queued / max(self.limiter.max_concurrency, 1)
+
+    def _client(self) -> httpx.AsyncClient:
+        # Connections belong to the event loop that opened them; rebuild if the loop changed.
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http_loop is not loop:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                transport=self._transport,
+            )
+            self._http_loop = loop
+            self._probe_lock = asyncio.Lock()
+        return self._http
+
+    async def available(self) -> bool:
+        """Cached /api/tags probe. No network while the cache is fresh or the breaker is open."""
+        if self._probe_fresh():
+            return self._probe_ok
+        http = self._client()
+        async with self._probe_lock:
+            if self._probe_fresh():
+                return self._probe_ok
+            if not self.breaker.allow():
+                return False
+            try:
+                r = await http.get("/api/tags", timeout=PROBE_TIMEOUT)
+                ok = r.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+            self._probe_ok = ok
+            self._probed_at = self._clock()
+            return ok
+
+    def _probe_fresh(self) -> bool:
+        return self._probed_at is not None and self._clock() - self._probed_at < self.probe_ttl
+
+    def _record_failure(self) -> None:
+        self.breaker.record_failure()
+        self._probed_at = None
+
+    async def generate(self, payload: dict, background: bool = False, record_metrics: bool = True) -> dict:
+        """
+        POST /api/generate within a concurrency slot. Raises LLMBusy when the queue is full.
+        background=True queues behind every user call. Connection errors and 5xx count against the breaker.
+        The response gains `queue_wait`: seconds spent waiting for the slot.
+        record_metrics=False keeps the call out of `metrics` (keep-alive pings).
+        """
+        started = time.perf_counter()
+        async with self.limiter.slot(background=background) as queue_wait:
+            try:
+                r = await self._client().post("/api/generate", json=payload)
+                r.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                if record_metrics:
+                    self.metrics.record_error("generate")
+                if e.response.status_code >= 500:
+                    self._record_failure()
+                raise
+            except httpx.TransportError:
+                if record_metrics:
+                    self.metrics.record_error("generate")
+                self._record_failure()
+                raise
+            self.breaker.record_success()
+            data = {**r.json(), "queue_wait": queue_wait}
+            if record_metrics:
+                self.metrics.record("generate", call_fields(data, time.perf_counter() - started, payload.get("prompt") or ""))
+            return data
+
+    async def stream_generate(self, payload: dict, background: bool = False) -> AsyncIterator[dict]:
+        """
+        POST /api/generate with stream=true; yields each NDJSON chunk through the final
+        (done) one. Holds one concurrency slot for the whole stream; closing the iterator
+        early (client disconnect, enough output) closes the upstream response, which stops
+        Ollama generating, and frees the slot. Every chunk gains `queue_wait`, as in generate().
+        """
+        started = time.perf_counter()
+        async with self.limiter.slot(background=background) as queue_wait:
+            try:
+                async with self._client().stream("POST", "/api/generate", json={**payload, "stream": True}) as r:
+                    r.raise_for_status()
+                    async for line in r.aiter_lines():
+                        if not line.strip():
+                            continue
+                        chunk = json.loads(line)
+                        if chunk.get("error"):
+                            raise RuntimeError(chunk["error"])
+                        chunk["queue_wait"] = queue_wait
+                        if chunk.get("done"):
+                            wall = time.perf_counter() - started
+                            self.metrics.record("stream", call_fields(chunk, wall, payload.get("prompt") or ""))
+                            # Before the yield: readers usually close the stream at the final chunk.
+                            self.breaker.record_success()
+                            yield chunk
+                            break
+                        yield chunk
+            except GeneratorExit:
+                # Closed early by the reader (enough output, disconnect): the backend was answering.
+                self.breaker.record_success()
+                raise
+            except httpx.HTTPStatusError as e:
+                self.metrics.record_error("stream")
+                if e.response.status_code >= 500:
+                    self._record_failure()
+                raise
+            except httpx.TransportError:
+                self.metrics.record_error("stream")
+                self._record_failure()
+                raise
+            self.breaker.record_success()
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def stats(self) -> dict:
+        return {
+            "base_url": self.base_url,
+            "healthy": self.healthy,
+            "breaker": self.breaker.state,
+            "active": self.limiter.active,
+            "waiting": self.limiter.waiting + self.limiter.background_waiting,
+            "rejected": self.limiter.rejected,
+            "latency": self.metrics.snapshot(),
+        }
+
+
+def _failover_error(e: Exception) -> bool:
+    """Errors worth retrying on another backend: it is down, erroring or full."""
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code >= 500
+    return isinstance(e, httpx.TransportError | LLMBusy)
+
+
+class OllamaPool:
+    """
+    Several backends behind the OllamaClient interface. Each call tries the healthy backends
+    in order of load (config order breaks ties); a backend that is full, unreachable or
+    answers 5xx before producing output is skipped for the next. A stream that fails after
+    its first chunk is not retried: the caller has already shown part of the answer.
+    """
+
+    def __init__(self, clients: list[OllamaClient]):
+        if not clients:
+            raise ValueError("OllamaPool needs at least one backend")
+        self.clients = clients
+        self.failovers = 0
+
+    @classmethod
+    def from_urls(cls, urls: list[str], **client_kwargs) -> "OllamaPool":
+        return cls([OllamaClient(base_url=url, **client_kwargs) for url in urls])
+
+    @property
+    def backends(self) -> list[OllamaClient]:
+        return self.clients
+
+    async def available(self) -> bool:
+        """Any backend up (cached probes, checked concurrently)."""
+        return any(await asyncio.gather(*(c.available() for c in self.clients)))
+
+    def _candidates(self) -> list[OllamaClient]:
+        return sorted((c for c in self.clients if c.healthy), key=lambda c: c.load)
+
+    def _no_backend(self) -> Exception:
+        return httpx.ConnectError("No healthy Ollama backend")
+
+    async def generate(self, payload: dict, background: bool = False) -> dict:
+        last_error: Exception | None = None
+        for client in self._candidates():
+            if last_error is not None:
+                self.failovers += 1
+            try:
+                return await client.generate(payload, background=background)
+            except Exception as e:
+                if not _failover_error(e):
+                    raise
+                last_error = e
+        raise last_error or self._no_backend()
+
+    async def stream_generate(self, payload: dict, background: bool = False) -> AsyncIterator[dict]:
+        last_error: Exception | None = None
+        for client in self._candidates():
+            if last_error is not None:
+                self.failovers += 1
+            started = False
+            try:
+                async with aclosing(client.stream_generate(payload, background=background)) as chunks:
+                    async for chunk in chunks:
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                if started or not _failover_error(e):
+                    raise
+                last_error = e
+        raise last_error or self._no_backend()
+
+    async def aclose(self) -> None:
+        for client in self.clients:
+            await client.aclose()
+
+    def stats(self) -> dict:
+        return {"failovers": self.failovers, "backends": [c.stats() for c in self.clients]}
+
+
+_client: OllamaClient | OllamaPool | None = None
+_client_lock = threading.Lock()
+
+
+def get_ollama_client() -> OllamaClient | OllamaPool:
+    """The process-wide client (a pool when OLLAMA_BASE_URLS lists several backends), created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if len(OLLAMA_BASE_URLS) > 1:
+                _client = OllamaPool.from_urls(OLLAMA_BASE_URLS)
+            else:
+                _client = OllamaClient(base_url=OLLAMA_BASE_URLS[0] if OLLAMA_BASE_URLS else OLLAMA_BASE_URL)
+        return _client
+
+
+def reset_ollama_client() -> None:
+    """Drop the process-wide client (tests, config reload). Its connections close with their loop."""
+    global _client
+    with _client_lock:
+        _client = None
@@ -24,74 +24,107 @@ from core.services.belief_analysis_service import BeliefAnalysisService
 TTL_DAYS = 30
 
 
+def _history_item(row, now: datetime) -> dict:
+    """One proposal row as an audit-view item (includes condition_state)."""
+    created = row.created_at
+    if created and created.tzinfo is None:
+        created = created.replace(tzinfo=UTC)
+    age_days = (now - created).days if created else 0
+    return {
+        "proposal_id": row.proposal_id,
+        "belief_id": row.payload.get("belief_id", ""),
+        "belief_text": row.payload.get("belief_text", ""),
+        "created_at": row.created_at.isoformat() if row.created_at else "",
+        "status": row.status,
+        "age_days": age_days,
+        "condition_state": row.payload.get("condition_state"),
+    }
+
+
 class ProposalEngine:
 
-    def __init__(self, artifact_repo, lifecycle_repo, proposal_repo):
+    def __init__(self, artifact_repo, lifecycle_repo, proposal_repo, on_review_prompt=None):
+        """on_review_prompt(payload), if given, is called after each new review_prompt is stored."""
         self.artifact_repo = artifact_repo
         self.lifecycle_repo = lifecycle_repo
         self.proposal_repo = proposal_repo
+        self.on_review_prompt = on_review_prompt
         self._belief_analysis = BeliefAnalysisService(artifact_repo, lifecycle_repo)
         self._integrity = ArtifactIntegrityService(artifact_repo)
 
-    def evaluate(self):
-        """Run deterministic evaluation. Canonical order: expire first, generate after."""
+    def evaluate(self, stale: dict[str, list] | None = None, orphans: dict | None = None):
+        """Run deterministic evaluation. Canonical order: expire first, generate after.
+
+        stale / orphans may be passed in when the caller already computed them
+        (get_beliefs_needing_review / get_orphans); otherwise each is computed once here.
+        """
+        if stale is None:
+            stale = self._belief_analysis.get_beliefs_needing_review()
+        if orphans is None:
+            orphans = self._integrity.get_orphans()
         self._expire_ttl()
-        self._expire_resolved_conditions()
-        self._generate_missing_grounding()
-        self._generate_stale()
+        blocked = self._expire_resolved_conditions(stale, orphans)
+        self._generate_missing_grounding(orphans, blocked["missing_grounding"])
+        self._generate_stale(stale, blocked["review_prompt"])
 
     def _expire_ttl(self):
         """Expire pending proposals older than TTL."""
         self.proposal_repo.expire_older_than_days(TTL_DAYS)
 
-    def _expire_resolved_conditions(self):
+    def _expire_resolved_conditions(self, stale: dict[str, list], orphans: dict) -> dict[str, set[str]]:
         """If condition false → expire all non-expired proposals of that type.
-        Clean false→true transitions: expiration clears slate when world changes."""
+        Clean false→true transitions: expiration clears slate when world changes.
+        Returns, per type, belief_ids that still hold a non-expired proposal (must not regenerate)."""
         stale_belief_ids = {
             item["belief_id"]
-            for items in self._belief_analysis.get_beliefs_needing_review().values()
+            for items in stale.values()
             for item in items
         }
-        for row in self.proposal_repo.list_non_expired_by_type("review_prompt"):
-            belief_id = row.payload.get("belief_id")
-            if belief_id and belief_id not in stale_belief_ids:
-                self.proposal_repo.expire(row.proposal_id)
-
-        ungrounded_belief_ids = {
-            b["belief_id"] for b in self._integrity.get_orphans()["beliefs_without_snapshots"]
-        }
-        for row in self.proposal_repo.list_non_expired_by_type("missing_grounding"):
-            belief_id = row.payload.get("belief_id")
-            if belief_id and belief_id not in ungrounded_belief_ids:
-                self.proposal_repo.expire(row.proposal_id)
-
-    def _generate_stale(self):
-        grouped = self._belief_analysis.get_beliefs_needing_review()
-        for items in grouped.values():
+        ungrounded_belief_ids = {b["belief_id"] for b in orphans["beliefs_without_snapshots"]}
+
+        blocked: dict[str, set[str]] = {}
+        for proposal_type, condition_ids in (
+            ("review_prompt", stale_belief_ids),
+            ("missing_grounding", ungrounded_belief_ids),
+        ):
+            blocked[proposal_type] = set()
+            for row in self.proposal_repo.list_non_expired_by_type(proposal_type):
+                belief_id = row.payload.get("belief_id")
+                if belief_id and belief_id not in condition_ids:
+                    self.proposal_repo.expire(row.proposal_id)
+                elif belief_id:
+                    blocked[proposal_type].add(belief_id)
+        return blocked
+
+    def _generate_stale(self, stale: dict[str, list], blocked: set[str]):
+        for items in stale.values():
             for item in items:
                 belief_id = item["belief_id"]
-                if self.proposal_repo.exists_for_belief(belief_id, "review_prompt"):
+                if belief_id in blocked:
                     continue
+                payload = {
+                    "belief_id": belief_id,
+                    "belief_text": item["belief_text"],
+                    "newer_snapshot_ids": item["newer_snapshot_ids"],
+                    "age_days_since_review": item["age_days_since_review"],
+                    "condition_state": {
+                        "type": "stale",
+                        "triggered_at": _now_iso(),
+                    },
+                }
                 self.proposal_repo.create({
                     "proposal_id": str(uuid4()),
                     "proposal_type": "review_prompt",
-                    "payload": {
-                        "belief_id": belief_id,
-                        "belief_text": item["belief_text"],
-                        "newer_snapshot_ids": item["newer_snapshot_ids"],
-                        "age_days_since_review": item["age_days_since_review"],
-                        "condition_state": {
-                            "type": "stale",
-                            "triggered_at": _now_iso(),
-                        },
-                    },
+                    "payload": payload,
                 })
+                blocked.add(belief_id)
+                if self.on_review_prompt:
+                    self.on_review_prompt(payload)
 
-    def _generate_missing_grounding(self):
-        orphans = self._integrity.get_orphans()
+    def _generate_missing_grounding(self, orphans: dict, blocked: set[str]):
         for item in orphans["beliefs_without_snapshots"]:
             belief_id = item["belief_id"]
-            if self.proposal_repo.exists_for_belief(belief_id, "missing_grounding"):
+            if belief_id in blocked:
                 continue
             self.proposal_repo.create({
                 "proposal_id": str(uuid4()),
@@ -105,31 +138,20 @@ class ProposalEngine:
                     },
                 },
             })
+            blocked.add(belief_id)
 
     def get_history_for_display(self) -> dict[str, dict[str, list[dict]]]:
         """
         Proposal history grouped by (proposal_type, status). Instance-level. Transparency > compression.
         Includes condition_state for audit. Sorted newest-first within each bucket.
+        Unbounded; the audit page uses get_history_counts + get_history_page instead.
         """
         rows = self.proposal_repo.list_all()
         now = datetime.now(UTC)
         grouped: dict[str, dict[str, list[dict]]] = defaultdict(lambda: defaultdict(list))
 
         for row in rows:
-            created = row.created_at
-            if created and created.tzinfo is None:
-                created = created.replace(tzinfo=UTC)
-            age_days = (now - created).days if created else 0
-            item = {
-                "proposal_id": row.proposal_id,
-                "belief_id": row.payload.get("belief_id", ""),
-                "belief_text": row.payload.get("belief_text", ""),
-                "created_at": row.created_at.isoformat() if row.created_at else "",
-                "status": row.status,
-                "age_days": age_days,
-                "condition_state": row.payload.get("condition_state"),
-            }
-            grouped[row.proposal_type][row.status].append(item)
+            grouped[row.proposal_type][row.status].append(_history_item(row, now))
 
         # Sort each bucket newest-first (list_all is already desc, but we group so re-sort)
         for ptype in grouped:
@@ -141,6 +163,18 @@ class ProposalEngine:
 
         return dict(grouped)
 
+    def get_history_counts(self) -> dict[str, dict[str, int]]:
+        """Proposal counts per (proposal_type, status), computed in SQL."""
+        return self.proposal_repo.count_by_type_and_status()
+
+    def get_history_page(
+        self, proposal_type: str, status: str, cursor: str | None = None, limit: int = 50,
+    ) -> tuple[list[dict], str | None]:
+        """One newest-first page of a (proposal_type, status) bucket, plus the cursor for the next page."""
+        rows, next_cursor = self.proposal_repo.list_page(proposal_type, status, cursor=cursor, limit=limit)
+        now = datetime.now(UTC)
+        return [_history_item(row, now) for row in rows], next_cursor
+
     def list_for_display(self) -> dict[str, dict[str, list[dict]]]:
         """
         Return proposals clustered by (proposal_type, belief_text) for display.
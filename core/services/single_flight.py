@@ -0,0 +1,103 @@
+"""
+Single-flight deduplication of identical in-flight calls.
+
+Concurrent callers with the same key share one upstream call instead of each starting their
+own (two tabs, a double click). The call runs as its own task, so one caller disconnecting
+does not cancel it for the others; it is cancelled only once every caller has gone.
+Streams are fanned out: a caller joining late first replays what has already arrived.
+"""
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
+from typing import Any
+
+
+class _Flight:
+    def __init__(self):
+        self.task: asyncio.Task | None = None
+        self.waiters = 0
+        self.items: list = []
+        self.changed = asyncio.Event()
+
+    def wake(self, *_):
+        event, self.changed = self.changed, asyncio.Event()
+        event.set()
+
+
+class SingleFlight:
+    """Per-key in-flight registry. `started` counts upstream calls, `coalesced` callers that joined one."""
+
+    def __init__(self):
+        self.started = 0
+        self.coalesced = 0
+        self._flights: dict[str, _Flight] = {}
+        self._loop = None
+
+    def _join(self, key: str, start: Callable[[_Flight], Awaitable[Any]]) -> _Flight:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._flights = {}
+            self._loop = loop
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            flight.task = loop.create_task(start(flight))
+            flight.task.add_done_callback(flight.wake)
+            flight.task.add_done_callback(lambda _t: self._forget(key, flight))
+            self._flights[key] = flight
+            self.started += 1
+        else:
+            self.coalesced += 1
+        flight.waiters += 1
+        return flight
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def _leave(self, key: str, flight: _Flight) -> None:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            # Unregister with the cancel: a caller arriving before the task finishes must start afresh.
+            self._forget(key, flight)
+            flight.task.cancel()
+
+    async def call(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await factory() — or the identical call already in flight — and return its result."""
+        flight = self._join(key, lambda _f: factory())
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            self._leave(key, flight)
+
+    async def stream(self, key: str, factory: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """Items of factory() — or of the identical stream already in flight, from its first item."""
+
+        async def pump(flight: _Flight) -> None:
+            async with aclosing(factory()) as items:
+                async for item in items:
+                    flight.items.append(item)
+                    flight.wake()
+
+        flight = self._join(key, pump)
+        try:
+            i = 0
+            while True:
+                while i < len(flight.items):
+                    yield flight.items[i]
+                    i += 1
+                if flight.task.done():
+                    if i == len(flight.items):
+                        flight.task.result()  # re-raise an upstream failure
+                        return
+                    continue
+                await flight.changed.wait()
+        finally:
+            self._leave(key, flight)
+
+    def stats(self) -> dict:
+        return {
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+        }
@@ -0,0 +1,147 @@
+"""
+Weekly review assembler.
+
+Loads the weekly review's inputs once — artifacts (with their references), answered question ids,
+due cadence rows (joined to belief text and tickers) and proposals — and derives every section from that working set.
+The existing read-only services run unchanged against the in-memory artifact view,
+so section semantics stay identical to /review/* while SQL round trips stay constant.
+"""
+from datetime import date
+from typing import Any
+
+from core.models.reasoning_artifact import ArtifactType
+from core.repositories.artifact_repository import ArtifactRepository
+from core.repositories.cadence_repository import CadenceRepository
+from core.repositories.lifecycle_repository import BeliefLifecycleRepository
+from core.repositories.proposal_repository import ProposalRepository
+from core.repositories.question_answer_repository import QuestionAnswerRepository
+from core.services.analysis_precompute import precompute_analysis
+from core.services.artifact_integrity_service import ArtifactIntegrityService
+from core.services.belief_analysis_service import BeliefAnalysisService
+from core.services.introspection_service import IntrospectionService
+from core.services.proposal_engine import ProposalEngine
+
+# Page order. Proposals render last but are independent of the other sections.
+SECTIONS = ("all_beliefs", "questions", "stale_beliefs", "cadence_due", "orphans", "proposals")
+
+
+class WeeklyReviewAssembler:
+    """
+    One bulk load per render, then pure in-memory derivation. Each section is computed at most once.
+    Writes happen only in proposal evaluation (expire / generate), as before.
+    """
+
+    def __init__(self, db, today: date | None = None):
+        self.db = db
+        self.today = today or date.today()
+        self.artifact_repo = ArtifactRepository(db)
+        self.lifecycle_repo = BeliefLifecycleRepository(db)
+        self.proposal_repo = ProposalRepository(db)
+        self.cadence_repo = CadenceRepository(db)
+        self.answer_repo = QuestionAnswerRepository(db)
+        self._working_set = None
+        self._answered_ids: set[str] | None = None
+        self._cache: dict[str, Any] = {}
+
+    # ---------------------------
+    # Working set
+    # ---------------------------
+    @property
+    def working_set(self):
+        if self._working_set is None:
+            self._working_set = self.artifact_repo.load_working_set()
+        return self._working_set
+
+    @property
+    def answered_question_ids(self) -> set[str]:
+        if self._answered_ids is None:
+            self._answered_ids = self.answer_repo.answered_question_ids()
+        return self._answered_ids
+
+    def _memo(self, name: str, compute):
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    # ---------------------------
+    # Sections
+    # ---------------------------
+    def stale_beliefs(self) -> dict[str, list]:
+        return self._memo(
+            "stale_beliefs",
+            lambda: BeliefAnalysisService(self.working_set, self.lifecycle_repo).get_beliefs_needing_review(),
+        )
+
+    def orphans(self) -> dict:
+        return self._memo("orphans", lambda: ArtifactIntegrityService(self.working_set).get_orphans())
+
+    def all_beliefs(self) -> dict[str, int]:
+        # Counts only (SQL GROUP BY); rows load per group on demand.
+        return self._memo(
+            "all_beliefs",
+            lambda: BeliefAnalysisService(self.artifact_repo, self.lifecycle_repo).get_all_belief_group_counts(),
+        )
+
+    def questions(self) -> dict[str, list]:
+        return self._memo(
+            "questions",
+            lambda: IntrospectionService(self.working_set, self.answered_question_ids).get_open_questions(),
+        )
+
+    def proposals(self) -> dict[str, dict[str, list[dict]]]:
+        def compute():
+            engine = ProposalEngine(
+                self.working_set, self.lifecycle_repo, self.proposal_repo, on_review_prompt=precompute_analysis
+            )
+            engine.evaluate(stale=self.stale_beliefs(), orphans=self.orphans())
+            return engine.list_for_display()
+        return self._memo("proposals", compute)
+
+    def cadence_due(self) -> list[dict]:
+        def compute():
+            return [
+                {
+                    "belief_id": row["belief_id"],
+                    "belief_text": row["statement"],
+                    "next_review_by": row["next_review_by"].isoformat() if row["next_review_by"] else "",
+                    "cadence_days": row["cadence_days"],
+                    "company": ", ".join(row["tickers"]) if row["tickers"] else "uncoupled",
+                }
+                for row in self.cadence_repo.list_due_with_beliefs(self.today)
+                if row["artifact_type"] in (ArtifactType.thesis.value, ArtifactType.risk.value)
+            ]
+        return self._memo("cadence_due", compute)
+
+    # ---------------------------
+    # Template context
+    # ---------------------------
+    def section_context(self, name: str) -> dict[str, Any]:
+        """Template variables for one section (templates/weekly_review/<name>.html)."""
+        if name == "proposals":
+            proposals = self.proposals()
+            return {
+                "proposals": proposals,
+                "proposals_total": sum(
+                    sum(len(instances) for instances in clusters.values())
+                    for clusters in proposals.values()
+                ),
+            }
+        if name == "orphans":
+            return {"orphans": self.orphans()}
+        if name == "cadence_due":
+            cadence_due = self.cadence_due()
+            return {"cadence_due": cadence_due, "cadence_due_total": len(cadence_due)}
+        if name == "all_beliefs":
+            counts = self.all_beliefs()
+            return {"all_beliefs": counts, "all_beliefs_total": sum(counts.values())}
+        if name in ("questions", "stale_beliefs"):
+            grouped = getattr(self, name)()
+            return {name: grouped, f"{name}_total": sum(len(v) for v in grouped.values())}
+        raise ValueError(f"Unknown weekly review section: {name}")
+
+    def assemble(self) -> dict[str, Any]:
+        """Every weekly review section plus totals, ready for weekly_review.html."""
+        context: dict[str, Any] = {}
+        for name in SECTIONS:
+            context.update(self.section_context(name))
+        return context
@@ -4,3 +4,7 @@ from db.session import Base, engine
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables; add indexes declared after a table was first created.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -13,6 +13,6 @@ class BeliefReviewCadenceORM(Base):
     __tablename__ = "belief_review_cadence"
 
     belief_id = Column(String, primary_key=True, index=True)
-    next_review_by = Column(Date, nullable=False)
+    next_review_by = Column(Date, nullable=False, index=True)
     cadence_days = Column(Integer, nullable=True)
     updated_at = Column(DateTime, nullable=False, default=_utc_now)
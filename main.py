@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
@@ -5,20 +6,28 @@ from fastapi.responses import JSONResponse
 
 from api.routes.artifact_detail import router as artifact_detail_router
 from api.routes.artifacts import router as artifacts_router
+from api.routes.exports import router as exports_router
 from api.routes.llm import router as llm_router
 from api.routes.proposals import router as proposals_router
 from api.routes.reports import router as reports_router
 from api.routes.review import router as review_router
 from api.routes.weekly_review import router as weekly_review_router
 from core.exceptions import ArtifactConflictError
-from core.services.llm_service import LLMNotConfigured
+from core.services.analysis_precompute import PRECOMPUTE_ENABLED, get_analysis_precomputer
+from core.services.llm_service import LLMBusy, LLMNotConfigured
+from core.services.model_warmup import get_model_warmer
 from db.init_db import init_db
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    if PRECOMPUTE_ENABLED:
+        get_analysis_precomputer().bind(asyncio.get_running_loop())
+    get_model_warmer().start()  # OLLAMA_PRELOAD / OLLAMA_WARM_HOURS; off by default
     yield
+    await get_model_warmer().stop()
+    get_analysis_precomputer().bind(None)
 
 
 app = FastAPI(title="Equity Copilot", lifespan=lifespan)
@@ -32,6 +41,15 @@ async def llm_not_configured_handler(request: Request, exc: LLMNotConfigured):
     )
 
 
+@app.exception_handler(LLMBusy)
+async def llm_busy_handler(request: Request, exc: LLMBusy):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "LLM busy: too many generations queued. Retry shortly."},
+        headers={"Retry-After": "5"},
+    )
+
+
 @app.exception_handler(ArtifactConflictError)
 async def artifact_conflict_handler(request: Request, exc: ArtifactConflictError):
     return JSONResponse(status_code=409, content={"detail": exc.message})
@@ -44,3 +62,4 @@ app.include_router(llm_router)
 app.include_router(artifacts_router)  # before detail so /beliefs/new and /questions/new match first
 app.include_router(artifact_detail_router)
 app.include_router(reports_router)
+app.include_router(exports_router)
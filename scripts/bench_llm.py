@@ -0,0 +1,158 @@
+"""
+Benchmark the /api/llm/* endpoints under concurrency against the fake Ollama server.
+
+In-process by default: the app and scripts/fake_ollama.py run in this process over ASGI
+transports (no sockets; the on-disk LLM cache is not touched). Use --app-url to drive a
+running app instead (start it with OLLAMA_BASE_URL pointing at fake_ollama.py).
+Reports status counts, p50/p95/p99/mean latency and throughput.
+
+  python scripts/bench_llm.py --requests 200 --concurrency 16 --latency 0.2 --tokens-per-sec 50
+  python scripts/bench_llm.py --endpoint explain-proposal/stream --repeat-prompts
+  python scripts/bench_llm.py --app-url http://127.0.0.1:8000 --endpoint draft-belief
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+
+ENDPOINTS = {
+    "draft-belief": lambda tag: {"statement": f"Cloud margins may expand{tag}.", "artifact_type": "thesis"},
+    "draft-question": lambda tag: {"question": f"What would signal demand recovery{tag}?"},
+    "summarize-snapshots": lambda tag: {"snapshot_texts": [f"ACME revenue=120, margin=0.21{tag}"]},
+    "explain-proposal": lambda tag: {"proposal_type": "review_prompt", "belief_text": f"Margins may expand{tag}."},
+    "explain-proposal/stream": lambda tag: {"proposal_type": "review_prompt", "belief_text": f"Margins may expand{tag}."},
+}
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def run_bench(
+    client: httpx.AsyncClient,
+    endpoint: str = "draft-belief",
+    requests: int = 100,
+    concurrency: int = 8,
+    unique_prompts: bool = True,
+) -> dict:
+    """Fire `requests` POSTs at /api/llm/<endpoint>, at most `concurrency` at a time."""
+    body = ENDPOINTS[endpoint]
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+
+    async def one(i: int) -> None:
+        async with gate:
+            started = time.perf_counter()
+            try:
+                r = await client.post(f"/api/llm/{endpoint}", json=body(f" #{i}" if unique_prompts else ""))
+                await r.aread()
+                statuses[r.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    wall = time.perf_counter() - started
+    return {
+        "endpoint": endpoint,
+        "requests": requests,
+        "concurrency": concurrency,
+        "statuses": dict(statuses),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "mean_ms": round(sum(latencies) / len(latencies), 1),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(requests / wall, 2) if wall else None,
+    }
+
+
+def in_process_client(
+    fake_options: dict,
+    max_concurrency: int,
+    max_queue: int,
+    use_cache: bool = False,
+) -> httpx.AsyncClient:
+    """The app over ASGI, with its LLM dependency pointed at an in-process fake Ollama."""
+    from api.routes.llm import get_llm
+    from core.services.llm_cache import LLMCache
+    from core.services.llm_service import LLMService
+    from core.services.ollama_client import ConcurrencyLimiter, OllamaClient
+    from main import app
+    from scripts.fake_ollama import create_app
+
+    ollama = OllamaClient(
+        base_url="http://fake-ollama",
+        transport=httpx.ASGITransport(app=create_app(**fake_options)),
+        limiter=ConcurrencyLimiter(max_concurrency=max_concurrency, max_queue=max_queue),
+    )
+    llm = LLMService(client=ollama, cache=LLMCache(path=":memory:", enabled=use_cache))
+    app.dependency_overrides[get_llm] = lambda: llm
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app", timeout=None)
+
+
+def _print_report(report: dict) -> None:
+    print(f"  {report['endpoint']}: {report['requests']} requests, concurrency {report['concurrency']}")
+    print(f"  statuses   {report['statuses']}")
+    print(f"  latency    p50 {report['p50_ms']} ms   p95 {report['p95_ms']} ms   "
+          f"p99 {report['p99_ms']} ms   mean {report['mean_ms']} ms")
+    print(f"  throughput {report['throughput_rps']} req/s over {report['wall_s']} s")
+
+
+async def main(args) -> dict:
+    if args.app_url:
+        client = httpx.AsyncClient(base_url=args.app_url, timeout=None)
+    else:
+        client = in_process_client(
+            {
+                "latency": args.latency,
+                "tokens_per_sec": args.tokens_per_sec,
+                "max_tokens": args.max_tokens,
+                "error_rate": args.error_rate,
+            },
+            max_concurrency=args.llm_concurrency,
+            max_queue=args.llm_queue,
+            use_cache=args.cache,
+        )
+    async with client:
+        report = await run_bench(
+            client,
+            endpoint=args.endpoint,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            unique_prompts=not args.repeat_prompts,
+        )
+    _print_report(report)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Concurrent latency/throughput benchmark for /api/llm/* endpoints.")
+    p.add_argument("--endpoint", choices=sorted(ENDPOINTS), default="draft-belief")
+    p.add_argument("-n", "--requests", type=int, default=100)
+    p.add_argument("-c", "--concurrency", type=int, default=8, help="Client-side concurrent requests (default 8)")
+    p.add_argument("--repeat-prompts", action="store_true", help="Same prompt every time (exercises cache / single flight)")
+    p.add_argument("--app-url", help="Drive a running app instead of the in-process one")
+    g = p.add_argument_group("in-process fake Ollama")
+    g.add_argument("--latency", type=float, default=0.2, help="Seconds before the first token (default 0.2)")
+    g.add_argument("--tokens-per-sec", type=float, default=50, help="Generation speed; 0 = instant (default 50)")
+    g.add_argument("--max-tokens", type=int, default=64)
+    g.add_argument("--error-rate", type=float, default=0.0)
+    g.add_argument("--llm-concurrency", type=int, default=2, help="OLLAMA_MAX_CONCURRENCY for the run (default 2)")
+    g.add_argument("--llm-queue", type=int, default=1000, help="OLLAMA_MAX_QUEUE for the run (default 1000)")
+    g.add_argument("--cache", action="store_true", help="Enable the (in-memory) response cache")
+    asyncio.run(main(p.parse_args()))
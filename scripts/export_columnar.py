@@ -0,0 +1,56 @@
+"""
+Export the decision log and snapshot financials to columnar files (Parquet or Arrow IPC).
+
+Read-only. Same typed columns as GET /api/export/{decisions,snapshots}.parquet.
+Writes <out_dir>/decisions.<fmt> and <out_dir>/snapshots.<fmt>.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Project root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.repositories.artifact_repository import ArtifactRepository
+from core.repositories.lifecycle_repository import BeliefLifecycleRepository
+from core.services.columnar_export_service import (
+    DECISION_LOG_SCHEMA,
+    FORMATS,
+    SNAPSHOT_SCHEMA,
+    ColumnarExportService,
+    write_columnar,
+)
+from db.session import SessionLocal
+
+
+def main(out_dir: str = "exports", fmt: str = "parquet", datasets: list[str] | None = None):
+    datasets = datasets or ["decisions", "snapshots"]
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    db = SessionLocal()
+    try:
+        service = ColumnarExportService(ArtifactRepository(db), BeliefLifecycleRepository(db))
+        if "decisions" in datasets:
+            path = out / f"decisions.{fmt}"
+            n = write_columnar(str(path), service.decision_log_records(), DECISION_LOG_SCHEMA, fmt)
+            print(f"  + {path} ({n} lifecycle events)")
+        if "snapshots" in datasets:
+            path = out / f"snapshots.{fmt}"
+            n = write_columnar(str(path), service.snapshot_records(), SNAPSHOT_SCHEMA, fmt)
+            print(f"  + {path} ({n} snapshots)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Export decision log and snapshots to Parquet/Arrow for offline analysis.")
+    p.add_argument("datasets", nargs="*", help="decisions and/or snapshots (default: both)")
+    p.add_argument("-o", "--out-dir", default="exports", help="Output directory (default: exports)")
+    p.add_argument("-f", "--format", choices=FORMATS, default="parquet", help="parquet (default) or arrow")
+    args = p.parse_args()
+    unknown = set(args.datasets) - {"decisions", "snapshots"}
+    if unknown:
+        p.error(f"unknown dataset(s): {', '.join(sorted(unknown))}")
+    main(out_dir=args.out_dir, fmt=args.format, datasets=args.datasets or None)
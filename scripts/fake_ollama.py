@@ -0,0 +1,185 @@
+"""
+Deterministic stand-in for `ollama serve`, for exercising and load-testing the LLM routes.
+
+Implements GET /api/tags and POST /api/generate (streaming NDJSON and non-streaming) with
+configurable first-token latency, tokens/sec, error rate and model load time. Output text is derived from a
+hash of the prompt, so identical prompts get identical answers; requests with
+format="json" get a valid structural-analysis object. Responses carry Ollama's timing
+fields (eval_count, eval_duration, prompt_eval_count, load_duration, total_duration).
+Like Ollama, the model unloads after the request's keep_alive (default 5m) and the next
+request pays `load_time` again; a request without a prompt only loads the model.
+
+Run:
+  python scripts/fake_ollama.py --port 11435 --latency 0.2 --tokens-per-sec 40 --error-rate 0.01
+  OLLAMA_BASE_URL=http://127.0.0.1:11435 uvicorn main:app
+
+In-process (tests, scripts/bench_llm.py):
+  OllamaClient(transport=httpx.ASGITransport(app=create_app(...)))
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = (
+    "revenue margin growth guidance capex demand pricing backlog churn leverage "
+    "cash flow cycle mix share cost inventory dilution may could suggest indicate"
+).split()
+
+
+def _tokens(prompt: str, n: int) -> list[str]:
+    seed = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    return [rng.choice(WORDS) + " " for _ in range(n)]
+
+
+def keep_alive_seconds(value) -> float:
+    """Ollama keep_alive ("5m", "90s", "1h", 300, "-1" = forever) in seconds."""
+    if value is None:
+        return 300.0
+    if isinstance(value, int | float):
+        seconds = float(value)
+    else:
+        text = str(value).strip()
+        unit = {"s": 1, "m": 60, "h": 3600}.get(text[-1:], None)
+        seconds = float(text[:-1]) * unit if unit else float(text)
+    return float("inf") if seconds < 0 else seconds
+
+
+def _analysis_json(prompt: str) -> str:
+    words = "".join(_tokens(prompt, 12)).strip()
+    return json.dumps({
+        "delta_summary": f"Synthetic analysis: {words}.",
+        "potential_tensions": [f"Synthetic tension ({words.split()[0]})"],
+        "questions_raised": [],
+    })
+
+
+def create_app(
+    model: str = "llama3.1:latest",
+    latency: float = 0.0,
+    tokens_per_sec: float = 0.0,
+    max_tokens: int = 64,
+    error_rate: float = 0.0,
+    seed: int = 0,
+    load_time: float = 0.0,
+) -> FastAPI:
+    """
+    latency: seconds before the first token. tokens_per_sec: generation speed (0 = instant).
+    max_tokens: tokens per answer when the request's num_predict is larger.
+    error_rate: fraction of /api/generate calls answered with HTTP 500 (seeded, reproducible).
+    load_time: seconds a cold request spends loading the model (reported as load_duration).
+    """
+    app = FastAPI(title="Fake Ollama")
+    rng = random.Random(seed)
+    app.state.stats = {"tags": 0, "generate": 0, "errors": 0, "loads": 0}
+    app.state.loaded_until = None  # monotonic deadline while the model is resident
+
+    @app.get("/api/tags")
+    async def tags():
+        app.state.stats["tags"] += 1
+        return {"models": [{"name": model, "model": model}]}
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        started = time.perf_counter()
+        body = await request.json()
+        app.state.stats["generate"] += 1
+        if rng.random() < error_rate:
+            app.state.stats["errors"] += 1
+            return JSONResponse(status_code=500, content={"error": "injected failure"})
+
+        load = 0.0
+        now = time.perf_counter()
+        if app.state.loaded_until is None or now > app.state.loaded_until:
+            app.state.stats["loads"] += 1
+            load = load_time
+            await asyncio.sleep(load)
+        app.state.loaded_until = time.perf_counter() + keep_alive_seconds(body.get("keep_alive"))
+        if not body.get("prompt"):
+            return {"model": body.get("model") or model, "response": "", "done": True, "done_reason": "load",
+                    "load_duration": int(load * 1e9), "total_duration": int((time.perf_counter() - started) * 1e9)}
+
+        prompt = body["prompt"]
+        num_predict = int((body.get("options") or {}).get("num_predict") or max_tokens)
+        if body.get("format") == "json":
+            tokens = [_analysis_json(prompt)]
+        else:
+            tokens = _tokens(prompt, min(num_predict, max_tokens))
+        per_token = 1 / tokens_per_sec if tokens_per_sec > 0 else 0.0
+
+        def timings(elapsed: float) -> dict:
+            return {
+                "model": body.get("model") or model,
+                "created_at": datetime.now(UTC).isoformat(),
+                "total_duration": int(elapsed * 1e9),
+                "load_duration": int(load * 1e9),
+                "prompt_eval_count": len(prompt.split()),
+                "prompt_eval_duration": int(latency * 1e9),
+                "eval_count": len(tokens),
+                "eval_duration": int(per_token * len(tokens) * 1e9),
+            }
+
+        if not body.get("stream", True):
+            await asyncio.sleep(latency + per_token * len(tokens))
+            return {
+                "response": "".join(tokens),
+                "done": True,
+                **timings(time.perf_counter() - started),
+            }
+
+        async def chunks():
+            await asyncio.sleep(latency)
+            for token in tokens:
+                if per_token:
+                    await asyncio.sleep(per_token)
+                yield json.dumps({"model": body.get("model") or model, "response": token, "done": False}) + "\n"
+            final = {"response": "", "done": True, **timings(time.perf_counter() - started)}
+            yield json.dumps(final) + "\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    p = argparse.ArgumentParser(description="Deterministic fake Ollama server for LLM route benchmarks.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=11435)
+    p.add_argument("--model", default="llama3.1:latest")
+    p.add_argument("--latency", type=float, default=0.2, help="Seconds before the first token (default 0.2)")
+    p.add_argument("--tokens-per-sec", type=float, default=40, help="Generation speed; 0 = instant (default 40)")
+    p.add_argument("--max-tokens", type=int, default=64, help="Tokens per answer (default 64)")
+    p.add_argument("--error-rate", type=float, default=0.0, help="Fraction of generations that fail with 500")
+    p.add_argument("--load-time", type=float, default=0.0, help="Seconds to load the model when cold")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+    uvicorn.run(
+        create_app(
+            model=args.model,
+            latency=args.latency,
+            tokens_per_sec=args.tokens_per_sec,
+            max_tokens=args.max_tokens,
+            error_rate=args.error_rate,
+            seed=args.seed,
+            load_time=args.load_time,
+        ),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
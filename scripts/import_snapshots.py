@@ -6,14 +6,24 @@ Architecture rule:
 - Never bypasses snapshot model.
 - Never auto-creates beliefs, proposals, or runs LLM.
 - Snapshots are immutable: if one for this ticker+quarter exists → skip.
+
+Pipeline (ingest): a thread pool fetches tickers concurrently, every source call waits on
+one global rate limit and is retried with exponential backoff. Fetched frames are mapped to
+StockSnapshots as they arrive and handed to a single writer thread, so network calls overlap
+with DB writes. The data source is pluggable (YahooSource; tests pass a local fake).
+--from-file loads snapshots offline from Parquet/Arrow/CSV instead (columnar_import_service).
 """
 from __future__ import annotations
 
+import queue
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import UTC, datetime
 from decimal import Decimal
 from pathlib import Path
-from uuid import UUID, uuid5
+from uuid import uuid5
 
 # Project root
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -31,6 +41,7 @@ from core.models.stock_snapshot import (
     StockSnapshot,
 )
 from core.repositories.artifact_repository import ArtifactRepository
+from core.services.columnar_import_service import NAMESPACE_SNAPSHOT, ColumnarImportService
 from db.models.artifact import ArtifactORM
 from db.models.lifecycle import BeliefLifecycleEventORM
 from db.models.observed_returns import BeliefReturnObservationORM, ObservedReturnPeriodORM
@@ -39,13 +50,16 @@ from db.models.review_cadence import BeliefReviewCadenceORM
 from db.session import SessionLocal
 
 IST = ZoneInfo("Asia/Kolkata")
-# Deterministic snapshot_id so re-run skips existing (immutable).
-NAMESPACE_SNAPSHOT = uuid5(UUID("6ba7b810-9dad-11d1-80b4-00c04fd430c8"), "equity-copilot.io/snapshot")
 
 # Default tickers; override via CLI or env.
 DEFAULT_TICKERS = ["MSFT", "AMZN", "JPM"]
 # How many quarters to pull per ticker.
 MAX_QUARTERS = 8
+# Tickers fetched at once, source calls per second across all of them, retries per call.
+WORKERS = 4
+RATE_LIMIT = 2.0
+RETRIES = 3
+BACKOFF = 1.0  # seconds before the first retry; doubles each attempt
 
 
 def _safe_decimal(value, default=None):
@@ -82,19 +96,88 @@ def _get_row(df, *names):
     return None
 
 
-def build_snapshots_from_yahoo(ticker: str, max_quarters: int = MAX_QUARTERS) -> list[StockSnapshot]:
+def _is_empty(fin) -> bool:
+    return fin is None or (hasattr(fin, "empty") and fin.empty)
+
+
+class YahooSource:
+    """Live data source. Each method is one Yahoo round trip."""
+
+    def quarterly_financials(self, ticker: str):
+        t = yf.Ticker(ticker)
+        fin = getattr(t, "quarterly_financials", None)
+        if fin is None:
+            fin = getattr(t, "quarterly_income_stmt", None)
+        return fin
+
+    def info(self, ticker: str) -> dict:
+        return getattr(yf.Ticker(ticker), "info", None) or {}
+
+
+class RateLimiter:
+    """At most `rate` acquire() calls per second across all threads (0 = unlimited)."""
+
+    def __init__(self, rate: float = RATE_LIMIT, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = self._clock()
+            at = max(now, self._next)
+            self._next = at + self.interval
+        if at > now:
+            self._sleep(at - now)
+
+
+def _call_with_retry(call, ticker: str, limiter: RateLimiter, retries: int, backoff: float, sleep=time.sleep):
+    """call(ticker) after the rate limit; on error retry up to `retries` times, backoff doubling."""
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        try:
+            return call(ticker)
+        except Exception:
+            if attempt == retries:
+                raise
+            sleep(backoff * 2 ** attempt)
+
+
+def fetch_ticker(
+    source,
+    ticker: str,
+    limiter: RateLimiter | None = None,
+    retries: int = 0,
+    backoff: float = BACKOFF,
+    sleep=time.sleep,
+):
+    """Fetch stage: (quarterly financials, info). info is not requested when there are no financials."""
+    limiter = limiter or RateLimiter(0)
+    fin = _call_with_retry(source.quarterly_financials, ticker, limiter, retries, backoff, sleep)
+    if _is_empty(fin):
+        return None, {}
+    info = _call_with_retry(source.info, ticker, limiter, retries, backoff, sleep)
+    return fin, info or {}
+
+
+def build_snapshots_from_yahoo(ticker: str, max_quarters: int = MAX_QUARTERS, source=None) -> list[StockSnapshot]:
     """
     Fetch quarterly income statement from Yahoo, map to StockSnapshot.
     One snapshot per quarter. No overwrite: caller must skip if snapshot_id exists.
     """
-    t = yf.Ticker(ticker)
-    fin = getattr(t, "quarterly_financials", None)
-    if fin is None:
-        fin = getattr(t, "quarterly_income_stmt", None)
-    if fin is None or (hasattr(fin, "empty") and fin.empty):
+    fin, info = fetch_ticker(source or YahooSource(), ticker)
+    return snapshots_from_financials(ticker, fin, info, max_quarters)
+
+
+def snapshots_from_financials(ticker: str, fin, info: dict, max_quarters: int = MAX_QUARTERS) -> list[StockSnapshot]:
+    """Map stage: quarterly income statement frame (rows = line items, columns = period ends) + info."""
+    if _is_empty(fin):
         return []
 
-    info = getattr(t, "info", None) or {}
     company_name = info.get("longName") or info.get("shortName") or ticker
     sector = info.get("sector")
     industry = info.get("industry")
@@ -193,43 +276,126 @@ def clear_all_data(db) -> None:
     db.commit()
 
 
+def write_snapshots(repo: ArtifactRepository, snapshots: list[StockSnapshot]) -> tuple[int, int]:
+    """Write stage: save snapshots not stored yet (one existence query per batch). Returns (saved, skipped)."""
+    existing = repo.existing_ids(s.metadata.snapshot_id for s in snapshots)
+    saved = 0
+    for s in snapshots:
+        if str(s.metadata.snapshot_id) in existing:
+            continue
+        ticker = s.company.ticker
+        try:
+            repo.save(s)
+            saved += 1
+            print(f"  + {ticker} {s.metadata.as_of.date()} (revenue={s.financials.revenue_fy})")
+        except Exception as e:
+            print(f"  ! {ticker} {s.metadata.as_of.date()} save error: {e}")
+    return saved, len(existing)
+
+
+def ingest(
+    tickers: list[str],
+    source=None,
+    session_factory=SessionLocal,
+    max_quarters: int = MAX_QUARTERS,
+    workers: int = WORKERS,
+    rate: float = RATE_LIMIT,
+    retries: int = RETRIES,
+    backoff: float = BACKOFF,
+    sleep=time.sleep,
+) -> dict:
+    """
+    Fetch `tickers` on `workers` threads (shared rate limit, retries), map each result as it
+    arrives and queue it for one writer thread with its own session. Returns counts and the
+    tickers whose fetch failed after all retries.
+    """
+    source = source or YahooSource()
+    limiter = RateLimiter(rate, sleep=sleep)
+    pending: queue.Queue = queue.Queue(maxsize=max(1, workers) * 2)
+    stats = {"saved": 0, "skipped": 0, "failed": []}
+
+    def writer():
+        db = session_factory()
+        repo = ArtifactRepository(db)
+        try:
+            while (snapshots := pending.get()) is not None:
+                try:
+                    saved, skipped = write_snapshots(repo, snapshots)
+                except Exception as e:
+                    # Keep draining: fetch threads must never block on a dead writer.
+                    db.rollback()
+                    print(f"[{snapshots[0].company.ticker}] Write error: {e}")
+                    continue
+                stats["saved"] += saved
+                stats["skipped"] += skipped
+        finally:
+            db.close()
+
+    write_thread = threading.Thread(target=writer, name="snapshot-writer")
+    write_thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="snapshot-fetch") as pool:
+            futures = {
+                pool.submit(fetch_ticker, source, ticker, limiter, retries, backoff, sleep): ticker
+                for ticker in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    fin, info = future.result()
+                    snapshots = snapshots_from_financials(ticker, fin, info, max_quarters)
+                except Exception as e:
+                    print(f"[{ticker}] Fetch error: {e}")
+                    stats["failed"].append(ticker)
+                    continue
+                if snapshots:
+                    pending.put(snapshots)
+    finally:
+        pending.put(None)
+        write_thread.join()
+    return stats
+
+
+def load_file(path: str, session_factory=SessionLocal) -> dict:
+    """Offline path: snapshots from a Parquet/Arrow/CSV file (see columnar_import_service). No network."""
+    db = session_factory()
+    try:
+        stats = ColumnarImportService(ArtifactRepository(db)).load_snapshots(path)
+    finally:
+        db.close()
+    for e in stats["errors"]:
+        print(f"  ! row {e['row']}: {e['error']}")
+    return stats
+
+
 def main(
     tickers: list[str] | None = None,
     max_quarters: int = MAX_QUARTERS,
     clear_first: bool = False,
+    workers: int = WORKERS,
+    rate: float = RATE_LIMIT,
+    retries: int = RETRIES,
+    from_file: str | None = None,
 ):
     tickers = tickers or DEFAULT_TICKERS
-    db = SessionLocal()
-    repo = ArtifactRepository(db)
 
     if clear_first:
+        db = SessionLocal()
         clear_all_data(db)
+        db.close()
         print("Cleared all artifacts, lifecycle events, proposals, cadence, and observed returns.\n")
 
-    saved = 0
-    skipped = 0
-
-    for ticker in tickers:
-        try:
-            snapshots = build_snapshots_from_yahoo(ticker, max_quarters=max_quarters)
-        except Exception as e:
-            print(f"[{ticker}] Fetch error: {e}")
-            continue
-
-        for s in snapshots:
-            sid = str(s.metadata.snapshot_id)
-            if repo.get(sid) is not None:
-                skipped += 1
-                continue
-            try:
-                repo.save(s)
-                saved += 1
-                print(f"  + {ticker} {s.metadata.as_of.date()} (revenue={s.financials.revenue_fy})")
-            except Exception as e:
-                print(f"  ! {ticker} {s.metadata.as_of.date()} save error: {e}")
+    if from_file:
+        stats = load_file(from_file)
+        print(
+            f"\nDone: {stats['rows']} rows, {stats['saved']} saved, "
+            f"{stats['skipped']} skipped (already exist), {stats['invalid']} invalid."
+        )
+        return
 
-    db.close()
-    print(f"\nDone: {saved} saved, {skipped} skipped (already exist).")
+    stats = ingest(tickers, max_quarters=max_quarters, workers=workers, rate=rate, retries=retries)
+    failed = f", {len(stats['failed'])} ticker(s) failed" if stats["failed"] else ""
+    print(f"\nDone: {stats['saved']} saved, {stats['skipped']} skipped (already exist){failed}.")
 
 
 if __name__ == "__main__":
@@ -241,11 +407,21 @@ if __name__ == "__main__":
     p.add_argument("-q", "--quarters", type=int, default=MAX_QUARTERS, help="Max quarters per ticker")
     p.add_argument("--next-quarter", action="store_true", help="Fetch only the latest quarter per ticker (same as -q 1). Use with one ticker to add the next quarter for that company.")
     p.add_argument("--clear", action="store_true", help="Remove all data first (artifacts, lifecycle, proposals)")
+    p.add_argument("-w", "--workers", type=int, default=WORKERS, help=f"Tickers fetched concurrently (default {WORKERS}; 1 = sequential)")
+    p.add_argument("--rate", type=float, default=RATE_LIMIT, help=f"Max Yahoo calls per second across all workers (default {RATE_LIMIT}; 0 = unlimited)")
+    p.add_argument("--retries", type=int, default=RETRIES, help=f"Retries per failed Yahoo call, with exponential backoff (default {RETRIES})")
+    p.add_argument("--from-file", metavar="PATH", help="Load snapshots from a .parquet/.arrow/.csv file instead of Yahoo (columns as in the snapshots export; no network)")
     args = p.parse_args()
+    if args.from_file and args.tickers:
+        p.error("pass tickers or --from-file, not both")
     tickers = args.tickers or DEFAULT_TICKERS
     max_quarters = 1 if args.next_quarter else args.quarters
     main(
         tickers=tickers,
         max_quarters=max_quarters,
         clear_first=args.clear,
+        workers=args.workers,
+        rate=args.rate,
+        retries=args.retries,
+        from_file=args.from_file,
     )
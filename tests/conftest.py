@@ -2,13 +2,36 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from api.report_cache import fragment_cache, report_cache
 from core.repositories.artifact_repository import ArtifactRepository
 from core.repositories.lifecycle_repository import BeliefLifecycleRepository
+from core.services.llm_cache import LLMCache, reset_llm_cache
+from core.services.llm_context import snapshot_context_cache
 from db.models.proposal import ProposalORM  # noqa: F401
 from db.session import Base
 from tests.fixtures.snapshot_factory import snapshot_factory  # noqa: F401
 
 
+@pytest.fixture(autouse=True)
+def _clear_report_cache():
+    # Report, fragment and snapshot-line caches are process-wide; test databases must not share entries.
+    report_cache.clear()
+    fragment_cache.clear()
+    snapshot_context_cache.clear()
+    yield
+    report_cache.clear()
+    fragment_cache.clear()
+    snapshot_context_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_llm_cache():
+    # Never read or write the on-disk LLM cache from tests.
+    reset_llm_cache(LLMCache(path=":memory:"))
+    yield
+    reset_llm_cache()
+
+
 @pytest.fixture(scope="function")
 def db_session():
 
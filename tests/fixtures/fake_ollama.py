@@ -0,0 +1,77 @@
+"""In-process Ollama fakes for client and route tests (httpx.MockTransport)."""
+import asyncio
+import json
+
+import httpx
+
+from core.services.ollama_client import CircuitBreaker, OllamaClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeOllama:
+    """
+    httpx.MockTransport handler; `up` toggles the backend, `delay` slows /api/generate.
+    Blocking generations return `response`; streamed ones return `tokens` (default: `response`
+    in 8-character pieces) as NDJSON chunks, `token_delay` apart, then `stream_error` if set.
+    `streamed` counts chunks actually sent, so a reader that stops early sends fewer.
+    """
+
+    def __init__(
+        self,
+        delay: float = 0.0,
+        tokens=None,
+        stream_error: str | None = None,
+        response: str = "ok",
+        token_delay: float = 0.0,
+    ):
+        self.up = True
+        self.response = response
+        self.delay = delay
+        self.tokens = tokens
+        self.stream_error = stream_error
+        self.token_delay = token_delay
+        self.tags = 0
+        self.generates = 0
+        self.streamed = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if not self.up:
+            raise httpx.ConnectError("down", request=request)
+        if request.url.path == "/api/tags":
+            self.tags += 1
+            return httpx.Response(200, json={"models": []})
+        self.generates += 1
+        await asyncio.sleep(self.delay)
+        if json.loads(request.content).get("stream"):
+            tokens = self.tokens
+            if tokens is None:
+                tokens = [self.response[i:i + 8] for i in range(0, len(self.response), 8)]
+            lines = [{"response": t, "done": False} for t in tokens]
+            lines.append({"error": self.stream_error} if self.stream_error else {"response": "", "done": True})
+            return httpx.Response(200, content=self._stream(lines))
+        return httpx.Response(200, json={"response": self.response, "done": True})
+
+    async def _stream(self, lines):
+        for line in lines:
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            self.streamed += 1
+            yield (json.dumps(line) + "\n").encode("utf-8")
+
+
+def ollama_client(fake, clock, probe_ttl=30, threshold=2, cooldown=10, limiter=None):
+    return OllamaClient(
+        base_url="http://ollama.test",
+        probe_ttl=probe_ttl,
+        breaker=CircuitBreaker(threshold=threshold, cooldown=cooldown, clock=clock),
+        limiter=limiter,
+        transport=httpx.MockTransport(fake),
+        clock=clock,
+    )
@@ -0,0 +1,54 @@
+"""Local stand-in for YahooSource (scripts/import_snapshots.py): deterministic frames, no network."""
+import threading
+import time
+
+import pandas as pd
+
+
+class FakeYahoo:
+    """
+    Same interface as YahooSource. Each ticker has `quarters` quarterly columns; `delay` slows
+    every call, `failures[ticker]` calls fail before it answers, tickers in `missing` have no
+    financials. Records call times and the peak number of calls in flight.
+    """
+
+    def __init__(self, quarters: int = 4, delay: float = 0.0, failures: dict | None = None, missing=()):
+        self.quarters = quarters
+        self.delay = delay
+        self.failures = dict(failures or {})
+        self.missing = set(missing)
+        self.calls: list[tuple[str, str, float]] = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _call(self, kind: str, ticker: str) -> None:
+        with self._lock:
+            self.calls.append((kind, ticker, time.monotonic()))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            failing = self.failures.get(ticker, 0) > 0
+            if failing:
+                self.failures[ticker] -= 1
+        try:
+            time.sleep(self.delay)
+            if failing:
+                raise ConnectionError(f"{ticker}: rate limited")
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def quarterly_financials(self, ticker: str):
+        self._call("financials", ticker)
+        if ticker in self.missing:
+            return pd.DataFrame()
+        periods = pd.date_range("2023-03-31", periods=self.quarters, freq="QE")[::-1]
+        base = 1000 + 10 * len(ticker)
+        return pd.DataFrame(
+            {p: [base + i, (base + i) / 5, (base + i) / 10] for i, p in enumerate(periods)},
+            index=["Total Revenue", "Operating Income", "Net Income"],
+        )
+
+    def info(self, ticker: str) -> dict:
+        self._call("info", ticker)
+        return {"longName": f"{ticker} Corp", "sector": "Technology", "currency": "USD", "exchange": "NMS"}
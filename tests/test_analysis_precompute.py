@@ -0,0 +1,250 @@
+"""Background analysis precompute: low priority, stored per snapshot set, served on the belief page."""
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.deps import get_db
+from api.routes.llm import get_llm
+from core.repositories.artifact_repository import ArtifactRepository
+from core.repositories.lifecycle_repository import BeliefLifecycleRepository
+from core.repositories.proposal_repository import ProposalRepository
+from core.services.analysis_precompute import AnalysisPrecomputer
+from core.services.llm_service import LLMNotConfigured, LLMService
+from core.services.ollama_client import ConcurrencyLimiter
+from core.services.proposal_engine import ProposalEngine
+from db.session import Base
+from main import app
+from tests.fixtures.artifact_factory import reasoning_artifact_factory
+from tests.fixtures.fake_ollama import FakeClock, FakeOllama, ollama_client
+from tests.fixtures.snapshot_factory import make_snapshot
+
+ANALYSIS = {
+    "delta_summary": "Revenue rose against the referenced quarter.",
+    "potential_tensions": ["Margin assumption"],
+    "questions_raised": [],
+}
+
+
+def _stale_belief_db(engine=None, extra_beliefs=0):
+    if engine is None:
+        engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    repo = ArtifactRepository(db)
+    old_id = uuid4()
+    repo.save(make_snapshot(
+        snapshot_id=old_id,
+        as_of=(datetime.now(UTC) - timedelta(days=40)).strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+        company={"ticker": "ACME"},
+    ))
+    repo.save(make_snapshot(
+        snapshot_id=uuid4(),
+        as_of=(datetime.now(UTC) + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+        company={"ticker": "ACME"},
+    ))
+    belief = reasoning_artifact_factory(snapshot_ids=[old_id], statement="Margins may expand.")
+    repo.save(belief)
+    for i in range(extra_beliefs):
+        repo.save(reasoning_artifact_factory(snapshot_ids=[old_id], statement=f"Belief {i} may hold."))
+    db.close()
+    return session_factory, str(belief.reasoning_id)
+
+
+def test_review_prompt_precomputes_analysis_shown_on_belief_page():
+    session_factory, belief_id = _stale_belief_db()
+    fake = FakeOllama(response=json.dumps(ANALYSIS))
+    llm = LLMService(client=ollama_client(fake, FakeClock()))
+    precomputer = AnalysisPrecomputer(llm=llm, session_factory=session_factory)
+
+    async def run():
+        precomputer.bind(asyncio.get_running_loop())
+        db = session_factory()
+        engine = ProposalEngine(
+            ArtifactRepository(db),
+            BeliefLifecycleRepository(db),
+            ProposalRepository(db),
+            on_review_prompt=lambda payload: precomputer.submit(payload["belief_id"]),
+        )
+        await asyncio.to_thread(engine.evaluate)
+        db.close()
+        await asyncio.sleep(0)
+        await precomputer.drain()
+
+    asyncio.run(run())
+    assert precomputer.stats()["completed"] == 1
+    assert fake.generates == 1
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        html = TestClient(app).get(f"/beliefs/{belief_id}").text
+    finally:
+        app.dependency_overrides.clear()
+    assert ANALYSIS["delta_summary"] in html
+    assert "precomputed" in html
+    assert "Re-analyze" in html
+
+
+def test_user_calls_are_served_before_queued_background_work():
+    limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=4)
+    order = []
+
+    async def job(name, background):
+        async with limiter.slot(background=background):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        holder = asyncio.create_task(job("running", False))
+        await asyncio.sleep(0)
+        background = asyncio.create_task(job("background", True))
+        await asyncio.sleep(0)
+        user = asyncio.create_task(job("user", False))
+        await asyncio.gather(holder, background, user)
+
+    asyncio.run(run())
+    assert order == ["running", "user", "background"]
+    assert limiter.active == 0
+
+
+def test_llm_routes_return_db_connection_before_generating(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", connect_args={"check_same_thread": False})
+    session_factory, belief_id = _stale_belief_db(engine)
+    db = session_factory()
+    ProposalEngine(ArtifactRepository(db), BeliefLifecycleRepository(db), ProposalRepository(db)).evaluate()
+    proposal_id = ProposalRepository(db).list_pending_by_type("review_prompt")[0].proposal_id
+    db.close()
+
+    fake = FakeOllama(response=json.dumps(ANALYSIS))
+    checked_out = []
+
+    async def handler(request):
+        if request.url.path == "/api/generate":
+            checked_out.append(engine.pool.checkedout())
+        return await fake(request)
+
+    client = ollama_client(fake, FakeClock())
+    client._transport = httpx.MockTransport(handler)
+    llm = LLMService(client=client)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_llm] = lambda: llm
+    try:
+        test_client = TestClient(app)
+        assert test_client.post(f"/api/llm/analyze-belief/{belief_id}").status_code == 200
+        assert test_client.post("/api/llm/draft-belief-from-id", json={"belief_id": belief_id}).status_code == 200
+        r = test_client.post("/api/llm/explain-proposal", json={
+            "proposal_type": "review_prompt", "belief_text": "Margins may expand.", "proposal_id": proposal_id,
+        })
+        assert r.status_code == 200 and "newer snapshot(s) dated ACME" in r.json()["text"]
+        r = test_client.post("/api/llm/explain-proposal/stream?refresh=true", json={
+            "proposal_type": "review_prompt", "belief_text": "Margins may expand.", "proposal_id": proposal_id,
+        })
+        assert "event: done" in r.text
+    finally:
+        app.dependency_overrides.clear()
+    assert checked_out == [0, 0, 0, 0]
+
+
+def test_analyze_stale_runs_all_beliefs_concurrently_and_stores_results():
+    session_factory, _ = _stale_belief_db(extra_beliefs=5)
+    fake = FakeOllama(response=json.dumps(ANALYSIS), delay=0.05)
+    in_flight = [0, 0]  # current, peak
+
+    async def handler(request):
+        if request.url.path != "/api/generate":
+            return await fake(request)
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        try:
+            return await fake(request)
+        finally:
+            in_flight[0] -= 1
+
+    client = ollama_client(fake, FakeClock(), limiter=ConcurrencyLimiter(max_concurrency=4, max_queue=4))
+    client._transport = httpx.MockTransport(handler)
+    llm = LLMService(client=client)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            r = await http.post("/api/llm/analyze-stale")
+            assert r.status_code == 202
+            job = r.json()
+            assert job["total"] == 6
+            events = (await http.get(job["events_url"])).text
+            status = (await http.get(job["status_url"])).json()
+            again = (await http.post("/api/llm/analyze-stale")).json()
+            await (await http.get(again["events_url"])).aread()
+            repeat = (await http.get(again["status_url"])).json()
+            missing = await http.get("/api/llm/analyze-stale/nope")
+        return events, status, repeat, missing
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_llm] = lambda: llm
+    try:
+        events, status, repeat, missing = asyncio.run(run())
+    finally:
+        app.dependency_overrides.clear()
+    assert "event: progress" in events and "event: done" in events
+    assert status["status"] == "done"
+    assert status["counts"]["done"] == 6
+    assert fake.generates == 6
+    assert in_flight[1] == 4
+    # Second run finds every result stored against the same snapshot sets.
+    assert repeat["counts"]["stored"] == 6
+    assert missing.status_code == 404
+
+
+def test_analyze_belief_returns_503_when_backend_drops_after_the_check():
+    session_factory, belief_id = _stale_belief_db()
+    fake = FakeOllama(response=json.dumps(ANALYSIS))
+    llm = LLMService(client=ollama_client(fake, FakeClock()))
+
+    async def backend_gone(*args, **kwargs):
+        raise LLMNotConfigured("Ollama is not reachable")
+
+    llm.analyze_belief_changes = backend_gone  # probe passed in the route, then the breaker opened
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_llm] = lambda: llm
+    try:
+        r = TestClient(app).post(f"/api/llm/analyze-belief/{belief_id}")
+    finally:
+        app.dependency_overrides.clear()
+    assert r.status_code == 503
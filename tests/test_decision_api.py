@@ -1,7 +1,7 @@
 """Decision API: record decision, list decisions, no belief mutation."""
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -198,3 +198,72 @@ def test_reports_trajectories(client):
     assert data["trajectories"][0]["belief_id"] == belief_id
     assert data["trajectories"][0]["trajectory"] == "stable"
     assert data["trajectories"][0]["sequence"] == ["reinforced"]
+
+
+def test_reports_durability_survival_censors_only_reinforced(client):
+    """GET /api/reports/durability/survival keeps only-reinforced beliefs as censored, not dropped."""
+    test_client, belief_id, _ = client
+    test_client.post(
+        f"/api/beliefs/{belief_id}/decision",
+        json={"type": "reinforced"},
+    )
+    r = test_client.get("/api/reports/durability/survival")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["n"] == 1
+    assert data["events"] == 0
+    assert data["censored"] == 1
+    assert data["median_days"] is None
+    assert data["curve"] == []
+    assert len(data["cohorts"]) == 1
+
+
+def test_reports_etag_not_modified_until_new_decision(client):
+    """Report ETag is stable while data is unchanged (304), and changes after an append."""
+    test_client, belief_id, _ = client
+    first = test_client.get("/api/reports/tension-density")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = test_client.get("/api/reports/tension-density", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+    test_client.post(
+        f"/api/beliefs/{belief_id}/decision",
+        json={"type": "strong_tension"},
+    )
+    after = test_client.get("/api/reports/tension-density", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["etag"] != etag
+    assert after.json()["strong_tension_count"] == 1
+
+
+def test_observed_outcomes_query_count_is_constant(client):
+    """observed-outcomes issues the same number of SELECTs for 1 belief as for 6."""
+    test_client, belief_id, session_factory = client
+    engine = session_factory.kw["bind"]
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.strip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    test_client.get("/api/reports/observed-outcomes?format=csv")
+    baseline = len(statements)
+
+    db = session_factory()
+    for i in range(5):
+        ArtifactRepository(db).save(reasoning_artifact_factory(statement=f"Belief {i}", snapshot_ids=[]))
+    db.close()
+    test_client.post(f"/api/beliefs/{belief_id}/decision", json={"type": "revised"})
+
+    statements.clear()
+    r = test_client.get("/api/reports/observed-outcomes?format=csv")
+    assert r.status_code == 200
+    assert len(statements) == baseline
+
+    lines = r.text.strip().splitlines()
+    assert lines[0].startswith("belief_id,belief_text_snippet")
+    assert len(lines) == 7
+    assert any(belief_id in line and "revised" in line for line in lines[1:])
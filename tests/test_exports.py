@@ -0,0 +1,77 @@
+"""Columnar export: typed Parquet/Arrow output of the decision log and snapshots."""
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.deps import get_db
+from core.repositories.artifact_repository import ArtifactRepository
+from db.session import Base
+from main import app
+from tests.fixtures.artifact_factory import reasoning_artifact_factory
+from tests.fixtures.snapshot_factory import make_snapshot
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(bind=engine)
+
+    db = TestingSessionLocal()
+    artifact_repo = ArtifactRepository(db)
+    belief = reasoning_artifact_factory(snapshot_ids=[])
+    artifact_repo.save(belief)
+    artifact_repo.save(make_snapshot(revenue_fy=1234.5))
+    db.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield TestClient(app), str(belief.reasoning_id)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_export_decisions_parquet_typed(client):
+    test_client, belief_id = client
+    test_client.post(f"/api/beliefs/{belief_id}/decision", json={"type": "slight_tension", "rationale": "r"})
+    r = test_client.get("/api/export/decisions.parquet")
+    assert r.status_code == 200
+    table = pq.read_table(io.BytesIO(r.content))
+    assert table.num_rows == 1
+    assert table.schema.field("occurred_at").type == pa.timestamp("us", tz="UTC")
+    row = table.to_pylist()[0]
+    assert row["belief_id"] == belief_id
+    assert row["event_kind"] == "decision"
+    assert row["decision_type"] == "slight_tension"
+
+
+def test_export_snapshots_numeric_columns(client):
+    test_client, _ = client
+    r = test_client.get("/api/export/snapshots.arrow")
+    assert r.status_code == 200
+    table = pa.ipc.open_stream(r.content).read_all()
+    assert table.schema.field("revenue_fy").type == pa.float64()
+    assert table.column("revenue_fy").to_pylist() == [1234.5]
+    assert table.column("quarterly_revenue").to_pylist() == [[20.0, 22.0, 24.0, 26.0]]
+
+
+def test_export_unknown_file_404(client):
+    test_client, _ = client
+    assert test_client.get("/api/export/beliefs.csv").status_code == 404
@@ -0,0 +1,143 @@
+"""Snapshot ingestion: Yahoo pipeline against a local fake source, and the offline file loader."""
+from decimal import Decimal
+from uuid import uuid5
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.exceptions import ArtifactConflictError
+from core.repositories.artifact_repository import ArtifactRepository
+from core.services.columnar_export_service import (
+    SNAPSHOT_SCHEMA,
+    ColumnarExportService,
+    write_columnar,
+)
+from core.services.columnar_import_service import ColumnarImportService
+from db.session import Base
+from scripts.import_snapshots import NAMESPACE_SNAPSHOT, RateLimiter, ingest
+from tests.fixtures.fake_yahoo import FakeYahoo
+from tests.fixtures.snapshot_factory import make_snapshot
+
+
+def _session_factory():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def test_ingest_fetches_concurrently_and_skips_existing_snapshots():
+    session_factory = _session_factory()
+    source = FakeYahoo(quarters=4, delay=0.05)
+    tickers = ["MSFT", "AMZN", "JPM", "NVDA"]
+
+    stats = ingest(tickers, source=source, session_factory=session_factory, workers=4, rate=0, retries=0)
+    assert stats == {"saved": 16, "skipped": 0, "failed": []}
+    assert source.peak == 4
+
+    db = session_factory()
+    snapshots = ArtifactRepository(db).list_by_type("StockSnapshot")
+    db.close()
+    assert {s.company.ticker for s in snapshots} == set(tickers)
+    msft = max((s for s in snapshots if s.company.ticker == "MSFT"), key=lambda s: s.metadata.as_of)
+    assert msft.metadata.snapshot_id == uuid5(NAMESPACE_SNAPSHOT, "MSFT_2023-12-31")
+    assert msft.company.company_name == "MSFT Corp"
+
+    again = ingest(tickers, source=FakeYahoo(), session_factory=session_factory, workers=2, rate=0)
+    assert again == {"saved": 0, "skipped": 16, "failed": []}
+
+
+def test_ingest_retries_with_backoff_and_reports_failed_tickers():
+    session_factory = _session_factory()
+    source = FakeYahoo(quarters=2, failures={"AMZN": 2, "JPM": 5}, missing={"XXXX"})
+    sleeps = []
+
+    stats = ingest(
+        ["AMZN", "JPM", "XXXX"], source=source, session_factory=session_factory,
+        workers=3, rate=0, retries=2, backoff=1.0, sleep=sleeps.append,
+    )
+    assert stats == {"saved": 2, "skipped": 0, "failed": ["JPM"]}
+    assert sorted(sleeps) == [1.0, 1.0, 2.0, 2.0]
+    # No financials: info is never requested.
+    assert [kind for kind, ticker, _ in source.calls if ticker == "XXXX"] == ["financials"]
+
+
+def test_rate_limiter_spaces_calls_across_threads():
+    now = [10.0]
+    waits = []
+    limiter = RateLimiter(rate=4, clock=lambda: now[0], sleep=waits.append)
+    for _ in range(4):
+        limiter.acquire()
+    assert waits == [0.25, 0.5, 0.75]
+    now[0] = 20.0
+    limiter.acquire()
+    assert waits == [0.25, 0.5, 0.75]
+
+
+def test_file_loader_validates_in_chunks_and_skips_existing(tmp_path):
+    session_factory = _session_factory()
+    path = tmp_path / "quarters.parquet"
+    pq.write_table(pa.table({
+        "ticker": ["MSFT", "MSFT", "AMZN", None, "MSFT"],
+        "as_of": ["2023-12-31", "2024-03-31", "2024-03-31", "2024-03-31", "2023-12-31"],
+        "revenue_fy": [1000.0, 1100.0, 900.0, 1.0, 1000.0],
+        "operating_income": [200.0, None, 90.0, None, 200.0],
+    }), path)
+
+    db = session_factory()
+    service = ColumnarImportService(ArtifactRepository(db))
+    stats = service.load_snapshots(str(path), chunk_rows=2)
+    assert {k: stats[k] for k in ("rows", "saved", "skipped", "invalid")} == {"rows": 5, "saved": 3, "skipped": 1, "invalid": 1}
+    assert stats["errors"][0]["row"] == 4
+
+    msft = ArtifactRepository(db).get(str(uuid5(NAMESPACE_SNAPSHOT, "MSFT_2023-12-31")))
+    assert msft.financials.revenue_fy == Decimal("1000.0")
+    assert msft.financials.operating_margin_fy == Decimal("20")
+    assert msft.financials.quarterly_revenue == [Decimal("1000.0")]
+    assert msft.metadata.data_sources == ["File import: quarters.parquet"]
+
+    again = service.load_snapshots(str(path))
+    assert (again["saved"], again["skipped"]) == (0, 4)
+    db.close()
+
+
+def test_file_loader_reads_csv_and_reports_invalid_values(tmp_path):
+    path = tmp_path / "quarters.csv"
+    path.write_text(
+        "ticker,period_end,revenue_fy,currency\n"
+        "JPM,2024-06-30,500.5,USD\n"
+        "JPM,2024-09-30,oops,USD\n"
+    )
+    db = _session_factory()()
+    stats = ColumnarImportService(ArtifactRepository(db)).load_snapshots(str(path))
+    assert (stats["saved"], stats["invalid"]) == (1, 1)
+    assert stats["errors"][0]["row"] == 2
+    jpm = ArtifactRepository(db).get(str(uuid5(NAMESPACE_SNAPSHOT, "JPM_2024-06-30")))
+    assert jpm.market_state.currency == "USD"
+
+    with pytest.raises(ValueError, match="unsupported file type"):
+        ColumnarImportService(ArtifactRepository(db)).load_snapshots(str(tmp_path / "quarters.xlsx"))
+    db.close()
+
+
+def test_snapshot_export_loads_back_with_the_yahoo_ids(tmp_path):
+    # Yahoo-style snapshot: quarter end (UTC midnight) stored as IST, id from ticker + period end.
+    snapshot_id = uuid5(NAMESPACE_SNAPSHOT, "MSFT_2024-03-31")
+    source_db = _session_factory()()
+    ArtifactRepository(source_db).save(make_snapshot(snapshot_id=snapshot_id, company={"ticker": "MSFT"}))
+    path = tmp_path / "snapshots.parquet"
+    write_columnar(str(path), ColumnarExportService(ArtifactRepository(source_db), None).snapshot_records(), SNAPSHOT_SCHEMA)
+    source_db.close()
+
+    db = _session_factory()()
+    stats = ColumnarImportService(ArtifactRepository(db)).load_snapshots(str(path))
+    assert stats["saved"] == 1
+    loaded = ArtifactRepository(db).get(str(snapshot_id))
+    assert loaded.company.ticker == "MSFT"
+    assert loaded.metadata.data_sources == ["seed_script"]
+    with pytest.raises(ArtifactConflictError):
+        ArtifactRepository(db).save_many([loaded])
+    db.close()
@@ -0,0 +1,517 @@
+"""Ollama client: pooled async client, cached availability probe, circuit breaker, bounded queue; LLM cache; SSE."""
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from api.deps import get_db
+from api.routes.llm import get_llm
+from core.services.llm_cache import LLMCache
+from core.services.llm_service import LLMService
+from core.services.ollama_client import CircuitBreaker, ConcurrencyLimiter, LLMBusy, OllamaClient
+from core.services.single_flight import SingleFlight
+from main import app
+from tests.fixtures.fake_ollama import FakeClock, FakeOllama
+from tests.fixtures.fake_ollama import ollama_client as _client
+
+
+def test_probe_is_cached_for_ttl():
+    fake, clock = FakeOllama(), FakeClock()
+    llm = LLMService(client=_client(fake, clock))
+
+    async def run():
+        for _ in range(5):
+            assert await llm.is_available()
+        assert fake.tags == 1
+        clock.now = 31
+        assert await llm.is_available()
+        assert fake.tags == 2
+
+    asyncio.run(run())
+
+
+def test_breaker_opens_after_failures_and_recovers_after_cooldown():
+    fake, clock = FakeOllama(), FakeClock()
+    client = _client(fake, clock, probe_ttl=0, threshold=2, cooldown=10)
+
+    async def run():
+        fake.up = False
+        assert not await client.available()
+        assert not await client.available()
+        assert client.breaker.state == "open"
+        fake.up = True
+        assert not await client.available()  # open breaker: no network
+        assert fake.tags == 0
+
+        clock.now = 11
+        assert client.breaker.state == "half_open"
+        assert await client.available()
+        assert client.breaker.state == "closed"
+
+    asyncio.run(run())
+
+
+def test_generation_failure_counts_against_breaker():
+    fake, clock = FakeOllama(), FakeClock()
+    client = _client(fake, clock, threshold=1)
+
+    async def run():
+        assert await client.available()
+        fake.up = False
+        with pytest.raises(httpx.ConnectError):
+            await client.generate({"prompt": "x"})
+        assert client.breaker.state == "open"
+        assert not await client.available()
+
+    asyncio.run(run())
+
+
+def test_limiter_rejects_beyond_queue_depth_and_releases_on_cancel():
+    limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1)
+
+    async def hold(event):
+        async with limiter.slot():
+            await event.wait()
+
+    async def run():
+        release = asyncio.Event()
+        running = asyncio.create_task(hold(release))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(hold(release))
+        await asyncio.sleep(0)
+        assert (limiter.active, limiter.waiting) == (1, 1)
+        with pytest.raises(LLMBusy):
+            async with limiter.slot():
+                pass
+        queued.cancel()  # client went away while queued
+        await asyncio.sleep(0)
+        assert limiter.waiting == 0
+        release.set()
+        await running
+        assert limiter.active == 0
+
+    asyncio.run(run())
+
+
+def test_queue_overflow_returns_429_while_other_requests_proceed():
+    fake, clock = FakeOllama(delay=0.2), FakeClock()
+    llm = LLMService(client=_client(fake, clock, limiter=ConcurrencyLimiter(max_concurrency=1, max_queue=0)))
+    app.dependency_overrides[get_llm] = lambda: llm
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://app") as http:
+            first = asyncio.create_task(http.post(
+                "/api/llm/draft-belief", json={"statement": "Margins may expand.", "artifact_type": "thesis"}
+            ))
+            await asyncio.sleep(0.05)
+            # A different prompt: an identical one would join the first generation instead.
+            second = await http.post(
+                "/api/llm/draft-belief", json={"statement": "Debt may fall.", "artifact_type": "thesis"}
+            )
+            return (await first), second
+
+    try:
+        first, second = asyncio.run(run())
+    finally:
+        app.dependency_overrides.clear()
+    assert first.status_code == 200
+    assert first.json()["text"] == "ok"
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "5"
+
+
+def _sse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = "token", ""
+        for line in block.split("\n"):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data += line[len("data: "):]
+        events.append((event, json.loads(data)))
+    return events
+
+
+def _stream_explain(fake):
+    llm = LLMService(client=_client(fake, FakeClock()))
+    app.dependency_overrides[get_llm] = lambda: llm
+    app.dependency_overrides[get_db] = lambda: None  # no proposal_id: the prefix lookup never reads
+    try:
+        return TestClient(app).post(
+            "/api/llm/explain-proposal/stream",
+            json={"proposal_type": "review_prompt", "belief_text": "Margins may expand."},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_explain_stream_relays_tokens_as_server_sent_events():
+    r = _stream_explain(FakeOllama(tokens=("Newer ", "data ", "arrived.")))
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(r.text)
+    assert events[0][0] == "meta"
+    assert events[0][1]["attribution"].startswith("LLM Structural Explanation")
+    assert [d["token"] for e, d in events if e == "token"] == ["Newer ", "data ", "arrived."]
+    assert events[-1] == ("done", {"text": "Newer data arrived."})
+
+
+def test_stream_failure_after_first_token_ends_with_error_event():
+    r = _stream_explain(FakeOllama(tokens=("Partial",), stream_error="model crashed"))
+    assert r.status_code == 200
+    events = _sse_events(r.text)
+    assert ("token", {"token": "Partial"}) in events
+    assert events[-1][0] == "error"
+    assert "model crashed" in events[-1][1]["detail"]
+
+
+def test_cache_expires_after_ttl_and_evicts_least_recently_used():
+    clock = FakeClock()
+    cache = LLMCache(path=":memory:", ttl=100, max_entries=2, clock=clock)
+    cache.set("a", "m", "A", "2026-01-01T00:00:00Z")
+    cache.set("b", "m", "B", "2026-01-01T00:00:00Z")
+    clock.now = 1
+    assert cache.get("a")["text"] == "A"  # a is now more recently used than b
+    cache.set("c", "m", "C", "2026-01-01T00:00:00Z")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    clock.now = 101
+    assert cache.get("a") is None  # expired
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["evictions"] == 2
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+def test_cached_answer_skips_ollama_and_keeps_original_generated_at():
+    fake, clock = FakeOllama(), FakeClock()
+    llm = LLMService(client=_client(fake, clock), cache=LLMCache(path=":memory:"))
+
+    async def run():
+        first = await llm.explain_proposal_trigger("review_prompt", "Margins may expand.")
+        await asyncio.sleep(1.1)  # generated_at has one-second resolution
+        second = await llm.explain_proposal_trigger("review_prompt", "Margins may expand.")
+        refreshed = await llm.explain_proposal_trigger("review_prompt", "Margins may expand.", refresh=True)
+        return first, second, refreshed
+
+    first, second, refreshed = asyncio.run(run())
+    assert not first.cached
+    assert second.cached
+    assert second.text == first.text
+    assert second.generated_at == first.generated_at
+    assert not refreshed.cached
+    assert fake.generates == 2
+    assert llm.cache.stats()["bypassed"] == 1
+
+
+def test_completed_stream_is_cached_for_blocking_and_streaming_callers():
+    fake = FakeOllama(tokens=("Newer ", "data."))
+    llm = LLMService(client=_client(fake, FakeClock()), cache=LLMCache(path=":memory:"))
+
+    async def run():
+        streamed = [t async for t in llm.stream_proposal_explanation("review_prompt", "Margins may expand.")]
+        blocking = await llm.explain_proposal_trigger("review_prompt", "Margins may expand.")
+        replay = llm.stream_proposal_explanation("review_prompt", "Margins may expand.")
+        return streamed, blocking, [t async for t in replay], replay
+
+    streamed, blocking, replayed, replay = asyncio.run(run())
+    assert streamed == ["Newer ", "data."]
+    assert blocking.cached and blocking.text == "Newer data."
+    assert replayed == ["Newer data."] and replay.cached
+    assert fake.generates == 1
+
+
+def test_identical_concurrent_calls_share_one_generation():
+    fake = FakeOllama(delay=0.1)
+    llm = LLMService(client=_client(fake, FakeClock()), cache=LLMCache(path=":memory:", enabled=False))
+
+    async def run():
+        calls = [llm.analyze_belief_changes("Margins may expand.", "2026-01-01", "prev", "new") for _ in range(3)]
+        return await asyncio.gather(*calls)
+
+    results = asyncio.run(run())
+    assert fake.generates == 1
+    assert results[0] == results[1] == results[2]
+    assert llm.flights.stats() == {"started": 1, "coalesced": 2, "in_flight": 0}
+
+
+def test_cancelled_caller_does_not_cancel_shared_generation():
+    fake = FakeOllama(delay=0.1)
+    llm = LLMService(client=_client(fake, FakeClock()), cache=LLMCache(path=":memory:", enabled=False))
+
+    async def run():
+        first = asyncio.create_task(llm.explain_proposal_trigger("review_prompt", "Margins may expand."))
+        second = asyncio.create_task(llm.explain_proposal_trigger("review_prompt", "Margins may expand."))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()).text == "ok"
+    assert fake.generates == 1
+
+
+def test_concurrent_blocking_and_streamed_calls_do_not_share_a_flight():
+    fake = FakeOllama(delay=0.05, tokens=("Newer ", "data."), response="Newer data.")
+    llm = LLMService(client=_client(fake, FakeClock()), cache=LLMCache(path=":memory:", enabled=False))
+
+    async def collect():
+        return [t async for t in llm.stream_proposal_explanation("review_prompt", "Margins may expand.")]
+
+    async def blocking():
+        return (await llm.explain_proposal_trigger("review_prompt", "Margins may expand.")).text
+
+    async def run(stream_first):
+        first, second = (collect, blocking) if stream_first else (blocking, collect)
+        first_task = asyncio.create_task(first())
+        await asyncio.sleep(0.01)
+        return await asyncio.gather(first_task, second())
+
+    assert asyncio.run(run(True)) == [["Newer ", "data."], "Newer data."]
+    assert asyncio.run(run(False)) == ["Newer data.", ["Newer ", "data."]]
+    assert fake.generates == 4
+    assert llm.flights.coalesced == 0
+
+
+def test_caller_arriving_after_last_waiter_left_starts_a_new_flight():
+    flights = SingleFlight()
+    started = []
+
+    async def work():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return len(started)
+
+    async def run():
+        first = asyncio.create_task(flights.call("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0)  # the cancelled flight's task has not finished yet
+        return await flights.call("k", work)
+
+    assert asyncio.run(run()) == 2
+    assert flights.stats() == {"started": 2, "coalesced": 0, "in_flight": 0}
+
+
+def test_identical_streams_fan_out_from_one_generation():
+    fake = FakeOllama(delay=0.05, tokens=("Newer ", "data."))
+    llm = LLMService(client=_client(fake, FakeClock()), cache=LLMCache(path=":memory:", enabled=False))
+
+    async def collect():
+        return [t async for t in llm.stream_proposal_explanation("review_prompt", "Margins may expand.")]
+
+    async def run():
+        return await asyncio.gather(collect(), collect())
+
+    assert asyncio.run(run()) == [["Newer ", "data."], ["Newer ", "data."]]
+    assert fake.generates == 1
+    assert llm.flights.coalesced == 1
+
+
+def test_fake_ollama_server_streams_blocks_and_injects_errors():
+    from scripts.fake_ollama import create_app
+
+    def client(**options):
+        return OllamaClient(base_url="http://fake", transport=httpx.ASGITransport(app=create_app(**options)))
+
+    async def run():
+        fake = client(max_tokens=5)
+        assert await fake.available()
+        blocking = await fake.generate({"model": "m", "prompt": "p", "stream": False})
+        chunks = [c async for c in fake.stream_generate({"model": "m", "prompt": "p"})]
+        streamed = "".join(c.get("response", "") for c in chunks)
+        assert blocking["response"] == streamed and blocking["eval_count"] == 5
+        assert chunks[-1]["done"] and "eval_duration" in chunks[-1]
+
+        analysis = await fake.generate({"model": "m", "prompt": "p", "stream": False, "format": "json"})
+        assert set(json.loads(analysis["response"])) == {"delta_summary", "potential_tensions", "questions_raised"}
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await client(error_rate=1.0).generate({"model": "m", "prompt": "p", "stream": False})
+
+    asyncio.run(run())
+
+
+def test_bench_reports_latency_percentiles_against_fake_server():
+    from scripts.bench_llm import in_process_client, percentile, run_bench
+
+    assert percentile([5, 1, 4, 2, 3], 50) == 3 and percentile([5, 1, 4, 2, 3], 99) == 5
+
+    async def run():
+        async with in_process_client({"latency": 0.01}, max_concurrency=2, max_queue=100) as client:
+            return await run_bench(client, "draft-belief", requests=6, concurrency=3)
+
+    try:
+        report = asyncio.run(run())
+    finally:
+        app.dependency_overrides.clear()
+    assert report["statuses"] == {200: 6}
+    assert report["p50_ms"] <= report["p95_ms"] <= report["p99_ms"] and report["throughput_rps"] > 0
+
+
+def test_metrics_record_ollama_timings_queue_wait_and_cache_hits_per_method():
+    from scripts.fake_ollama import create_app
+
+    fake = create_app(latency=0.05, max_tokens=4)
+    ollama = OllamaClient(
+        base_url="http://fake",
+        transport=httpx.ASGITransport(app=fake),
+        limiter=ConcurrencyLimiter(max_concurrency=1, max_queue=4),
+    )
+    llm = LLMService(client=ollama, cache=LLMCache(path=":memory:"))
+
+    async def run():
+        await asyncio.gather(
+            llm.draft_refined_belief("Margins may expand.", "thesis"),
+            llm.draft_refined_belief("Churn may fall.", "thesis"),
+        )
+        await llm.draft_refined_belief("Margins may expand.", "thesis")  # cache hit
+        [t async for t in llm.stream_sub_questions("What drives churn?")]
+
+    asyncio.run(run())
+    app.dependency_overrides[get_llm] = lambda: llm
+    try:
+        metrics = TestClient(app).get("/api/llm/metrics").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    draft = metrics["draft_refined_belief"]
+    assert (draft["calls"], draft["cache_hits"], draft["errors"]) == (2, 1, 0)
+    assert draft["fields"]["eval_count"]["mean"] == 4
+    assert draft["fields"]["queue_wait_ms"]["max"] >= 40  # the second call waited for the only slot
+    assert draft["fields"]["wall_ms"]["max"] >= draft["fields"]["queue_wait_ms"]["max"] + 40
+    assert draft["fields"]["prompt_chars"]["p50"] > 0
+    assert metrics["stream_sub_questions"]["calls"] == 1
+    assert "prompt_eval_ms" in metrics["stream_sub_questions"]["fields"]
+
+
+def test_keep_alive_keeps_model_warm_and_metrics_count_cold_loads():
+    from datetime import datetime
+
+    from core.services.llm_metrics import LLMMetrics
+    from core.services.model_warmup import ModelWarmer, in_hours, parse_hours
+    from scripts.fake_ollama import create_app
+
+    fake = create_app(load_time=0.05, max_tokens=2)
+    ollama = OllamaClient(base_url="http://fake", transport=httpx.ASGITransport(app=fake))
+    llm = LLMService(client=ollama, cache=LLMCache(path=":memory:", enabled=False))
+    llm.metrics = LLMMetrics(cold_load_ms=40)
+    warmer = ModelWarmer(client=ollama, keep_alive="10m", cold_load_ms=40)
+
+    async def run():
+        await llm.draft_refined_question("What drives churn?")  # cold: loads the model
+        await llm.draft_refined_question("What drives margins?")  # warm: within keep_alive
+        fake.state.loaded_until = 0  # idle past keep_alive
+        assert await warmer.warm()
+        await llm.draft_refined_question("What drives pricing?")
+
+    asyncio.run(run())
+    calls = llm.metrics.snapshot()["draft_refined_question"]
+    assert (calls["cold"], calls["warm"]) == (1, 2)
+    assert (warmer.pings, warmer.loads) == (1, 1)
+    assert fake.state.stats["loads"] == 2
+    # The ping stays out of the backend's latency metrics: only the three real calls are there.
+    assert ollama.metrics.snapshot()["generate"]["calls"] == 3
+
+    with pytest.warns(RuntimeWarning, match="OLLAMA_WARM_HOURS"):
+        misconfigured = ModelWarmer(client=ollama, hours="8-19")
+    assert misconfigured.hours is None and "8-19" in misconfigured.stats()["hours_error"]
+
+    overnight = parse_hours("22:00-06:00")
+    assert in_hours(overnight, datetime(2026, 1, 5, 23, 30)) and not in_hours(overnight, datetime(2026, 1, 5, 12))
+    assert in_hours(parse_hours("08:00-19:00"), datetime(2026, 1, 5, 9)) and not in_hours(None, datetime(2026, 1, 5, 9))
+
+
+def test_pool_routes_to_least_loaded_backend_and_fails_over():
+    from core.services.ollama_client import OllamaPool
+    from scripts.fake_ollama import create_app
+
+    fakes = [create_app(latency=0.05, max_tokens=2), create_app(latency=0.05, max_tokens=2), create_app(error_rate=1.0)]
+
+    def backend(name, fake, threshold=5):
+        return OllamaClient(
+            base_url=f"http://{name}",
+            transport=httpx.ASGITransport(app=fake),
+            limiter=ConcurrencyLimiter(max_concurrency=1, max_queue=4),
+            breaker=CircuitBreaker(threshold=threshold, cooldown=60),
+        )
+
+    failing = backend("failing", fakes[2], threshold=1)
+    pool = OllamaPool([failing, backend("a", fakes[0]), backend("b", fakes[1])])
+    llm = LLMService(client=pool, cache=LLMCache(path=":memory:", enabled=False))
+
+    async def run():
+        first = await llm.draft_refined_question("What drives churn?")  # fails over from `failing`
+        assert first.text and "[LLM error" not in first.text
+        assert failing.breaker.state == "open" and not failing.healthy
+        await asyncio.gather(*(llm.draft_refined_question(f"Question {i}?") for i in range(4)))
+
+    asyncio.run(run())
+    assert pool.failovers == 1
+    assert fakes[2].state.stats["generate"] == 1  # the failed backend is not tried again
+    assert fakes[0].state.stats["generate"] + fakes[1].state.stats["generate"] == 5
+    assert fakes[0].state.stats["generate"] >= 2 and fakes[1].state.stats["generate"] >= 2  # spread by load
+
+    app.dependency_overrides[get_llm] = lambda: llm
+    try:
+        stats = TestClient(app).get("/api/llm/backends").json()
+    finally:
+        app.dependency_overrides.clear()
+    by_url = {b["base_url"]: b for b in stats["backends"]}
+    assert stats["failovers"] == 1
+    assert by_url["http://failing"]["breaker"] == "open" and by_url["http://failing"]["latency"]["generate"]["errors"] == 1
+    assert by_url["http://a"]["latency"]["generate"]["fields"]["wall_ms"]["p50"] >= 40
+
+
+def test_json_scanner_finds_first_complete_object_with_required_keys():
+    from core.services.json_stream import JSONObjectScanner
+
+    scanner = JSONObjectScanner(("a", "b"))
+    pieces = ['Sure: ```json\n{"x": 1} ', '{"a": "br{ace} \\"q', 'uoted\\"", "b": {"n', 'ested": []}', '} trailing {"a"']
+    results = [scanner.feed(p) for p in pieces]
+    assert results[:4] == [None, None, None, None]
+    assert json.loads(results[4]) == {"a": 'br{ace} "quoted"', "b": {"nested": []}}
+
+
+def test_analysis_stops_generating_once_json_object_is_complete():
+    import time
+
+    analysis = json.dumps({"delta_summary": "Revenue rose.", "potential_tensions": [], "questions_raised": []})
+    pieces = [analysis[i:i + 10] for i in range(0, len(analysis), 10)]
+    fake = FakeOllama(tokens=pieces + ["\n\nLet me also explain "] * 200, token_delay=0.005)
+    client = _client(fake, FakeClock(), threshold=5)
+    llm = LLMService(client=client, cache=LLMCache(path=":memory:", enabled=False))
+
+    async def run():
+        await client.available()  # fresh probe: the analysis itself must clear the failures
+        client.breaker._failures = 2
+        return await llm.analyze_belief_changes("Margins may expand.", "2026-01-01", "prev", "new")
+
+    started = time.perf_counter()
+    result = asyncio.run(run())
+    assert time.perf_counter() - started < 0.5  # the 200 rambling chunks would take over a second
+    assert result["delta_summary"] == "Revenue rose." and result["potential_tensions"] == []
+    assert fake.streamed <= len(pieces) + 2
+    assert llm.metrics.snapshot()["analyze_belief_changes"]["early_stops"] == 1
+    # Closing the stream early is still a successful call for the breaker.
+    assert client.breaker._failures == 0
+
+
+def test_stream_ending_without_object_or_final_chunk_is_not_an_early_stop():
+    lines = [{"response": "No JSON here", "done": False}, {"response": " at all.", "done": False}]
+
+    async def handler(request):
+        if request.url.path == "/api/tags":
+            return httpx.Response(200, json={"models": []})
+        return httpx.Response(200, content="".join(json.dumps(line) + "\n" for line in lines).encode())
+
+    client = _client(FakeOllama(), FakeClock())
+    client._transport = httpx.MockTransport(handler)
+    llm = LLMService(client=client, cache=LLMCache(path=":memory:", enabled=False))
+
+    asyncio.run(llm.analyze_belief_changes("Margins may expand.", "2026-01-01", "prev", "new"))
+    calls = llm.metrics.snapshot()["analyze_belief_changes"]
+    assert calls["calls"] == 1 and calls["early_stops"] == 0
@@ -199,3 +199,28 @@ def test_invariant_at_most_one_non_expired_per_belief_type(
                 counts[key] = counts.get(key, 0) + 1
         for (belief_id, ptype), n in counts.items():
             assert n <= 1, f"Invariant violated: {belief_id} {ptype} has {n} non-expired"
+
+
+def test_history_counts_and_cursor_pages(artifact_repo, lifecycle_repo, db_session):
+    """History counts come from GROUP BY; pages walk each bucket newest-first without overlap."""
+    proposal_repo = ProposalRepository(db_session)
+    base = datetime.now(UTC) - timedelta(days=10)
+    for i in range(5):
+        proposal_repo.create({
+            "proposal_id": f"p{i}",
+            "proposal_type": "review_prompt",
+            "created_at": base + timedelta(hours=i),
+            "status": "pending" if i < 4 else "rejected",
+            "payload": {"belief_id": f"b{i}", "belief_text": f"Belief {i}"},
+        })
+    engine = ProposalEngine(artifact_repo, lifecycle_repo, proposal_repo)
+
+    assert engine.get_history_counts() == {"review_prompt": {"pending": 4, "rejected": 1}}
+
+    seen, cursor = [], None
+    while True:
+        items, cursor = engine.get_history_page("review_prompt", "pending", cursor=cursor, limit=3)
+        seen.extend(i["proposal_id"] for i in items)
+        if cursor is None:
+            break
+    assert seen == ["p3", "p2", "p1", "p0"]
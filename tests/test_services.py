@@ -52,6 +52,29 @@ def test_stale_belief_detected(artifact_repo, lifecycle_repo, snapshot_factory):
     assert results["TEST"][0]["belief_id"] == str(belief.reasoning_id)
 
 
+def test_snapshot_context_lines_match_rehydrated_text_and_are_cached(artifact_repo, snapshot_factory):
+    from decimal import Decimal
+
+    from core.services.llm_context import snapshot_context_cache, snapshot_labels, snapshot_summary
+
+    snap = snapshot_factory(revenue_fy=Decimal("1234.50"), as_of="2024-03-31T05:30:00+05:30")
+    artifact_repo.save(snap)
+    ids = [snap.metadata.snapshot_id, uuid4()]  # the unknown id is skipped
+
+    rehydrated = artifact_repo.get(str(snap.metadata.snapshot_id))
+    assert snapshot_summary(artifact_repo, ids) == (
+        f"Test Co (TEST): revenue={rehydrated.financials.revenue_fy}, "
+        f"margin={rehydrated.financials.operating_margin_fy}, as_of=2024-03-31"
+    )
+    assert snapshot_labels(artifact_repo, ids) == [f"TEST {rehydrated.metadata.as_of}"]
+    assert snapshot_context_cache.hits == 1  # second lookup of the snapshot came from the LRU
+
+    queries = []
+    artifact_repo.get_payloads = lambda *a, **k: queries.append(a) or {}
+    snapshot_summary(artifact_repo, ids)
+    assert queries == [([str(ids[1])],)]  # only the unknown id is looked up again
+
+
 def test_snapshot_coverage_gap(artifact_repo, lifecycle_repo):
     belief = reasoning_artifact_factory(snapshot_ids=[])
     artifact_repo.save(belief)
@@ -73,3 +96,18 @@ def test_get_open_questions(artifact_repo):
     assert len(results["uncoupled"]) == 1
     assert results["uncoupled"][0]["age_days"] >= 10
     assert results["uncoupled"][0]["question_id"] == str(question.reasoning_id)
+
+
+def test_kaplan_meier_median_with_censoring():
+    """KM: censored observations leave the risk set without dropping survival."""
+    from core.services.decision_analytics_service import _kaplan_meier
+
+    km = _kaplan_meier([5, 10, 10, 20, 30], [True, True, False, True, False])
+    assert km["n"] == 5
+    assert km["events"] == 3
+    assert km["censored"] == 2
+    assert [step["day"] for step in km["curve"]] == [5, 10, 20]
+    assert km["curve"][0]["survival"] == 0.8
+    assert km["curve"][1]["survival"] == 0.6
+    assert km["curve"][2]["survival"] == 0.3
+    assert km["median_days"] == 20
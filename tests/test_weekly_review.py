@@ -0,0 +1,221 @@
+"""Weekly review: single working-set load; SQL statements per render do not grow with data."""
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.deps import get_db
+from core.models.reasoning_artifact import ArtifactType
+from core.repositories.artifact_repository import ArtifactRepository
+from core.repositories.cadence_repository import CadenceRepository
+from db.session import Base
+from main import app
+from tests.fixtures.artifact_factory import reasoning_artifact_factory
+from tests.fixtures.snapshot_factory import make_snapshot
+
+# Steady-state render: belief group counts, artifacts, answered ids, cadence due,
+# TTL expiry UPDATE, non-expired proposals (x2 types), active proposals.
+WEEKLY_REVIEW_STATEMENTS = 8
+
+
+def _seed(session_factory, n: int):
+    """n stale beliefs (old snapshot + newer one), n ungrounded beliefs, n open questions, n cadence rows."""
+    db = session_factory()
+    repo = ArtifactRepository(db)
+    cadence = CadenceRepository(db)
+    for i in range(n):
+        ticker = f"T{i}"
+        old_id = uuid4()
+        repo.save(make_snapshot(
+            snapshot_id=old_id,
+            as_of=(datetime.now(UTC) - timedelta(days=40)).strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+            company={"ticker": ticker},
+        ))
+        repo.save(make_snapshot(
+            snapshot_id=uuid4(),
+            as_of=(datetime.now(UTC) + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+            company={"ticker": ticker},
+        ))
+        stale = reasoning_artifact_factory(snapshot_ids=[old_id], statement=f"Stale {i}")
+        repo.save(stale)
+        repo.save(reasoning_artifact_factory(snapshot_ids=[], statement=f"Ungrounded {i}"))
+        repo.save(reasoning_artifact_factory(
+            artifact_type=ArtifactType.question, snapshot_ids=[old_id], statement=f"Question {i}?",
+        ))
+        cadence.set(str(stale.reasoning_id), date.today() - timedelta(days=1), 7)
+    db.close()
+
+
+@pytest.fixture
+def make_client():
+    def _make(n: int):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(bind=engine)
+        TestingSessionLocal = sessionmaker(bind=engine)
+        _seed(TestingSessionLocal, n)
+
+        def override_get_db():
+            db = TestingSessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        return TestClient(app), engine
+
+    yield _make
+    app.dependency_overrides.clear()
+
+
+def _statements_per_render(test_client, engine) -> int:
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    r = test_client.get("/weekly-review")
+    event.remove(engine, "before_cursor_execute", record)
+    assert r.status_code == 200
+    return len(statements)
+
+
+@pytest.mark.parametrize("n", [1, 12])
+def test_weekly_review_statement_count_is_constant(make_client, n):
+    test_client, engine = make_client(n)
+    test_client.get("/weekly-review")  # first render generates proposals
+    assert _statements_per_render(test_client, engine) == WEEKLY_REVIEW_STATEMENTS
+
+
+def test_weekly_review_renders_all_sections(make_client):
+    test_client, _ = make_client(2)
+    html = test_client.get("/weekly-review").text
+    assert "Beliefs Needing Review (2)" in html
+    assert "Open Questions (2)" in html
+    assert "Due for review (cadence) (2)" in html
+    assert "All Beliefs (4)" in html
+    assert "Structural Proposals (4)" in html
+
+
+def test_list_due_with_beliefs_joins_statement_and_tickers():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    repo = ArtifactRepository(db)
+    a, b = uuid4(), uuid4()
+    repo.save(make_snapshot(snapshot_id=a, company={"ticker": "BBB"}))
+    repo.save(make_snapshot(snapshot_id=b, company={"ticker": "AAA"}))
+    coupled = reasoning_artifact_factory(snapshot_ids=[a, b], statement="Coupled")
+    uncoupled = reasoning_artifact_factory(snapshot_ids=[], statement="Uncoupled")
+    repo.save(coupled)
+    repo.save(uncoupled)
+    cadence = CadenceRepository(db)
+    cadence.set(str(coupled.reasoning_id), date.today() - timedelta(days=1), 7)
+    cadence.set(str(uncoupled.reasoning_id), date.today() - timedelta(days=3))
+    cadence.set(str(uuid4()), date.today() - timedelta(days=2))  # belief artifact missing
+    cadence.set(str(uuid4()), date.today() + timedelta(days=5))  # not due
+
+    rows = cadence.list_due_with_beliefs(date.today())
+    assert [r["statement"] for r in rows] == ["Uncoupled", "Coupled"]
+    assert rows[0]["tickers"] == []
+    assert rows[1]["tickers"] == ["AAA", "BBB"]
+    assert rows[1]["cadence_days"] == 7
+    assert rows[1]["artifact_type"] == ArtifactType.thesis.value
+    db.close()
+
+
+def _asgi_body_chunks(path: str) -> list[str]:
+    """Body messages exactly as the app sends them (TestClient joins them into one)."""
+    chunks: list[str] = []
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if requested:
+            await asyncio.Event().wait()  # client stays connected
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks.append(message["body"].decode("utf-8"))
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    return chunks
+
+
+def test_weekly_review_streams_shell_before_sections(make_client):
+    make_client(1)
+    chunks = _asgi_body_chunks("/weekly-review")
+    assert "<h1>Weekly Review</h1>" in chunks[0]
+    assert "All Beliefs" not in chunks[0]
+    html = "".join(chunks)
+    for name in ("all_beliefs", "questions", "stale_beliefs", "cadence_due", "orphans", "proposals"):
+        assert f'data-section="{name}" data-render-ms="' in html
+
+
+def test_fragment_endpoint_renders_one_section_and_caches(make_client):
+    test_client, _ = make_client(2)
+    r = test_client.get("/weekly-review/fragments/stale-beliefs")
+    assert r.status_code == 200
+    assert "Beliefs Needing Review (2)" in r.text
+    assert "Open Questions" not in r.text
+    assert "Server-Timing" in r.headers
+
+    again = test_client.get("/weekly-review/fragments/stale-beliefs")
+    assert again.text == r.text
+    assert "Server-Timing" not in again.headers  # served from the fragment cache
+
+    etag = r.headers["ETag"]
+    assert test_client.get(
+        "/weekly-review/fragments/stale-beliefs", headers={"If-None-Match": etag},
+    ).status_code == 304
+    assert test_client.get("/weekly-review/fragments/nope").status_code == 404
+
+
+def test_proposals_fragment_invalidated_by_status_change(make_client):
+    test_client, _ = make_client(1)
+    first = test_client.get("/weekly-review/fragments/proposals")
+    assert "Structural Proposals (2)" in first.text
+    proposal_id = first.text.split('data-proposal-id="')[1].split('"')[0]
+    # Status update in place: no new row, no new created_at.
+    r = test_client.post(f"/proposals/{proposal_id}/reject", headers={"X-Requested-With": "XMLHttpRequest"})
+    assert r.status_code == 204
+
+    after = test_client.get("/weekly-review/fragments/proposals", headers={"If-None-Match": first.headers["ETag"]})
+    assert after.status_code == 200
+    assert "Structural Proposals (1)" in after.text
+    assert proposal_id not in after.text
+
+
+def test_all_beliefs_group_counts_and_rows_on_demand(make_client):
+    test_client, _ = make_client(3)
+    html = test_client.get("/weekly-review/fragments/all-beliefs").text
+    assert "All Beliefs (6)" in html
+    assert "uncoupled (3)" in html
+    assert "Stale 0" not in html  # rows are not rendered with the counts
+
+    first = test_client.get("/weekly-review/fragments/all-beliefs/rows", params={"group": "uncoupled", "limit": 2})
+    assert first.text.count("/beliefs/") == 2
+    next_url = first.text.split('data-next-url="')[1].split('"')[0].replace("&amp;", "&")
+    rest = test_client.get(next_url)
+    assert rest.text.count("/beliefs/") == 1
+    assert "data-next-url" not in rest.text
+    assert test_client.get(
+        "/weekly-review/fragments/all-beliefs/rows", params={"group": "uncoupled", "cursor": "garbage"},
+    ).status_code == 400